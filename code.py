@@ -6,14 +6,32 @@ You can change animations in real-time.
 import microcontroller
 import time
 import board
-import displayio
+from engine import color, glyphfont, manifest, overlay, panel, playlist, sprites, ticker, transitions
 
-ANIMATIONS = ["bouncing_balls", "breathing", "cap-shield", "dna", "fireworks", "game_of_life",
-              "ironman", "kaleidoscope", "matrix_rain", "moving-lines", "plasma", "rain",
-              "scrolling_text", "warp", "strange_things", "christmas", "tetris"]
+# Animation list + hints come from the generated manifest, read once at boot
+MANIFEST_JSON, MANIFEST = manifest.load()
+ANIMATIONS = manifest.names(MANIFEST)
 
 MAX_ANIMATION_TIME = 18000  # 5 hours
-FRAME_TIME = 0.03  # 33ms per frame = ~30 FPS
+FRAME_TIME = 0.03  # 33ms per frame = ~30 FPS (used when no FPS is declared)
+
+# Idle sleep per main-loop pass, by manifest cost class. Heavy animations
+# already overrun their frame budget, so they get no extra sleep.
+IDLE_SLEEP = {"light": 0.01, "medium": 0.005, "heavy": 0}
+
+# How many seconds before a playlist switch the next animation is imported
+# and initialised, by its cost class
+PRELOAD_LEAD = {"light": 1.0, "medium": 2.0, "heavy": 4.0}
+
+# Animation that shows /api/ticker messages
+TICKER_ANIMATION = "scrolling_text"
+
+# Font of the clock/status/message overlay (see /api/overlay)
+OVERLAY_FONT = "3x5.glf"
+
+# Transition used when one animation replaces another (see /api/transition)
+TRANSITION_STYLE = "crossfade"
+TRANSITION_FRAMES = 20
 
 print("\n" + "="*60)
 print("LED Matrix - Non-Blocking Web + Animations")
@@ -31,20 +49,53 @@ except:
 
 # Animation engine state
 animation_module = None
+animation_entry = None
 animation_state = None
 animation_start_time = None
 animation_running = False
 should_load_animation = False
 next_frame_time = 0
 
-def load_animation_module(anim_name):
-    """Load animation module - doesn't start it yet"""
-    global animation_module
+# Playlist state
+playlists = playlist.load(microcontroller.nvm)
+player = None          # playlist.Player while a playlist is running
+switch_at = None       # monotonic time of the next playlist switch
+preload = None         # {"entry", "module", "state"} for the upcoming animation
+
+# Transition buffers are allocated once, up front, so switching never spikes the heap
+transition = transitions.Transition(panel.WIDTH, panel.HEIGHT)
+transition_style = TRANSITION_STYLE
+transition_frames = TRANSITION_FRAMES
+
+# Gamma tables keep the dimmest colors on the panel's first visible step
+color.configure(bit_depth=panel.bit_depth)
+
+# Bit depth set through /api/display for every animation; None lets each
+# animation's manifest bit_depth (or the panel default) decide
+display_bit_depth = None
+
+# Overlay layer, kept above every animation by the panel
+try:
+    overlay_layer = overlay.Overlay(glyphfont.load(OVERLAY_FONT), panel.WIDTH, panel.HEIGHT,
+                                    upper=True)
+    panel.set_overlay(overlay_layer.group)
+except Exception as e:
+    print("Overlay unavailable: %s" % str(e))
+    overlay_layer = None
+
+# Options set through /api/options, by animation name; handed to the
+# sequence's configure(options) hook every time it starts
+animation_options = {}
+# configure() errors for options stored while the animation was stopped
+options_errors = {}
+
+def import_animation(entry):
+    """Fresh import of a sequence module. Returns the module or None."""
     try:
         import sys
         import gc
         
-        module_name = "led_sequences.%s" % anim_name
+        module_name = entry["module"]
         print("[LOAD] Clearing cache for %s" % module_name)
         
         # Clear from sys.modules to force fresh import
@@ -53,41 +104,23 @@ def load_animation_module(anim_name):
         if "led_sequences" in sys.modules:
             del sys.modules["led_sequences"]
         
-        # Force garbage collection
+        # Force garbage collection; make sure the declared footprint fits
         gc.collect()
+        if entry["memory"] and gc.mem_free() < entry["memory"]:
+            print("ERROR: %s needs ~%d bytes, only %d free"
+                  % (entry["name"], entry["memory"], gc.mem_free()))
+            return None
         
-        print("[LOAD] Starting import of %s" % module_name)
+        print("[LOAD] Starting import of %s (%s)" % (module_name, entry["cost"]))
         
         # Try using importlib if available
         try:
             import importlib
-            print("[LOAD] Using importlib.import_module")
-            animation_module = importlib.import_module(module_name)
+            return importlib.import_module(module_name)
         except (ImportError, AttributeError):
-            print("[LOAD] importlib not available, using __import__")
             # CircuitPython: __import__ doesn't support keyword args
             # Use positional args: __import__(name, globals, locals, fromlist, level)
-            animation_module = __import__(module_name, None, None, [anim_name], 0)
-        
-        print("[LOAD] Module loaded successfully")
-        print("[LOAD] Module type: %s" % str(type(animation_module)))
-        
-        # List all functions in module
-        funcs = [x for x in dir(animation_module) if not x.startswith('_')]
-        print("[LOAD] Module contents: %s" % str(funcs)[:100])
-        
-        has_init = hasattr(animation_module, 'init_animation')
-        has_update = hasattr(animation_module, 'update_animation')
-        
-        print("[LOAD] Has init_animation: %s" % str(has_init))
-        print("[LOAD] Has update_animation: %s" % str(has_update))
-        
-        if has_init and has_update:
-            print("Animation loaded: %s (READY)" % anim_name)
-            return True
-        else:
-            print("ERROR: Animation %s missing functions!" % anim_name)
-            return False
+            return __import__(module_name, None, None, [entry["name"]], 0)
             
     except Exception as e:
         print("Error loading animation: %s" % str(e))
@@ -97,32 +130,122 @@ def load_animation_module(anim_name):
             traceback.print_exc()
         except:
             print("(traceback unavailable)")
-        animation_module = None
+        return None
+
+def load_animation_module(anim_name):
+    """Load animation module - doesn't start it yet"""
+    global animation_module, animation_entry
+    entry = manifest.find(MANIFEST, anim_name)
+    if entry is None:
+        print("ERROR: %s is not in the manifest" % anim_name)
+        return False
+    
+    # init_animation/update_animation were verified when the manifest was built
+    animation_module = import_animation(entry)
+    if animation_module is None:
+        animation_entry = None
+        return False
+    animation_entry = entry
+    print("Animation loaded: %s (READY)" % anim_name)
+    return True
+
+def configure_animation(module, name):
+    """Pass remembered options to a sequence's configure() hook, if any"""
+    options = animation_options.get(name)
+    if options and hasattr(module, "configure"):
+        try:
+            module.configure(options)
+        except Exception as e:
+            # Drop them so the next start uses the defaults again
+            print("Options error (%s): %s" % (name, str(e)))
+            options_errors[name] = str(e)
+            del animation_options[name]
+
+# Palettes on screen, rewritten every frame while temporal dithering is on
+live_palettes = []
+dither_ms = 0.0   # average cost of that per frame
+
+def collect_palettes():
+    """Find the palettes of what is on screen now"""
+    global live_palettes
+    found = color.collect(sprites)
+    if animation_module is not None:
+        found += color.collect(animation_module)
+    if overlay_layer:
+        found.append(overlay_layer.palette)
+    live_palettes = found
+
+def rewrite_palettes():
+    """Re-apply gamma/brightness to every live palette (no redraw)"""
+    collect_palettes()
+    count = 0
+    for palette in live_palettes:
+        palette.apply()
+        count += len(palette)
+    if preload and preload["module"] is not None:
+        count += color.refresh(preload["module"])
+    return count
+
+def dither_palettes():
+    """Temporal dithering: next phase of every live palette"""
+    global dither_ms
+    start = time.monotonic_ns()
+    if color.dither_frame(live_palettes):
+        spent = (time.monotonic_ns() - start) / 1000000
+        dither_ms += (spent - dither_ms) / 32
+
+def wanted_bit_depth():
+    """Bit depth for what is on screen: API choice, else the animation's"""
+    if display_bit_depth:
+        return display_bit_depth
+    if animation_entry and animation_entry["bit_depth"]:
+        return animation_entry["bit_depth"]
+    return panel.BIT_DEPTH
+
+def apply_bit_depth():
+    """Rebuild the panel if the wanted bit depth changed (between frames,
+    so the stage is back on the panel at the next refresh)"""
+    depth = wanted_bit_depth()
+    if not panel.set_bit_depth(depth):
         return False
+    color.configure(bit_depth=depth)
+    rewrite_palettes()
+    print("Panel bit depth: %d" % depth)
+    return True
+
+def show_animation(outgoing):
+    """Put the current animation on screen, via a transition from outgoing"""
+    apply_bit_depth()
+    # Free the incoming group from the stage so the transition can take it
+    panel.show(None)
+    if outgoing is not None and transition.begin(outgoing, animation_module.group,
+                                                 transition_style, transition_frames):
+        panel.show(transition.group)
+    else:
+        panel.show(animation_module.group)
+    collect_palettes()
 
 def start_animation(anim_name):
     """Start animation (initialize state)"""
     global animation_module, animation_state, animation_start_time, animation_running
     
+    # The outgoing animation stays on screen while the new one imports
+    outgoing = animation_module if animation_running else None
     if load_animation_module(anim_name):
         try:
-            # Call init function if it exists
-            if hasattr(animation_module, 'init_animation'):
-                animation_state = animation_module.init_animation()
-                animation_start_time = time.time()
-                animation_running = True
-                print("Animation started: %s" % anim_name)
-                return True
-            else:
-                # Old-style animation - will block
-                print("Animation is old-style (blocking) - loading anyway")
-                animation_start_time = time.time()
-                animation_running = True
-                return True
+            configure_animation(animation_module, anim_name)
+            animation_state = animation_module.init_animation()
+            animation_start_time = time.time()
+            animation_running = True
+            show_animation(outgoing)
+            print("Animation started: %s" % anim_name)
+            return True
         except Exception as e:
             print("Error starting animation: %s" % str(e))
     
     animation_running = False
+    transition.end()
+    panel.blank()
     return False
 
 def update_animation_frame():
@@ -140,13 +263,8 @@ def update_animation_frame():
     
     try:
         # Call update function to draw ONE frame
-        if hasattr(animation_module, 'update_animation'):
-            animation_state = animation_module.update_animation(animation_state)
-            return True
-        else:
-            # Old-style animation - let it run (will block)
-            # This is the fallback for animations that haven't been refactored
-            return True
+        animation_state = animation_module.update_animation(animation_state)
+        return True
     except Exception as e:
         print("Animation error: %s" % str(e))
         stop_animation()
@@ -154,15 +272,96 @@ def update_animation_frame():
 
 def stop_animation():
     """Stop animation"""
-    global animation_module, animation_state, animation_running, animation_start_time
+    global animation_module, animation_entry, animation_state, animation_running, animation_start_time
     animation_module = None
+    animation_entry = None
     animation_state = None
     animation_running = False
     animation_start_time = None
-    try:
-        displayio.release_displays()
-    except:
-        pass
+    transition.end()
+    panel.blank()
+    collect_palettes()
+
+def set_active_playlist(name):
+    """Remember which playlist resumes after a reboot"""
+    if playlists.get("active") != name:
+        playlists["active"] = name
+        playlist.save(microcontroller.nvm, playlists)
+
+def start_playlist(pl):
+    """Start a playlist from its first entry"""
+    global player, switch_at
+    stop_playlist()
+    player = playlist.Player(pl)
+    entry = player.current()
+    print("Playlist %s: %s" % (pl["name"], entry["animation"]))
+    if start_animation(entry["animation"]):
+        switch_at = time.monotonic() + entry["duration"]
+    else:
+        switch_at = time.monotonic()  # skip a broken entry at the next frame
+
+def stop_playlist():
+    """Forget the running playlist (the current animation keeps playing)"""
+    global player, switch_at, preload
+    player = None
+    switch_at = None
+    preload = None
+
+def playlist_preload(now):
+    """Import, then init, the upcoming entry - one step per call, in frame slack"""
+    global preload
+    upcoming = player.upcoming()
+    if upcoming is None:
+        return
+    entry = manifest.find(MANIFEST, upcoming["animation"])
+    if entry is None or now < switch_at - PRELOAD_LEAD.get(entry["cost"], 2.0):
+        return
+    if preload is None:
+        module = import_animation(entry)
+        # Even if the import failed, don't retry every frame
+        preload = {"entry": entry, "module": module, "state": None}
+    elif preload["module"] is not None and preload["state"] is None:
+        try:
+            configure_animation(preload["module"], entry["name"])
+            preload["state"] = preload["module"].init_animation()
+            print("[PRELOAD] %s ready" % entry["name"])
+        except Exception as e:
+            print("Preload init error: %s" % str(e))
+            preload["module"] = None
+
+def playlist_switch(now):
+    """Cut to the upcoming entry on this frame"""
+    global animation_module, animation_entry, animation_state, animation_start_time
+    global animation_running, switch_at, preload, player
+    upcoming = player.advance()
+    if upcoming is None:
+        # Finished: don't resume it after a reboot
+        set_active_playlist(None)
+        if player.playlist["loop"] == "once":
+            print("Playlist finished")
+            stop_playlist()
+            stop_animation()
+        else:
+            print("Playlist finished - holding last animation")
+            stop_playlist()
+        return
+    
+    ready = preload
+    preload = None
+    switch_at = now + upcoming["duration"]
+    if ready and ready["state"] is not None and ready["entry"]["name"] == upcoming["animation"]:
+        outgoing = animation_module if animation_running else None
+        animation_module = ready["module"]
+        animation_entry = ready["entry"]
+        animation_state = ready["state"]
+        animation_start_time = time.time()
+        animation_running = True
+        show_animation(outgoing)
+        print("Playlist: %s (preloaded)" % upcoming["animation"])
+    else:
+        # Not preloaded in time (or failed): load it now, paying the cost on screen
+        print("Playlist: %s (cold start)" % upcoming["animation"])
+        start_animation(upcoming["animation"])
 
 # Start web server
 try:
@@ -229,7 +428,8 @@ try:
     
     @server.route("/api/animations")
     def get_animations(request: Request):
-        return JSONResponse(request, {"animations": ANIMATIONS})
+        # Serve the manifest as-is: names plus fps/palette/memory/cost hints
+        return Response(request, MANIFEST_JSON, content_type="application/json")
     
     @server.route("/api/set", ["POST"])
     def set_animation(request: Request):
@@ -264,12 +464,196 @@ try:
     @server.route("/api/stop-animation", ["POST"])
     def api_stop_animation(request: Request):
         global animation_running
+        if player:
+            set_active_playlist(None)
+            stop_playlist()
         if animation_running:
             stop_animation()
             print("Animation stopped")
             return JSONResponse(request, {"ok": True, "status": "stopped"})
         return JSONResponse(request, {"ok": True, "status": "not_running"})
     
+    @server.route("/api/transition")
+    def get_transition(request: Request):
+        return JSONResponse(request, {
+            "style": transition_style,
+            "frames": transition_frames,
+            "styles": transitions.STYLES,
+            "active": transition.active,
+            "step_ms": transition.step_ms,
+        })
+    
+    @server.route("/api/transition", ["POST"])
+    def set_transition(request: Request):
+        global transition_style, transition_frames
+        try:
+            data = request.json()
+            style = data.get("style", transition_style)
+            if style not in transitions.STYLES:
+                return JSONResponse(request, {"ok": False, "error": "Unknown transition"})
+            transition_style = style
+            transition_frames = max(2, min(120, int(data.get("frames", transition_frames))))
+            return JSONResponse(request, {"ok": True, "style": transition_style,
+                                          "frames": transition_frames})
+        except Exception as e:
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/options")
+    def get_options(request: Request):
+        name = animation_entry["name"] if animation_running and animation_entry else None
+        return JSONResponse(request, {
+            "name": name,
+            "choices": getattr(animation_module, "OPTIONS", None) if name else None,
+            "options": animation_options.get(name, {}),
+            "errors": options_errors,
+        })
+    
+    @server.route("/api/options", ["POST"])
+    def set_options(request: Request):
+        global animation_state
+        try:
+            data = request.json()
+            current = animation_entry["name"] if animation_running and animation_entry else None
+            name = data.get("name") or current
+            options = data.get("options", {})
+            if name not in ANIMATIONS:
+                return JSONResponse(request, {"ok": False, "error": "Invalid animation"})
+            if not isinstance(options, dict):
+                return JSONResponse(request, {"ok": False, "error": "options must be an object"})
+            entry = manifest.find(MANIFEST, name)
+            if not entry["options"]:
+                return JSONResponse(request, {"ok": False, "error": "%s has no options" % name})
+            merged = dict(animation_options.get(name, {}))
+            merged.update(options)
+            if name == current:
+                # Validates; restart so the new options take effect
+                merged = animation_module.configure(merged)
+                animation_state = animation_module.init_animation()
+            else:
+                # Not running: importing it here would block the server, so
+                # configure() checks them when it starts (see options_errors)
+                options_errors.pop(name, None)
+            animation_options[name] = merged
+            return JSONResponse(request, {"ok": True, "name": name, "options": merged,
+                                          "validated": name == current})
+        except Exception as e:
+            print("Options error: %s" % str(e))
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/ticker")
+    def get_ticker(request: Request):
+        return JSONResponse(request, {
+            "queued": ticker.queue,
+            "loop": ticker.loop_text,
+            "max_queue": ticker.MAX_QUEUE,
+            "max_length": ticker.MAX_LENGTH,
+        })
+    
+    @server.route("/api/ticker", ["POST"])
+    def post_ticker(request: Request):
+        global should_load_animation
+        try:
+            data = request.json()
+            queued = len(ticker.queue)
+            if "loop" in data:
+                ticker.set_loop(data["loop"])
+            if data.get("text"):
+                queued = ticker.push(data["text"], bool(data.get("replace")))
+            elif data.get("replace"):
+                del ticker.queue[:]
+                queued = 0
+            # Switch to the ticker animation unless it is already showing
+            if data.get("show") and TICKER_ANIMATION in ANIMATIONS and not (
+                    animation_running and animation_entry
+                    and animation_entry["name"] == TICKER_ANIMATION):
+                microcontroller.nvm[0] = ANIMATIONS.index(TICKER_ANIMATION)
+                should_load_animation = True
+            return JSONResponse(request, {"ok": True, "queued": queued})
+        except Exception as e:
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/overlay")
+    def get_overlay(request: Request):
+        if overlay_layer is None:
+            return JSONResponse(request, {"ok": False, "error": "Overlay unavailable"})
+        return JSONResponse(request, overlay_layer.status())
+    
+    @server.route("/api/overlay", ["POST"])
+    def set_overlay(request: Request):
+        if overlay_layer is None:
+            return JSONResponse(request, {"ok": False, "error": "Overlay unavailable"})
+        try:
+            data = request.json()
+            if "time" in data:
+                # Unix time from the browser: the clock has no NTP
+                import rtc
+                rtc.RTC().datetime = time.localtime(int(data["time"]))
+            if "enabled" in data:
+                overlay_layer.enable(data["enabled"])
+            if "clock" in data:
+                overlay_layer.show_clock(data["clock"])
+            for name in ("status", "message"):
+                if name in data:
+                    overlay_layer.set(name, data[name] or None)
+            return JSONResponse(request, {"ok": True, "overlay": overlay_layer.status()})
+        except Exception as e:
+            print("Overlay error: %s" % str(e))
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/brightness")
+    def get_brightness(request: Request):
+        status = color.status()
+        status["dither_ms"] = round(dither_ms, 3)
+        status["dither_entries"] = sum(len(p) for p in live_palettes if p.dither is None)
+        return JSONResponse(request, status)
+    
+    @server.route("/api/brightness", ["POST"])
+    def set_brightness(request: Request):
+        try:
+            data = request.json()
+            applied = color.configure(gamma=data.get("gamma"),
+                                      brightness=data.get("brightness"),
+                                      balance=data.get("balance"),
+                                      dither=data.get("dither"))
+            start = time.monotonic_ns()
+            applied["entries"] = rewrite_palettes()
+            applied["rewrite_ms"] = round((time.monotonic_ns() - start) / 1000000, 2)
+            return JSONResponse(request, {"ok": True, "color": applied})
+        except Exception as e:
+            print("Brightness error: %s" % str(e))
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/display")
+    def get_display(request: Request):
+        status = panel.status()
+        status["override"] = display_bit_depth
+        status["animation"] = animation_entry["bit_depth"] if animation_entry else None
+        return JSONResponse(request, status)
+    
+    @server.route("/api/display", ["POST"])
+    def set_display(request: Request):
+        global display_bit_depth
+        try:
+            data = request.json()
+            depth = data.get("bit_depth")
+            if depth is not None:
+                depth = int(depth)
+                if depth not in panel.BIT_DEPTHS:
+                    raise ValueError("bit_depth must be %d..%d"
+                                     % (panel.BIT_DEPTHS[0], panel.BIT_DEPTHS[-1]))
+            display_bit_depth = depth
+            start = time.monotonic_ns()
+            changed = apply_bit_depth()
+            panel.refresh()
+            status = panel.status()
+            status["override"] = display_bit_depth
+            status["changed"] = changed
+            status["reconfigure_ms"] = round((time.monotonic_ns() - start) / 1000000, 1)
+            return JSONResponse(request, {"ok": True, "display": status})
+        except Exception as e:
+            print("Display error: %s" % str(e))
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
     @server.route("/api/status")
     def get_status(request: Request):
         if animation_running and animation_start_time:
@@ -283,6 +667,76 @@ try:
         else:
             return JSONResponse(request, {"status": "idle"})
     
+    @server.route("/api/playlists")
+    def get_playlists(request: Request):
+        current = None
+        if player:
+            current = {
+                "name": player.playlist["name"],
+                "animation": player.current()["animation"],
+                "remaining": max(0, int(switch_at - time.monotonic())),
+                "preloaded": bool(preload and preload["state"] is not None),
+            }
+        return JSONResponse(request, {
+            "playlists": playlists["playlists"],
+            "active": playlists.get("active"),
+            "playing": current,
+        })
+    
+    @server.route("/api/playlists", ["POST"])
+    def save_playlist(request: Request):
+        try:
+            pl = playlist.validate(request.json(), ANIMATIONS)
+            playlists["playlists"][pl["name"]] = pl
+            playlist.save(microcontroller.nvm, playlists)
+            print("Saved playlist: %s" % pl["name"])
+            return JSONResponse(request, {"ok": True, "name": pl["name"]})
+        except Exception as e:
+            print("Playlist save error: %s" % str(e))
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/playlists/delete", ["POST"])
+    def delete_playlist(request: Request):
+        try:
+            name = request.json().get("name", "")
+            if name not in playlists["playlists"]:
+                return JSONResponse(request, {"ok": False, "error": "Unknown playlist"})
+            del playlists["playlists"][name]
+            if playlists.get("active") == name:
+                playlists["active"] = None
+            playlist.save(microcontroller.nvm, playlists)
+            return JSONResponse(request, {"ok": True, "deleted": name})
+        except Exception as e:
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/playlist/play", ["POST"])
+    def play_playlist(request: Request):
+        try:
+            name = request.json().get("name", "")
+            pl = playlists["playlists"].get(name)
+            if pl is None:
+                return JSONResponse(request, {"ok": False, "error": "Unknown playlist"})
+            set_active_playlist(name)
+            start_playlist(pl)
+            return JSONResponse(request, {"ok": True, "playing": name})
+        except Exception as e:
+            print("Playlist play error: %s" % str(e))
+            return JSONResponse(request, {"ok": False, "error": str(e)})
+    
+    @server.route("/api/playlist/stop", ["POST"])
+    def api_stop_playlist(request: Request):
+        set_active_playlist(None)
+        stop_playlist()
+        return JSONResponse(request, {"ok": True, "status": "stopped"})
+    
+    @server.route("/api/playlist/next", ["POST"])
+    def api_next_playlist(request: Request):
+        global switch_at
+        if not player:
+            return JSONResponse(request, {"ok": False, "error": "No playlist running"})
+        switch_at = time.monotonic()  # cut on the next frame
+        return JSONResponse(request, {"ok": True})
+    
     server.start(ip, 80)
     print("HTTP: Ready on http://%s/" % ip)
     print("Available endpoints:")
@@ -292,14 +746,40 @@ try:
     print("  POST /api/set")
     print("  POST /api/load-animation")
     print("  POST /api/stop-animation")
+    print("  GET  /api/playlists")
+    print("  POST /api/playlists")
+    print("  POST /api/playlists/delete")
+    print("  POST /api/playlist/play")
+    print("  POST /api/playlist/stop")
+    print("  POST /api/playlist/next")
+    print("  GET  /api/transition")
+    print("  POST /api/transition")
+    print("  GET  /api/options")
+    print("  POST /api/options")
+    print("  GET  /api/ticker")
+    print("  POST /api/ticker")
+    print("  GET  /api/overlay")
+    print("  POST /api/overlay")
+    print("  GET  /api/brightness")
+    print("  POST /api/brightness")
+    print("  GET  /api/display")
+    print("  POST /api/display")
     print("\nWEB SERVER STAYS RESPONSIVE - animations update every frame!\n")
     
+    # Resume the playlist that was running before reboot
+    resume = playlists["playlists"].get(playlists.get("active") or "")
+    if resume:
+        start_playlist(resume)
+    
     # Main loop - ALWAYS responsive
     frame_count = 0
     while True:
-        # If animation should load, start it
+        # If animation should load, start it (manual choice ends any playlist)
         if should_load_animation:
             should_load_animation = False
+            if player:
+                set_active_playlist(None)
+                stop_playlist()
             idx = microcontroller.nvm[0]
             if idx >= len(ANIMATIONS):
                 idx = 0
@@ -311,12 +791,45 @@ try:
             
             start_animation(anim_name)
         
-        # Update animation frame (non-blocking)
-        current_time = time.time()
-        if animation_running and current_time >= next_frame_time:
-            update_animation_frame()
-            next_frame_time = current_time + FRAME_TIME
-            frame_count += 1
+        # Update animation frame (non-blocking), paced by the declared FPS
+        current_time = time.monotonic()
+        idle_sleep = IDLE_SLEEP["light"]
+        
+        # Playlist switch point: cut before drawing, so the next frame that
+        # reaches the panel is the new animation's first
+        if player and current_time >= switch_at:
+            playlist_switch(current_time)
+        
+        if animation_running:
+            idle_sleep = IDLE_SLEEP.get(animation_entry["cost"], 0)
+            if current_time >= next_frame_time:
+                render_start = time.monotonic_ns()
+                update_animation_frame()
+                if transition.active and not transition.step():
+                    panel.show(animation_module.group)
+                if overlay_layer:
+                    overlay_layer.update()
+                dither_palettes()
+                refresh_start = time.monotonic_ns()
+                panel.refresh()
+                refresh_ms = (time.monotonic_ns() - refresh_start) / 1000000
+                if overlay_layer:
+                    overlay_layer.note_refresh(refresh_ms)
+                fps = animation_entry["fps"] if animation_entry else 0
+                frame_time = 1.0 / fps if fps else FRAME_TIME
+                panel.note_frame((refresh_start - render_start) / 1000000, refresh_ms,
+                                 frame_time * 1000)
+                next_frame_time = current_time + frame_time
+                frame_count += 1
+        elif overlay_layer and overlay_layer.visible() and current_time >= next_frame_time:
+            # No animation: keep the overlay (clock) up to date once a second
+            overlay_layer.update()
+            panel.refresh()
+            next_frame_time = current_time + 1.0
+        
+        # Frame slack: get the upcoming playlist entry ready before its switch
+        if player and time.monotonic() < next_frame_time:
+            playlist_preload(current_time)
         
         # Always keep server responsive
         try:
@@ -324,7 +837,8 @@ try:
         except Exception as e:
             print("Server error: %s" % str(e))
         
-        time.sleep(0.01)  # Small sleep to prevent CPU spinning
+        if idle_sleep:
+            time.sleep(idle_sleep)  # Small sleep to prevent CPU spinning
 
 except Exception as e:
     print("STARTUP ERROR: %s" % str(e))
@@ -0,0 +1,3 @@
+"""
+engine - Shared runtime pieces used by code.py and the led_sequences
+"""
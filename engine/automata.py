@@ -0,0 +1,265 @@
+"""
+automata.py - Multi-state cellular automata driven by lookup tables
+
+A Rule is a table: next state = lut[state * 10 + n], where n is what the
+cell sees in its Moore neighbourhood. For most rules (Life-like,
+generations, Brian's Brain, Wireworld) n is the number of cells in the
+3x3 block - the cell itself included - that are in the rule's `fire`
+state; the table builders fold the "minus itself" in, so the inner loop
+is three column sums, one add and one lookup per cell. Cyclic rules count
+the neighbours holding the cell's successor state instead.
+
+Cells are one byte each in a bytearray with a one-cell border, double
+buffered; the border is refreshed from the opposite edge before each step
+so the board wraps without any modulo:
+
+    world = automata.Automaton(WIDTH, HEIGHT)
+    world.set_rule(automata.rule("brians-brain"))
+    world.seed()
+    world.draw(bitmap)
+    changed = world.step(bitmap)     # writes only cells that changed
+
+Any width/height works, so chained panels just make a wider board.
+"""
+from engine import prng
+
+NEIGHBOURHOOD = 10  # lut stride: n = 0..9
+RAINBOW = [0xFF0000, 0xFFFF00, 0x00FF00, 0x00FFFF, 0x0000FF, 0xFF00FF]
+
+
+class Rule:
+    """states, lut[state * 10 + n] -> next state, default colors and seed"""
+
+    def __init__(self, name, states, lut, colors, fire=1, cyclic=False,
+                 weights=None, seed=None):
+        self.name = name
+        self.states = states
+        self.lut = lut
+        self.colors = colors
+        self.fire = fire
+        self.cyclic = cyclic
+        # seed(): chance out of 256 of each state (state 0 gets the rest)
+        self.weights = weights or [0] + [64] + [0] * (states - 2)
+        self.seeder = seed
+
+
+# --- Table builders ---
+
+def generations(name, born, survive, states, colors, weights=None):
+    """Life-like rule with decay states ("B/S/C" notation): a dead cell
+    with a born count of live neighbours comes alive, a live cell with a
+    survive count stays, otherwise it ages through states 2..C-1 to 0"""
+    lut = bytearray(states * NEIGHBOURHOOD)
+    for n in range(NEIGHBOURHOOD):
+        if n in born:
+            lut[n] = 1
+        # n includes the live cell itself
+        if n - 1 in survive:
+            lut[NEIGHBOURHOOD + n] = 1
+        else:
+            lut[NEIGHBOURHOOD + n] = 2 if states > 2 else 0
+        for s in range(2, states):
+            lut[s * NEIGHBOURHOOD + n] = s + 1 if s + 1 < states else 0
+    return Rule(name, states, lut, colors, weights=weights)
+
+
+def wireworld(name="wireworld"):
+    """0 empty, 1 electron head, 2 tail, 3 wire: wire with one or two
+    heads next to it becomes a head"""
+    lut = bytearray(4 * NEIGHBOURHOOD)
+    for n in range(NEIGHBOURHOOD):
+        lut[NEIGHBOURHOOD + n] = 2
+        lut[2 * NEIGHBOURHOOD + n] = 3
+        lut[3 * NEIGHBOURHOOD + n] = 1 if n in (1, 2) else 3
+    colors = [0x000000, 0x4080FF, 0xFF4000, 0x604000]
+    return Rule(name, 4, lut, colors, seed=seed_circuits)
+
+
+def cyclic(name, states, threshold):
+    """A cell moves on to state s+1 (mod states) once at least threshold
+    neighbours are already there"""
+    lut = bytearray(states * NEIGHBOURHOOD)
+    for s in range(states):
+        for n in range(NEIGHBOURHOOD):
+            lut[s * NEIGHBOURHOOD + n] = (s + 1) % states if n >= threshold else s
+    colors = [RAINBOW[s * len(RAINBOW) // states] for s in range(states)]
+    weights = [256 // states] * states
+    return Rule(name, states, lut, colors, cyclic=True, weights=weights)
+
+
+RULES = {
+    "life": lambda: generations("life", (3,), (2, 3), 2, [0x000000, 0x00FF00]),
+    "brians-brain": lambda: generations("brians-brain", (2,), (), 3,
+                                        [0x000000, 0xFFFFFF, 0x0040FF]),
+    "star-wars": lambda: generations("star-wars", (2,), (3, 4, 5), 4,
+                                     [0x000000, 0xFFFFFF, 0xFF8000, 0x801000],
+                                     weights=[0, 80, 0, 0]),
+    "wireworld": wireworld,
+    "cyclic": lambda: cyclic("cyclic", 3, 3),
+}
+
+
+def rule(name):
+    """Build a rule from RULES by name"""
+    if name not in RULES:
+        raise ValueError("Unknown rule: %s" % name)
+    return RULES[name]()
+
+
+# --- Seeds ---
+
+def seed_circuits(world):
+    """Wireworld: rectangular wire loops, each with one electron"""
+    w, h = world.width, world.height
+    for _ in range(max(1, w * h // 160)):
+        lw = prng.randint(4, max(5, w // 3))
+        lh = prng.randint(3, max(4, h // 3))
+        x0 = prng.below(w)
+        y0 = prng.below(h)
+        loop = []
+        for x in range(lw):
+            loop.append((x, 0))
+        for y in range(1, lh):
+            loop.append((lw - 1, y))
+        for x in range(lw - 2, -1, -1):
+            loop.append((x, lh - 1))
+        for y in range(lh - 2, 0, -1):
+            loop.append((0, y))
+        for x, y in loop:
+            world.set((x0 + x) % w, (y0 + y) % h, 3)
+        head = prng.below(len(loop))
+        x, y = loop[head]
+        world.set((x0 + x) % w, (y0 + y) % h, 1)
+        x, y = loop[head - 1]
+        world.set((x0 + x) % w, (y0 + y) % h, 2)
+
+
+class Automaton:
+    """width x height bytes with a wrapped border, stepped by a Rule"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        size = self.stride * (height + 2)
+        self.cells = bytearray(size)
+        self.spare = bytearray(size)
+        self.columns = bytearray(self.stride)
+        self.rule = None
+        self.is_fire = None
+        self.successor = None
+
+    def set_rule(self, rule):
+        self.rule = rule
+        self.is_fire = bytes(1 if s == rule.fire else 0 for s in range(256))
+        self.successor = bytes((s + 1) % rule.states for s in range(256))
+
+    def set(self, x, y, state):
+        self.cells[(y + 1) * self.stride + x + 1] = state
+
+    def get(self, x, y):
+        return self.cells[(y + 1) * self.stride + x + 1]
+
+    def clear(self):
+        cells = self.cells
+        for i in range(len(cells)):
+            cells[i] = 0
+
+    def seed(self):
+        """Fresh random board for the current rule"""
+        self.clear()
+        if self.rule.seeder is not None:
+            self.rule.seeder(self)
+            return
+        cutoffs = []
+        total = 0
+        for s in range(1, self.rule.states):
+            total += self.rule.weights[s]
+            cutoffs.append(total)
+        for y in range(self.height):
+            for x in range(self.width):
+                r = prng.below(256)
+                state = 0
+                for s, cutoff in enumerate(cutoffs):
+                    if r < cutoff:
+                        state = s + 1
+                        break
+                self.set(x, y, state)
+
+    def wrap(self):
+        """Copy the opposite edges into the border"""
+        c, stride, w, h = self.cells, self.stride, self.width, self.height
+        for y in range(1, h + 1):
+            row = y * stride
+            c[row] = c[row + w]
+            c[row + w + 1] = c[row + 1]
+        last = h * stride
+        bottom = (h + 1) * stride
+        for x in range(stride):
+            c[x] = c[last + x]
+            c[bottom + x] = c[stride + x]
+
+    def step(self, bitmap=None):
+        """Advance one generation, writing changed cells into bitmap.
+        Returns the number of cells that changed."""
+        self.wrap()
+        if self.rule.cyclic:
+            changed = self.step_cyclic(bitmap)
+        else:
+            changed = self.step_fire(bitmap)
+        self.cells, self.spare = self.spare, self.cells
+        return changed
+
+    def step_fire(self, bitmap):
+        c, out, stride, w = self.cells, self.spare, self.stride, self.width
+        lut, fire, cols = self.rule.lut, self.is_fire, self.columns
+        changed = 0
+        for y in range(1, self.height + 1):
+            above = (y - 1) * stride
+            row = y * stride
+            below = (y + 1) * stride
+            for x in range(stride):
+                cols[x] = fire[c[above + x]] + fire[c[row + x]] + fire[c[below + x]]
+            left, middle = cols[0], cols[1]
+            for x in range(1, w + 1):
+                right = cols[x + 1]
+                s = c[row + x]
+                n = lut[s * NEIGHBOURHOOD + left + middle + right]
+                out[row + x] = n
+                if n != s:
+                    changed += 1
+                    if bitmap is not None:
+                        bitmap[x - 1, y - 1] = n
+                left, middle = middle, right
+        return changed
+
+    def step_cyclic(self, bitmap):
+        c, out, stride, w = self.cells, self.spare, self.stride, self.width
+        lut, succ = self.rule.lut, self.successor
+        changed = 0
+        for y in range(1, self.height + 1):
+            row = y * stride
+            for x in range(1, w + 1):
+                i = row + x
+                s = c[i]
+                t = succ[s]
+                a = i - stride
+                b = i + stride
+                n = ((c[a - 1] == t) + (c[a] == t) + (c[a + 1] == t)
+                     + (c[i - 1] == t) + (c[i + 1] == t)
+                     + (c[b - 1] == t) + (c[b] == t) + (c[b + 1] == t))
+                n = lut[s * NEIGHBOURHOOD + n]
+                out[i] = n
+                if n != s:
+                    changed += 1
+                    if bitmap is not None:
+                        bitmap[x - 1, y - 1] = n
+        return changed
+
+    def draw(self, bitmap):
+        """Write every cell into bitmap"""
+        c, stride = self.cells, self.stride
+        for y in range(self.height):
+            row = (y + 1) * stride + 1
+            for x in range(self.width):
+                bitmap[x, y] = c[row + x]
@@ -0,0 +1,234 @@
+"""
+color.py - Gamma, white balance and global brightness for every palette
+
+Sequences write plain 0xRRGGBB colors; a color.Palette keeps those source
+colors and writes the corrected ones into the displayio.Palette that the
+TileGrids actually use. Correction is three byte lookups per entry in
+tables built once per setting change (gamma curve x white balance x
+brightness), and an entry is only rewritten when its color changes:
+
+    palette = color.Palette(8)             # panel.surface() already does this
+    palette[3] = 0xFF8000                  # shown as correct(0xFF8000)
+    grid = displayio.TileGrid(bitmap, pixel_shader=color.shader(palette))
+
+configure(brightness=0.5) rebuilds the tables; palettes then need one
+apply() (a rewrite of their entries, no redraw) to show the new setting -
+code.py does that for the running animation through refresh(module).
+
+At low panel bit depths the dimmest gamma-corrected values round to black,
+so a value that would be visible without gamma is kept at the panel's
+first visible step (256 >> bit_depth) instead of disappearing.
+
+The corrected colors can be dithered (engine/dither.py): a palette with
+set_dither(dither.Ordered(n)) dithers each entry for its cell of an n x n
+tile, and with configure(dither="temporal") every other palette is
+dithered by frame phase - code.py then calls dither_frame() once a frame.
+
+True-color surfaces (panel.surface(panel.TRUE_COLOR)) have no palette:
+rgb565(rgb) corrects a color as it is packed into a pixel, so a new
+setting shows once the sequence redraws (compare `generation` with the
+value it last built its colors at).
+"""
+import array
+import displayio
+from engine import dither
+
+GAMMA = 2.2
+DITHER_MODES = ("off", "temporal")
+# The phase advances once per animation frame (auto_refresh is off), so
+# a pixel's cycle lasts PHASES frames: 15 Hz at 30 FPS with 2 phases. With
+# 4 the ramp error is lower (tools/bench_dither.py) but the 7.5 Hz cycle
+# is seen as shimmer instead of averaging to the color in between.
+TEMPORAL_PHASES = 2
+
+settings = {
+    "gamma": GAMMA,
+    "brightness": 1.0,
+    "balance": (1.0, 1.0, 1.0),
+    "bit_depth": 4,
+    "dither": "off",
+}
+
+_red = bytearray(256)
+_green = bytearray(256)
+_blue = bytearray(256)
+generation = 0
+temporal = dither.Temporal(TEMPORAL_PHASES)
+_frame = None       # temporal while it is on
+
+
+def _build():
+    global generation, _frame
+    gamma = settings["gamma"]
+    brightness = settings["brightness"]
+    floor = 256 >> settings["bit_depth"]
+    for table, balance in zip((_red, _green, _blue), settings["balance"]):
+        scale = balance * brightness
+        for i in range(256):
+            linear = i * scale
+            value = int(255 * (i / 255) ** gamma * scale + 0.5)
+            if value < floor <= linear:
+                value = floor
+            table[i] = min(255, value)
+    temporal.prepare(settings["bit_depth"])
+    _frame = temporal if settings["dither"] == "temporal" else None
+    generation += 1
+
+
+def configure(gamma=None, brightness=None, balance=None, bit_depth=None, dither=None):
+    """Change the correction; raises ValueError on bad values. Returns the
+    settings now in effect."""
+    if gamma is not None:
+        gamma = float(gamma)
+        if not 0.5 <= gamma <= 4.0:
+            raise ValueError("gamma must be 0.5..4.0")
+    if brightness is not None:
+        brightness = float(brightness)
+        if not 0.0 <= brightness <= 1.0:
+            raise ValueError("brightness must be 0.0..1.0")
+    if balance is not None:
+        balance = tuple(float(b) for b in balance)
+        if len(balance) != 3 or not all(0.0 <= b <= 1.0 for b in balance):
+            raise ValueError("balance must be three values 0.0..1.0")
+    if bit_depth is not None:
+        bit_depth = int(bit_depth)
+        if not 1 <= bit_depth <= 8:
+            raise ValueError("bit_depth must be 1..8")
+    if dither is not None and dither not in DITHER_MODES:
+        raise ValueError("dither must be one of %s" % ", ".join(DITHER_MODES))
+    for key, value in (("gamma", gamma), ("brightness", brightness),
+                       ("balance", balance), ("bit_depth", bit_depth),
+                       ("dither", dither)):
+        if value is not None:
+            settings[key] = value
+    _build()
+    return status()
+
+
+def status():
+    return {
+        "gamma": settings["gamma"],
+        "brightness": settings["brightness"],
+        "balance": list(settings["balance"]),
+        "dither": settings["dither"],
+    }
+
+
+def correct(rgb):
+    """Corrected 0xRRGGBB of a source color"""
+    return (_red[rgb >> 16 & 0xFF] << 16) | (_green[rgb >> 8 & 0xFF] << 8) | _blue[rgb & 0xFF]
+
+
+def rgb565(rgb):
+    """Corrected color as an RGB565 pixel value"""
+    rgb = correct(rgb)
+    return ((rgb >> 8) & 0xF800) | ((rgb >> 5) & 0x07E0) | ((rgb & 0xFF) >> 3)
+
+
+def scale(rgb, level):
+    """rgb with each channel times level/256 (integer math)"""
+    return ((((rgb >> 16 & 0xFF) * level) >> 8) << 16) | \
+        ((((rgb >> 8 & 0xFF) * level) >> 8) << 8) | (((rgb & 0xFF) * level) >> 8)
+
+
+def ramp(palette, first, count, rgb):
+    """palette[first + i] = rgb at (i + 1)/count brightness, i < count"""
+    for i in range(count):
+        palette[first + i] = scale(rgb, (i + 1) * 256 // count)
+
+
+def shader(palette):
+    """The displayio.Palette to hand to a TileGrid"""
+    return getattr(palette, "palette", palette)
+
+
+class Palette:
+    """Source colors + the corrected displayio.Palette showing them"""
+
+    def __init__(self, count):
+        self.palette = displayio.Palette(count)
+        self.colors = array.array("L", [0] * count)
+        self.generation = generation
+        self.dither = None
+
+    def __len__(self):
+        return len(self.colors)
+
+    def __getitem__(self, index):
+        return self.colors[index]
+
+    def __setitem__(self, index, rgb):
+        if isinstance(rgb, tuple):
+            rgb = (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]
+        if self.generation != generation:
+            self.apply()
+        elif self.colors[index] == rgb:
+            return
+        self.colors[index] = rgb
+        shown = (_red[rgb >> 16 & 0xFF] << 16) | (_green[rgb >> 8 & 0xFF] << 8) | _blue[rgb & 0xFF]
+        ditherer = self.dither or _frame
+        if ditherer is not None:
+            shown = ditherer.shade(shown, index)
+        self.palette[index] = shown
+
+    def make_transparent(self, index):
+        self.palette.make_transparent(index)
+
+    def make_opaque(self, index):
+        self.palette.make_opaque(index)
+
+    def set_dither(self, ditherer):
+        """Dither entries with an engine.dither.Ordered (None: off)"""
+        self.dither = ditherer
+        self.apply()
+
+    def apply(self):
+        """Rewrite every entry with the current correction"""
+        self.generation = generation
+        shown, colors = self.palette, self.colors
+        ditherer = self.dither or _frame
+        if ditherer is None:
+            for i in range(len(colors)):
+                shown[i] = correct(colors[i])
+            return
+        ditherer.prepare(settings["bit_depth"])
+        for i in range(len(colors)):
+            shown[i] = ditherer.shade(correct(colors[i]), i)
+
+
+def collect(owner):
+    """Every Palette that is an attribute of owner (a module), or in a
+    list attribute"""
+    found = []
+    for name in dir(owner):
+        value = getattr(owner, name, None)
+        for palette in (value if isinstance(value, list) else (value,)):
+            if isinstance(palette, Palette):
+                found.append(palette)
+    return found
+
+
+def refresh(owner):
+    """apply() every Palette of owner; returns how many entries were rewritten"""
+    count = 0
+    for palette in collect(owner):
+        palette.apply()
+        count += len(palette)
+    return count
+
+
+def dither_frame(palettes):
+    """Next temporal phase: rewrite the palettes that have no ordered
+    dither of their own. Returns the entries rewritten (0 when off)."""
+    if _frame is None:
+        return 0
+    temporal.advance()
+    count = 0
+    for palette in palettes:
+        if palette.dither is None:
+            palette.apply()
+            count += len(palette)
+    return count
+
+
+_build()
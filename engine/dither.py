@@ -0,0 +1,106 @@
+"""
+dither.py - Ordered and temporal dithering for low panel bit depths
+
+At bit_depth=4 the panel shows only the top 4 bits of each channel, so
+a smooth 8-bit gradient collapses into 16 bands. Both ditherers here pick,
+per channel, between the two panel levels around a color by comparing
+its remainder with a threshold; the thresholds come from a Bayer matrix
+and all of it is precomputed into one 256-byte table per threshold, so
+dithering a color is three lookups.
+
+Ordered (spatial): color i of a gradient is written to palette entries
+i * cells + p, one per cell p of an n x n Bayer tile, each dithered with
+its own threshold. The sequence picks the entry for a pixel with the code
+of its position - one OR per pixel during index generation:
+
+    palette.set_dither(dither.Ordered(2))          # 4 entries per color
+    codes = palette.dither.rows[y & 1]             # per row
+    bitmap[x, y] = (level << 2) | codes[x & 1]
+
+Temporal: every palette entry is dithered with the threshold of the
+current frame's phase and the palettes are rewritten each frame, so a
+pixel alternates between the two levels and averages to the color in
+between. engine.color applies it to all palettes when enabled. A phase
+lasts one animation frame, so more phases mean finer steps but a slower,
+visible flicker (see engine.color.TEMPORAL_PHASES).
+
+Tables are rebuilt by prepare(bit_depth) when the panel depth changes.
+"""
+
+
+def bayer(size):
+    """size x size Bayer matrix (size a power of 2) as a flat list, values
+    0 .. size*size - 1"""
+    matrix = [[0]]
+    while len(matrix) < size:
+        matrix = ([[4 * v for v in row] + [4 * v + 2 for v in row] for row in matrix] +
+                  [[4 * v + 3 for v in row] + [4 * v + 1 for v in row] for row in matrix])
+    return [v for row in matrix for v in row]
+
+
+def table(rank, count, step):
+    """Channel value -> dithered value for threshold rank/count of a step"""
+    offset = (2 * rank + 1) * step // (2 * count)
+    out = bytearray(256)
+    for v in range(256):
+        level = (v + step - offset) // step * step
+        out[v] = 255 if level > 255 else level
+    return out
+
+
+def bit_reversed(count):
+    """0 .. count-1 (a power of 2) in bit-reversed order: 0, 2, 1, 3 for 4"""
+    order = [0]
+    while len(order) < count:
+        order = [2 * v for v in order] + [2 * v + 1 for v in order]
+    return order
+
+
+class Ditherer:
+    """One threshold table per rank, rebuilt per bit depth"""
+
+    def __init__(self, ranks):
+        self.ranks = ranks
+        self.bit_depth = None
+        self.tables = None
+
+    def prepare(self, bit_depth):
+        if bit_depth != self.bit_depth:
+            step = 256 >> bit_depth
+            count = len(self.ranks)
+            self.tables = [table(rank, count, step) for rank in self.ranks]
+            self.bit_depth = bit_depth
+
+    def dither(self, rgb, phase):
+        t = self.tables[phase]
+        return (t[rgb >> 16 & 0xFF] << 16) | (t[rgb >> 8 & 0xFF] << 8) | t[rgb & 0xFF]
+
+
+class Ordered(Ditherer):
+    """n x n spatial dither: `cells` palette entries per color"""
+
+    def __init__(self, size=2):
+        ranks = bayer(size)
+        Ditherer.__init__(self, ranks)
+        self.size = size
+        self.cells = size * size
+        # Code (cell index) of each pixel position, one bytes row per y % size
+        self.rows = [bytes(y * size + x for x in range(size)) for y in range(size)]
+
+    def shade(self, rgb, index):
+        return self.dither(rgb, index % self.cells)
+
+
+class Temporal(Ditherer):
+    """Frame-to-frame dither over `phases` frames"""
+
+    def __init__(self, phases=2):
+        Ditherer.__init__(self, bit_reversed(phases))
+        self.phases = phases
+        self.phase = 0
+
+    def advance(self):
+        self.phase = (self.phase + 1) % self.phases
+
+    def shade(self, rgb, index):
+        return self.dither(rgb, self.phase)
@@ -0,0 +1,150 @@
+"""
+glyphfont.py - Compiled (.glf) fonts read glyph by glyph from flash
+
+tools/fontc.py turns a BDF font into a .glf file (format described
+there). Opening one reads just the header and the sorted codepoint index
+(2 bytes per glyph); a glyph's columns are read from the file the first
+time it is drawn and kept in a small LRU cache, so a font with hundreds
+of glyphs costs about as much RAM as the few it actually shows:
+
+    font = glyphfont.load("5x7.glf")           # from FONT_DIR, cached
+    x = font.draw(bitmap, "HELLO", 2, 10, color)
+
+A GlyphFont is also a ticker font (`height`, glyph_width(), column()), so
+it can be handed to engine.ticker.Ticker in place of terminalio.FONT.
+Characters the font lacks use its fallback glyph (BDF DEFAULT_CHAR) or
+are skipped.
+"""
+import array
+import struct
+
+FONT_DIR = "/lib/fonts"
+MAGIC = b"GLF1"
+HEADER = "<4sHBBBBH"  # + 4 reserved bytes
+HEADER_SIZE = 16
+NO_FALLBACK = 0xFFFF
+
+_fonts = {}
+
+
+def load(name, cache=32):
+    """Open FONT_DIR/name once; later calls (and re-imports) share it"""
+    if name not in _fonts:
+        _fonts[name] = GlyphFont("%s/%s" % (FONT_DIR, name), cache)
+    return _fonts[name]
+
+
+class GlyphFont:
+    """A .glf file plus an LRU cache of up to `cache` glyphs"""
+
+    def __init__(self, path, cache=32):
+        self.file = open(path, "rb")
+        header = self.file.read(HEADER_SIZE)
+        magic, count, height, baseline, max_width, column_bytes, fallback = \
+            struct.unpack_from(HEADER, header)
+        if magic != MAGIC:
+            raise ValueError("%s is not a .glf font" % path)
+        self.count = count
+        self.height = height
+        self.baseline = baseline
+        self.max_width = max_width
+        self.column_bytes = column_bytes
+        self.fallback = fallback
+        self.codes = array.array("H", self.file.read(2 * count))
+        self.offsets_at = HEADER_SIZE + 2 * count
+        self.capacity = max(1, cache)
+        self.glyphs = {}
+        self.order = []
+        self.offset = bytearray(4)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.file.close()
+
+    def find(self, code):
+        """Index of a codepoint in the font, or -1"""
+        codes = self.codes
+        lo, hi = 0, self.count - 1
+        while lo <= hi:
+            mid = (lo + hi) >> 1
+            c = codes[mid]
+            if c == code:
+                return mid
+            if c < code:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return -1
+
+    def glyph(self, char):
+        """Glyph record (advance byte + columns) of a character, or None"""
+        data = self.glyphs.get(char)
+        if data is not None:
+            self.hits += 1
+            order = self.order
+            if order[-1] != char:
+                order.remove(char)
+                order.append(char)
+            return data
+        self.misses += 1
+        index = self.find(ord(char))
+        if index < 0:
+            if self.fallback == NO_FALLBACK:
+                return None
+            index = self.fallback
+        f = self.file
+        f.seek(self.offsets_at + 4 * index)
+        f.readinto(self.offset)
+        f.seek(struct.unpack("<I", self.offset)[0])
+        width = f.read(1)[0]
+        data = bytes((width,)) + f.read(width * self.column_bytes)
+        if len(self.order) >= self.capacity:
+            del self.glyphs[self.order.pop(0)]
+        self.glyphs[char] = data
+        self.order.append(char)
+        return data
+
+    def glyph_width(self, char):
+        data = self.glyph(char)
+        return data[0] if data else 0
+
+    def column(self, char, x):
+        """Bits of column x of a glyph (bit y = row y)"""
+        data = self.glyph(char)
+        if not data or x >= data[0]:
+            return 0
+        n = self.column_bytes
+        i = 1 + x * n
+        bits = 0
+        for b in range(n):
+            bits |= data[i + b] << (8 * b)
+        return bits
+
+    def text_width(self, text):
+        return sum(self.glyph_width(char) for char in text)
+
+    def draw(self, bitmap, text, x, y, color):
+        """Draw text with its top left at (x, y), clipped to the bitmap;
+        returns the x after the last glyph"""
+        w, h = bitmap.width, bitmap.height
+        n = self.column_bytes
+        for char in text:
+            data = self.glyph(char)
+            if not data:
+                continue
+            for cx in range(data[0]):
+                px = x + cx
+                if 0 <= px < w:
+                    i = 1 + cx * n
+                    bits = 0
+                    for b in range(n):
+                        bits |= data[i + b] << (8 * b)
+                    py = y
+                    while bits:
+                        if bits & 1 and 0 <= py < h:
+                            bitmap[px, py] = color
+                        bits >>= 1
+                        py += 1
+            x += data[0]
+        return x
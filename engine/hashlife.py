@@ -0,0 +1,310 @@
+"""
+hashlife.py - Unbounded Game of Life on a memoised hashed quadtree
+
+The universe is a quadtree whose nodes are interned: equal sub-squares
+are the same node, so a sea of empty space or a stream of identical
+gliders costs almost nothing. A node of level k (a 2**k square) also
+remembers its centre square after 2**j generations (j <= k-2), so
+repeated structure is only ever computed once (Gosper's Hashlife):
+
+    universe = hashlife.Universe(node_cap=6000)
+    universe.set_cell(0, 0)
+    universe.advance(64)                 # any number of generations
+    universe.draw(bitmap, cx, cy, scale)  # 2**scale cells per pixel
+
+Nodes are small ints indexing parallel lists (children, level,
+population) and interned through a dict keyed by the four children. When
+more than node_cap nodes exist the store is rebuilt from what the root
+still uses and the result memo is dropped; `full` is set if even that
+does not get under the cap. Cell (0, 0) stays at the centre of the root.
+"""
+
+
+class Universe:
+    """Interned quadtree nodes; node 0 = dead cell, node 1 = live cell"""
+
+    def __init__(self, node_cap=6000):
+        self.node_cap = node_cap
+        self.clear()
+
+    def clear(self):
+        self.nw = [0, 0]
+        self.ne = [0, 0]
+        self.sw = [0, 0]
+        self.se = [0, 0]
+        self.level = [0, 0]
+        self.pop = [0, 1]
+        self.index = {}
+        self.results = {}
+        self.empty = [0]
+        self.root = self.empty_node(3)
+        self.generation = 0
+        self.full = False
+
+    # --- Nodes ---
+
+    def node(self, nw, ne, sw, se):
+        """The interned node with these four children"""
+        key = (nw, ne, sw, se)
+        n = self.index.get(key)
+        if n is None:
+            n = len(self.level)
+            self.nw.append(nw)
+            self.ne.append(ne)
+            self.sw.append(sw)
+            self.se.append(se)
+            self.level.append(self.level[nw] + 1)
+            pop = self.pop
+            self.pop.append(pop[nw] + pop[ne] + pop[sw] + pop[se])
+            self.index[key] = n
+        return n
+
+    def empty_node(self, k):
+        while len(self.empty) <= k:
+            e = self.empty[-1]
+            self.empty.append(self.node(e, e, e, e))
+        return self.empty[k]
+
+    def expand(self, n):
+        """Same pattern, centred in a node twice the size"""
+        e = self.empty_node(self.level[n] - 1)
+        return self.node(self.node(e, e, e, self.nw[n]), self.node(e, e, self.ne[n], e),
+                         self.node(e, self.sw[n], e, e), self.node(self.se[n], e, e, e))
+
+    def centre(self, n):
+        """The middle half of n (one level down)"""
+        return self.node(self.se[self.nw[n]], self.sw[self.ne[n]],
+                         self.ne[self.sw[n]], self.nw[self.se[n]])
+
+    def padded(self, n):
+        """True if every live cell is in the middle quarter of n"""
+        nw, ne, sw, se, pop = self.nw, self.ne, self.sw, self.se, self.pop
+        return (pop[nw[n]] == pop[se[se[nw[n]]]] and pop[ne[n]] == pop[sw[sw[ne[n]]]]
+                and pop[sw[n]] == pop[ne[ne[sw[n]]]] and pop[se[n]] == pop[nw[nw[se[n]]]])
+
+    # --- Cells ---
+
+    def half(self):
+        return 1 << (self.level[self.root] - 1)
+
+    def set_cell(self, x, y, alive=True):
+        while not (-self.half() <= x < self.half() and -self.half() <= y < self.half()):
+            self.root = self.expand(self.root)
+        half = self.half()
+        self.root = self._set(self.root, x + half, y + half, 1 if alive else 0)
+
+    def _set(self, n, x, y, value):
+        k = self.level[n]
+        if k == 0:
+            return value
+        h = 1 << (k - 1)
+        nw, ne, sw, se = self.nw[n], self.ne[n], self.sw[n], self.se[n]
+        if y < h:
+            if x < h:
+                nw = self._set(nw, x, y, value)
+            else:
+                ne = self._set(ne, x - h, y, value)
+        elif x < h:
+            sw = self._set(sw, x, y - h, value)
+        else:
+            se = self._set(se, x - h, y - h, value)
+        return self.node(nw, ne, sw, se)
+
+    def get_cell(self, x, y):
+        half = self.half()
+        if not (-half <= x < half and -half <= y < half):
+            return 0
+        n, x, y = self.root, x + half, y + half
+        while self.level[n] > 0:
+            h = 1 << (self.level[n] - 1)
+            if y < h:
+                n = self.nw[n] if x < h else self.ne[n]
+            else:
+                n = self.sw[n] if x < h else self.se[n]
+            x &= h - 1
+            y &= h - 1
+        return n
+
+    def population(self):
+        return self.pop[self.root]
+
+    # --- Stepping ---
+
+    def life_4x4(self, n):
+        """Centre 2x2 of a level-2 node after one generation"""
+        nw, ne, sw, se = self.nw, self.ne, self.sw, self.se
+        bits = 0
+        for i, q in enumerate((nw[n], ne[n], sw[n], se[n])):
+            x = (i & 1) * 2
+            y = (i >> 1) * 2
+            bits |= (nw[q] << (y * 4 + x) | ne[q] << (y * 4 + x + 1)
+                     | sw[q] << (y * 4 + x + 4) | se[q] << (y * 4 + x + 5))
+        out = []
+        for y in (1, 2):
+            for x in (1, 2):
+                count = 0
+                for dy in (-1, 0, 1):
+                    for dx in (-1, 0, 1):
+                        if (dx or dy) and bits >> ((y + dy) * 4 + x + dx) & 1:
+                            count += 1
+                alive = bits >> (y * 4 + x) & 1
+                out.append(1 if count == 3 or (alive and count == 2) else 0)
+        return self.node(out[0], out[1], out[2], out[3])
+
+    def successor(self, m, j):
+        """Centre of node m (level k) after 2**min(j, k-2) generations"""
+        k = self.level[m]
+        if j > k - 2:
+            j = k - 2
+        key = m * 64 + j
+        r = self.results.get(key)
+        if r is not None:
+            return r
+        if self.pop[m] == 0:
+            r = self.empty_node(k - 1)
+        elif k == 2:
+            r = self.life_4x4(m)
+        else:
+            nw, ne, sw, se, node = self.nw, self.ne, self.sw, self.se, self.node
+            a, b, c, d = nw[m], ne[m], sw[m], se[m]
+            # Nine overlapping level k-1 squares, each stepped
+            c1 = self.successor(a, j)
+            c2 = self.successor(node(ne[a], nw[b], se[a], sw[b]), j)
+            c3 = self.successor(b, j)
+            c4 = self.successor(node(sw[a], se[a], nw[c], ne[c]), j)
+            c5 = self.successor(node(se[a], sw[b], ne[c], nw[d]), j)
+            c6 = self.successor(node(sw[b], se[b], nw[d], ne[d]), j)
+            c7 = self.successor(c, j)
+            c8 = self.successor(node(ne[c], nw[d], se[c], sw[d]), j)
+            c9 = self.successor(d, j)
+            if j < k - 2:
+                # Already far enough: just take the middles
+                r = node(node(se[c1], sw[c2], ne[c4], nw[c5]),
+                         node(se[c2], sw[c3], ne[c5], nw[c6]),
+                         node(se[c4], sw[c5], ne[c7], nw[c8]),
+                         node(se[c5], sw[c6], ne[c8], nw[c9]))
+            else:
+                r = node(self.successor(node(c1, c2, c4, c5), j),
+                         self.successor(node(c2, c3, c5, c6), j),
+                         self.successor(node(c4, c5, c7, c8), j),
+                         self.successor(node(c5, c6, c8, c9), j))
+        self.results[key] = r
+        return r
+
+    def step_pow2(self, j):
+        """Advance exactly 2**j generations"""
+        while self.level[self.root] < j + 3 or not self.padded(self.root):
+            self.root = self.expand(self.root)
+        self.root = self.successor(self.root, j)
+        self.generation += 1 << j
+        self.crop()
+
+    def crop(self):
+        """Drop empty border levels from the root"""
+        pop, nw, ne, sw, se = self.pop, self.nw, self.ne, self.sw, self.se
+        while self.level[self.root] > 3:
+            n = self.root
+            inner = pop[se[nw[n]]] + pop[sw[ne[n]]] + pop[ne[sw[n]]] + pop[nw[se[n]]]
+            if inner != pop[n]:
+                return
+            self.root = self.centre(n)
+
+    def advance(self, generations):
+        """Advance any number of generations (one step per set bit)"""
+        j = 0
+        while generations:
+            if generations & 1:
+                self.step_pow2(j)
+                if len(self.level) > self.node_cap:
+                    self.compact()
+            generations >>= 1
+            j += 1
+
+    # --- Memory ---
+
+    def compact(self):
+        """Rebuild the node store with only what the root uses"""
+        old = (self.nw, self.ne, self.sw, self.se, self.level)
+        root, generation = self.root, self.generation
+        self.clear()
+        mapping = {0: 0, 1: 1}
+        self.root = self._copy(root, old, mapping)
+        self.generation = generation
+        self.full = len(self.level) > self.node_cap * 3 // 4
+
+    def _copy(self, n, old, mapping):
+        m = mapping.get(n)
+        if m is None:
+            nw, ne, sw, se, _ = old
+            m = self.node(self._copy(nw[n], old, mapping), self._copy(ne[n], old, mapping),
+                          self._copy(sw[n], old, mapping), self._copy(se[n], old, mapping))
+            mapping[n] = m
+        return m
+
+    # --- Viewing ---
+
+    def bounds(self):
+        """(x0, y0, x1, y1) of the live cells (inclusive), or None"""
+        if self.pop[self.root] == 0:
+            return None
+        half = self.half()
+        size = half * 2
+        return (self._edge(self.root, size, 0) - half, self._edge(self.root, size, 1) - half,
+                self._edge(self.root, size, 2) - half, self._edge(self.root, size, 3) - half)
+
+    def _edge(self, n, size, side):
+        """Extreme live coordinate in n: 0 min x, 1 min y, 2 max x, 3 max y"""
+        if size == 1:
+            return 0
+        h = size >> 1
+        pop = self.pop
+        # Children nearest that side first
+        if side == 0:
+            near, far, offset = (self.nw[n], self.sw[n]), (self.ne[n], self.se[n]), h
+        elif side == 1:
+            near, far, offset = (self.nw[n], self.ne[n]), (self.sw[n], self.se[n]), h
+        elif side == 2:
+            near, far, offset = (self.ne[n], self.se[n]), (self.nw[n], self.sw[n]), -h
+        else:
+            near, far, offset = (self.sw[n], self.se[n]), (self.nw[n], self.ne[n]), -h
+        base = h if side >= 2 else 0
+        if not (pop[near[0]] or pop[near[1]]):
+            near, base = far, base + offset
+        best = None
+        for child in near:
+            if pop[child]:
+                e = self._edge(child, h, side)
+                if best is None or (e > best if side >= 2 else e < best):
+                    best = e
+        return base + best
+
+    def draw(self, bitmap, cx, cy, scale=0, levels=8):
+        """Show the universe with cell (cx, cy) in the middle of bitmap and
+        2**scale x 2**scale cells per pixel, brighter where denser (palette
+        indexes 1..levels-1). Clears the bitmap first."""
+        bitmap.fill(0)
+        w, h = bitmap.width, bitmap.height
+        x0 = (cx - (w << scale) // 2) >> scale << scale
+        y0 = (cy - (h << scale) // 2) >> scale << scale
+        half = self.half()
+        view = (x0, y0, x0 + (w << scale), y0 + (h << scale), scale, levels)
+        self._draw(bitmap, self.root, -half, -half, view)
+
+    def _draw(self, bitmap, n, x, y, view):
+        pop = self.pop[n]
+        if not pop:
+            return
+        x0, y0, x1, y1, scale, levels = view
+        k = self.level[n]
+        size = 1 << k
+        if x >= x1 or y >= y1 or x + size <= x0 or y + size <= y0:
+            return
+        if k <= scale:
+            area = 1 << (2 * k)
+            bitmap[(x - x0) >> scale, (y - y0) >> scale] = 1 + (pop * (levels - 2) + area - 1) // area
+            return
+        h = size >> 1
+        self._draw(bitmap, self.nw[n], x, y, view)
+        self._draw(bitmap, self.ne[n], x + h, y, view)
+        self._draw(bitmap, self.sw[n], x, y + h, view)
+        self._draw(bitmap, self.se[n], x + h, y + h, view)
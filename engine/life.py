@@ -0,0 +1,178 @@
+"""
+life.py - Bit-packed Conway's Game of Life on a torus
+
+Each row is one int with bit x = column x. A generation is a handful of
+bitwise operations per row instead of nine neighbour lookups per cell:
+every row's horizontal 3-cell sum is kept as two bit planes, the three
+row sums above/at/below a row are added with adder logic, and a cell lives
+if the 3x3 total is 3, or 4 and it was alive already. Rows are double
+buffered, so nothing is allocated per cell.
+
+Ages (1..7, 0 = dead) live in three more bit planes per row, incremented
+with saturating adder logic, and draw() only writes the pixels whose age
+changed. A hash of every generation, folded together from the rows as
+step() writes them, is remembered for `history` generations, so still
+lifes and short oscillators are noticed:
+
+    world = life.Life(WIDTH, HEIGHT)
+    world.randomize()
+    if world.step():          # True: repeats a recent generation (or empty)
+        world.sprinkle()
+    world.draw(bitmap)
+"""
+from engine import prng
+
+MAX_AGE = 7
+HASH_BITS = 30      # generation hashes stay small ints
+HASH_MASK = (1 << HASH_BITS) - 1
+HASH_MULT = 1000003
+
+
+class Life:
+    """width x height cells, rows as ints, ages as 3 bit planes"""
+
+    def __init__(self, width, height, history=32):
+        self.width = width
+        self.height = height
+        self.mask = (1 << width) - 1
+        self.rows = [0] * height
+        self.spare = [0] * height
+        # Horizontal sums of each row: bit 0 and bit 1 planes
+        self.sum0 = [0] * height
+        self.sum1 = [0] * height
+        self.age0 = [0] * height
+        self.age1 = [0] * height
+        self.age2 = [0] * height
+        self.dirty = [0] * height
+        self.hashes = [None] * history
+        self.hash_index = 0
+        self.generation = 0
+
+    # --- Seeding ---
+
+    def random_row(self, shift=1):
+        """Row with each cell alive with probability 1 / 2**shift"""
+        row = self.mask
+        for _ in range(shift):
+            bits = 0
+            for k in range(0, self.width, 16):
+                bits |= prng.next16() << k
+            row &= bits
+        return row
+
+    def randomize(self, shift=1):
+        """Replace every row; resets ages and the cycle history"""
+        for y in range(self.height):
+            self.rows[y] = self.random_row(shift)
+            self.age0[y] = self.rows[y]
+            self.age1[y] = 0
+            self.age2[y] = 0
+            self.dirty[y] = self.mask
+        self.forget()
+        self.generation = 0
+
+    def sprinkle(self, shift=4):
+        """Bring random cells (1 / 2**shift of them) to life"""
+        for y in range(self.height):
+            self.rows[y] |= self.random_row(shift)
+        self.forget()
+
+    def forget(self):
+        for i in range(len(self.hashes)):
+            self.hashes[i] = None
+
+    # --- Stepping ---
+
+    def step(self):
+        """Advance one generation. Returns True if it is empty or repeats
+        one of the last `history` generations."""
+        w, h, mask = self.width, self.height, self.mask
+        top = w - 1
+        rows, out = self.rows, self.spare
+        sum0, sum1 = self.sum0, self.sum1
+        for y in range(h):
+            c = rows[y]
+            l = ((c << 1) | (c >> top)) & mask
+            r = (c >> 1) | ((c & 1) << top)
+            lc = l ^ c
+            sum0[y] = lc ^ r
+            sum1[y] = (l & c) | (r & lc)
+        a0, a1 = sum0[h - 1], sum1[h - 1]
+        b0, b1 = sum0[0], sum1[0]
+        key = 0
+        for y in range(h):
+            n = y + 1 if y + 1 < h else 0
+            c0, c1 = sum0[n], sum1[n]
+            # total = (a1 a0) + (b1 b0) + (c1 c0), 0..9
+            ab = a0 ^ b0
+            s0 = ab ^ c0
+            k0 = (a0 & b0) | (c0 & ab)
+            # m = a1 + b1 + c1 + k0 (the twos): need m == 1 and m == 2
+            x, xa = a1 ^ b1, a1 & b1
+            z, za = c1 ^ k0, c1 & k0
+            p = x ^ z
+            one = p & ~(xa | za)
+            two = ~p & ((x & z) | (xa ^ za))
+            # total 3 -> alive, total 4 (self + 3) -> unchanged
+            row = out[y] = (s0 & one) | (~s0 & two & rows[y])
+            # Fold the row into the generation hash, HASH_BITS at a time
+            key = (key * HASH_MULT + 1) & HASH_MASK
+            while row:
+                key = (key * HASH_MULT ^ row) & HASH_MASK
+                row >>= HASH_BITS
+            a0, a1, b0, b1 = b0, b1, c0, c1
+        self.rows, self.spare = out, rows
+        self.generation += 1
+        self.update_ages()
+        return self.repeating(key)
+
+    def update_ages(self):
+        """Alive cells age by one up to MAX_AGE, dead cells go to 0"""
+        rows, age0, age1, age2, dirty = self.rows, self.age0, self.age1, self.age2, self.dirty
+        for y in range(self.height):
+            alive = rows[y]
+            a0, a1, a2 = age0[y], age1[y], age2[y]
+            full = a0 & a1 & a2
+            n0 = (~a0 | full) & alive
+            n1 = ((a1 ^ a0) | full) & alive
+            n2 = ((a2 ^ (a1 & a0)) | full) & alive
+            dirty[y] |= (n0 ^ a0) | (n1 ^ a1) | (n2 ^ a2)
+            age0[y], age1[y], age2[y] = n0, n1, n2
+
+    def repeating(self, key):
+        """Remember key (this generation's hash); True if it was seen in
+        the last `history` generations or nothing is alive"""
+        if not any(self.rows):
+            return True
+        if key in self.hashes:
+            return True
+        self.hashes[self.hash_index] = key
+        self.hash_index = (self.hash_index + 1) % len(self.hashes)
+        return False
+
+    # --- Output ---
+
+    def age(self, x, y):
+        bit = 1 << x
+        return ((1 if self.age0[y] & bit else 0) | (2 if self.age1[y] & bit else 0)
+                | (4 if self.age2[y] & bit else 0))
+
+    def draw(self, bitmap):
+        """Write the age of every cell that changed since the last draw"""
+        age0, age1, age2, dirty = self.age0, self.age1, self.age2, self.dirty
+        for y in range(self.height):
+            d = dirty[y]
+            if not d:
+                continue
+            a0, a1, a2 = age0[y], age1[y], age2[y]
+            x = 0
+            while d:
+                if not d & 0xFF:
+                    d >>= 8
+                    x += 8
+                    continue
+                if d & 1:
+                    bitmap[x, y] = (a0 >> x & 1) | (a1 >> x & 1) << 1 | (a2 >> x & 1) << 2
+                d >>= 1
+                x += 1
+            dirty[y] = 0
@@ -0,0 +1,46 @@
+"""
+manifest.py - Animation manifest reader
+
+led_sequences/manifest.json is generated on the host by
+tools/build_manifest.py. Reading it at boot gives the animation list
+and per-animation hints without importing any sequence module.
+"""
+import json
+
+MANIFEST_PATH = "/led_sequences/manifest.json"
+
+# Fallback entry values if a hand-edited manifest leaves a field out
+DEFAULTS = {"fps": 30, "palette": 0, "memory": 0, "cost": "medium", "bit_depth": None,
+            "options": False}
+
+
+def load(path=MANIFEST_PATH):
+    """Read the manifest once. Returns (raw_json_text, list_of_entries)."""
+    try:
+        with open(path, "r") as f:
+            raw = f.read()
+        entries = json.loads(raw)["animations"]
+    except Exception as e:
+        print("Manifest error: %s" % str(e))
+        return '{"version": 1, "animations": []}', []
+
+    for entry in entries:
+        for key, value in DEFAULTS.items():
+            if key not in entry:
+                entry[key] = value
+        if "module" not in entry:
+            entry["module"] = "led_sequences.%s" % entry["name"]
+    return raw, entries
+
+
+def names(entries):
+    """Animation names in manifest (NVM index) order"""
+    return [entry["name"] for entry in entries]
+
+
+def find(entries, name):
+    """Manifest entry for name, or None"""
+    for entry in entries:
+        if entry["name"] == name:
+            return entry
+    return None
@@ -0,0 +1,168 @@
+"""
+overlay.py - Clock / status / message text on top of any animation
+
+The overlay is one displayio.Group that engine.panel keeps above whatever
+animation (or transition) is showing, so it needs no help from the
+sequences. Text is not drawn pixel by pixel: every character is rendered
+once into a slot of a glyph sheet bitmap, and each text item is a
+TileGrid over that sheet, so changing the text only sets tile indices.
+Nothing is touched on frames where the text stays the same:
+
+    layer = overlay.Overlay(glyphfont.load("3x5.glf"), WIDTH, HEIGHT)
+    panel.set_overlay(layer.group)
+    layer.set("status", "PLAYLIST")
+    layer.update()                     # every frame: ticks the clock
+
+update_us is the average time update() takes per frame and refresh_ms
+the average panel refresh with the overlay on and off (note_refresh()),
+so the cost of showing it can be read from /api/overlay.
+"""
+import time
+import displayio
+from engine import color
+
+# Item name -> (anchor x, anchor y): 0 = left/top, 1 = right/bottom
+ITEMS = {
+    "status": (0, 0),
+    "clock": (1, 0),
+    "message": (0, 1),
+}
+
+TRANSPARENT = 0
+INK = 1
+BACKGROUND = 2
+
+
+class Overlay:
+    """Glyph sheet + one TileGrid per item, in `group`"""
+
+    def __init__(self, font, width, height, slots=64, ink=0xFFFFFF,
+                 background=0x000000, upper=False):
+        self.font = font
+        self.width = width
+        self.height = height
+        self.upper = upper
+        self.cell_width = getattr(font, "max_width", 0) or font.glyph_width(" ")
+        self.cell_height = font.height
+        self.sheet = displayio.Bitmap(self.cell_width * slots, self.cell_height, 3)
+        self.palette = color.Palette(3)
+        self.palette.make_transparent(TRANSPARENT)
+        self.palette[INK] = ink
+        self.palette[BACKGROUND] = background
+        self.capacity = slots
+        self.slots = {}      # char -> sheet slot (slot 0 stays transparent)
+        self.group = displayio.Group()
+        self.items = {}
+        self.texts = {}
+        self.columns = max(1, width // self.cell_width)
+        for name, anchor in ITEMS.items():
+            grid = displayio.TileGrid(self.sheet, pixel_shader=color.shader(self.palette),
+                                      width=self.columns, height=1,
+                                      tile_width=self.cell_width,
+                                      tile_height=self.cell_height, default_tile=0)
+            grid.y = (height - self.cell_height) * anchor[1]
+            grid.hidden = True
+            self.items[name] = grid
+            self.texts[name] = None
+            self.group.append(grid)
+        self.enabled = True
+        self.clock = False
+        self.next_tick = 0
+        self.redraws = 0
+        self.update_us = 0.0
+        self.refresh_ms = [0.0, 0.0]   # average refresh with overlay off, on
+
+    def enable(self, on):
+        self.enabled = bool(on)
+        self.group.hidden = not self.enabled
+
+    def slot(self, char):
+        """Sheet slot of a character, rendering it the first time"""
+        index = self.slots.get(char)
+        if index is not None:
+            return index
+        if len(self.slots) >= self.capacity - 1:
+            # Sheet full: start over with just what is on screen now
+            self.slots = {}
+            for name, text in self.texts.items():
+                if text:
+                    self._place(name, text)
+            if char in self.slots:
+                return self.slots[char]
+        index = len(self.slots) + 1
+        self.slots[char] = index
+        font, sheet = self.font, self.sheet
+        x0 = index * self.cell_width
+        width = min(font.glyph_width(char), self.cell_width)
+        for x in range(self.cell_width):
+            bits = font.column(char, x) if x < width else 0
+            for y in range(self.cell_height):
+                sheet[x0 + x, y] = INK if bits >> y & 1 else BACKGROUND
+        return index
+
+    def _place(self, name, text):
+        grid = self.items[name]
+        for i in range(self.columns):
+            grid[i] = self.slot(text[i]) if i < len(text) else 0
+        anchor = ITEMS[name][0]
+        grid.x = (self.width - len(text) * self.cell_width) * anchor
+
+    def set(self, name, text):
+        """Show text in an item (None hides it); no-op if unchanged"""
+        if name not in self.items:
+            raise ValueError("Unknown overlay item: %s" % name)
+        if text is not None:
+            text = str(text)[:self.columns]
+            if self.upper:
+                text = text.upper()
+        if text == self.texts[name]:
+            return
+        self.texts[name] = text
+        self.redraws += 1
+        grid = self.items[name]
+        if not text:
+            grid.hidden = True
+            return
+        self._place(name, text)
+        grid.hidden = False
+
+    def show_clock(self, on):
+        self.clock = bool(on)
+        self.next_tick = 0
+        if not on:
+            self.set("clock", None)
+
+    def update(self):
+        """Per-frame work: tick the clock once a second"""
+        start = time.monotonic_ns()
+        if self.clock and start >= self.next_tick and self.enabled:
+            now = time.localtime()
+            self.set("clock", "%02d:%02d" % (now.tm_hour, now.tm_min))
+            self.next_tick = start + 1000000000
+        spent = (time.monotonic_ns() - start) / 1000
+        self.update_us += (spent - self.update_us) / 32
+
+    def visible(self):
+        if not self.enabled:
+            return False
+        for text in self.texts.values():
+            if text:
+                return True
+        return False
+
+    def note_refresh(self, ms):
+        """Record a panel refresh time, as overlay on or off"""
+        i = 1 if self.visible() else 0
+        self.refresh_ms[i] += (ms - self.refresh_ms[i]) / 32
+
+    def status(self):
+        return {
+            "enabled": self.enabled,
+            "clock": self.clock,
+            "status": self.texts["status"],
+            "message": self.texts["message"],
+            "redraws": self.redraws,
+            "update_us": round(self.update_us, 1),
+            "refresh_ms_off": round(self.refresh_ms[0], 2),
+            "refresh_ms_on": round(self.refresh_ms[1], 2),
+        }
@@ -0,0 +1,276 @@
+"""
+panel.py - The one shared RGB matrix display
+
+Sequences used to build their own RGBMatrix at import time, which blanked
+the panel and made it impossible to import the next animation while the
+current one is still on screen. The matrix is now created once here; each
+sequence only builds its own bitmap/palette/group and code.py decides when
+that group goes on screen.
+
+The root group is a stage: slot 0 holds the group being shown and an
+optional overlay group (set_overlay) stays above it whatever is shown.
+
+The bit depth is fixed when the matrix is created, so set_bit_depth()
+releases the display and builds a new one around the same stage. More
+bits mean more bit planes for the matrix to scan out, which takes CPU
+away from the animations: the share it takes at each depth is measured
+the first time that depth is used (probe(), a busy count compared with
+the count while no matrix runs), and note_frame() keeps the animation
+frame rate and render headroom reached at each depth.
+
+The matrix scan (refresh) rate can't be read back from rgbmatrix, so
+scan_rate() derives it from the depth and geometry the way the
+Protomatter driver times its scan: each row pair shows bit plane b for
+2**b bit-zero periods, and the bit-zero period settles at the time it
+takes to clock one row of the whole chain out. One more bit nearly
+halves the rate.
+
+Geometry comes from settings.toml: the size of one panel and how many
+are chained across and tiled down (MATRIX_PANEL_WIDTH, MATRIX_PANEL_HEIGHT,
+MATRIX_CHAIN_ACROSS, MATRIX_CHAIN_DOWN, MATRIX_SERPENTINE), e.g. a 2x2
+wall of 64x32 panels is 128x64. Sequences size themselves from WIDTH and
+HEIGHT; SCALE (1 on the 64x32 design size, 2 at 128x64) and per_area()
+keep features and object counts in proportion on bigger walls.
+"""
+import os
+import time
+import displayio
+from engine import color
+
+# The size the animations were designed for; SCALE and per_area() are
+# relative to it
+DESIGN_WIDTH = 64
+DESIGN_HEIGHT = 32
+
+ADDR_PINS = ("MTX_ADDRA", "MTX_ADDRB", "MTX_ADDRC", "MTX_ADDRD", "MTX_ADDRE")
+
+# surface(TRUE_COLOR): an RGB565 bitmap (one 16-bit color per pixel)
+TRUE_COLOR = 65536
+
+BIT_DEPTH = 4
+BIT_DEPTHS = (1, 2, 3, 4, 5, 6)
+PROBE_MS = 50
+
+# scan_rate() model: time to clock out one pixel of a row, and the
+# shortest bit-zero period the driver uses (approximate, ESP32-S3)
+SHIFT_NS = 50
+MIN_PERIOD_NS = 2000
+
+matrix = None
+display = None
+bit_depth = BIT_DEPTH
+_blank = None
+_stage = None
+
+# Per bit depth: CPU share taken by the matrix, and the averages kept by
+# note_frame()
+_idle_rate = None   # probe() count with no matrix running
+scan_load = {}
+stats = {}
+_last_frame = None
+
+
+def _setting(name, default):
+    """Integer from settings.toml (os.getenv), or default"""
+    try:
+        value = os.getenv(name)
+    except AttributeError:
+        value = None
+    return default if value is None else int(value)
+
+
+def set_geometry(panel_width=64, panel_height=32, across=1, down=1, serpentine=True):
+    """Size of one panel and the chain; sets WIDTH, HEIGHT and SCALE.
+    Must happen before the display is created and before any sequence
+    is imported (they read WIDTH/HEIGHT at import)."""
+    global PANEL_WIDTH, PANEL_HEIGHT, CHAIN_ACROSS, CHAIN_DOWN, SERPENTINE
+    global WIDTH, HEIGHT, SCALE
+    if display is not None:
+        raise RuntimeError("Geometry can't change once the display is up")
+    rows = panel_height // 2
+    if panel_width < 1 or rows < 8 or rows & (rows - 1) or rows > 1 << len(ADDR_PINS):
+        raise ValueError("Unsupported panel size %dx%d" % (panel_width, panel_height))
+    if across < 1 or down < 1:
+        raise ValueError("Chain must be at least 1x1")
+    PANEL_WIDTH, PANEL_HEIGHT = panel_width, panel_height
+    CHAIN_ACROSS, CHAIN_DOWN, SERPENTINE = across, down, bool(serpentine)
+    WIDTH = panel_width * across
+    HEIGHT = panel_height * down
+    SCALE = max(1, min(WIDTH // DESIGN_WIDTH, HEIGHT // DESIGN_HEIGHT))
+
+
+def per_area(count):
+    """count, designed for DESIGN_WIDTH x DESIGN_HEIGHT, at this panel's area"""
+    return max(1, count * WIDTH * HEIGHT // (DESIGN_WIDTH * DESIGN_HEIGHT))
+
+
+set_geometry(_setting("MATRIX_PANEL_WIDTH", 64), _setting("MATRIX_PANEL_HEIGHT", 32),
+             _setting("MATRIX_CHAIN_ACROSS", 1), _setting("MATRIX_CHAIN_DOWN", 1),
+             _setting("MATRIX_SERPENTINE", 1))
+
+
+def probe(ms=PROBE_MS):
+    """Busy-count for ms milliseconds; returns counts per millisecond"""
+    end = time.monotonic_ns() + ms * 1000000
+    count = 0
+    while time.monotonic_ns() < end:
+        count += 1
+    return count / ms
+
+
+def _create():
+    """(Re)build the matrix + display at bit_depth around the stage"""
+    global matrix, display, _idle_rate
+    # Hardware modules only here: sequences (and tools/bench.py) can build
+    # surfaces without them
+    import board
+    import framebufferio
+    import rgbmatrix
+    displayio.release_displays()
+    matrix = None
+    display = None
+    if _idle_rate is None:
+        _idle_rate = probe()
+    # A panel scans two rows at a time: 16 row pairs need 4 address lines
+    addr_count = (PANEL_HEIGHT // 2).bit_length() - 1
+    matrix = rgbmatrix.RGBMatrix(
+        width=WIDTH, height=HEIGHT, bit_depth=bit_depth,
+        rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
+                  board.MTX_R2, board.MTX_G2, board.MTX_B2],
+        addr_pins=[getattr(board, name) for name in ADDR_PINS[:addr_count]],
+        clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE,
+        tile=CHAIN_DOWN, serpentine=SERPENTINE)
+    # code.py refreshes once per animation frame, so every frame (and every
+    # animation switch) lands on the panel whole
+    display = framebufferio.FramebufferDisplay(matrix, auto_refresh=False)
+    display.root_group = _stage
+    if bit_depth not in scan_load:
+        scan_load[bit_depth] = max(0.0, 1 - probe() / _idle_rate)
+
+
+def init():
+    """Create the matrix + display on first use"""
+    global _blank, _stage
+    if display is not None:
+        return display
+    _blank = displayio.Group()
+    _stage = displayio.Group()
+    _stage.append(_blank)
+    _create()
+    return display
+
+
+def set_bit_depth(depth):
+    """Rebuild the matrix at another bit depth; whatever is on the stage
+    stays there and is on the panel again after the next refresh.
+    Raises ValueError on a depth the matrix can't do. Returns True if
+    the depth changed."""
+    global bit_depth, _last_frame
+    depth = int(depth)
+    if depth not in BIT_DEPTHS:
+        raise ValueError("bit_depth must be %d..%d" % (BIT_DEPTHS[0], BIT_DEPTHS[-1]))
+    if depth == bit_depth:
+        return False
+    bit_depth = depth
+    _last_frame = None
+    if display is not None:
+        _create()
+    return True
+
+
+def note_frame(render_ms, refresh_ms, budget_ms):
+    """Record one animation frame at the current depth: time spent
+    drawing it, pushing it to the panel, and the frame time it had"""
+    global _last_frame
+    now = time.monotonic_ns()
+    entry = stats.get(bit_depth)
+    if entry is None:
+        entry = stats[bit_depth] = {"frames": 0, "fps": 0.0, "render_ms": 0.0,
+                                    "refresh_ms": 0.0, "headroom": 0.0}
+    entry["frames"] += 1
+    # Running averages over ~32 frames, plain means until there are 32
+    k = 1 / min(entry["frames"], 32)
+    entry["render_ms"] += (render_ms - entry["render_ms"]) * k
+    entry["refresh_ms"] += (refresh_ms - entry["refresh_ms"]) * k
+    spare = 1 - (render_ms + refresh_ms) / budget_ms if budget_ms else 0.0
+    entry["headroom"] += (spare - entry["headroom"]) * k
+    if _last_frame is not None:
+        interval = (now - _last_frame) / 1000000
+        # A gap over a second is a pause (loading, idle), not a frame rate
+        if 0 < interval < 1000:
+            fps = 1000 / interval
+            entry["fps"] += (fps - entry["fps"]) * (k if entry["fps"] else 1)
+    _last_frame = now
+
+
+def scan_rate(depth=None):
+    """Estimated full-panel scan rate in Hz at depth (default: current)"""
+    depth = bit_depth if depth is None else depth
+    row_ns = max(MIN_PERIOD_NS, PANEL_WIDTH * CHAIN_ACROSS * CHAIN_DOWN * SHIFT_NS)
+    return round(1000000000 / ((PANEL_HEIGHT // 2) * ((1 << depth) - 1) * row_ns))
+
+
+def status():
+    """Current bit depth, the estimated scan rate at every depth, and what
+    was measured at every depth used so far"""
+    depths = {}
+    for depth in BIT_DEPTHS:
+        if depth in scan_load or depth in stats:
+            entry = {"scan_load": round(scan_load.get(depth, 0.0), 3)}
+            for key, value in stats.get(depth, {}).items():
+                entry[key] = round(value, 2) if isinstance(value, float) else value
+            depths[str(depth)] = entry
+    return {"bit_depth": bit_depth, "default": BIT_DEPTH,
+            "scan_hz": {str(depth): scan_rate(depth) for depth in BIT_DEPTHS},
+            "depths": depths}
+
+
+def surface(value_count, scale=1):
+    """Full-panel bitmap + color.Palette + group for a sequence. Not shown yet.
+    With scale > 1 the bitmap is WIDTH/scale x HEIGHT/scale and the group
+    shows it scaled up (pixel art drawn at the design size).
+
+    surface(TRUE_COLOR) gives an RGB565 bitmap instead, shown through a
+    displayio.ColorConverter (returned in place of the palette): pixels
+    are colors, written with color.rgb565(rgb)."""
+    bitmap = displayio.Bitmap(WIDTH // scale, HEIGHT // scale, value_count)
+    if value_count == TRUE_COLOR:
+        palette = displayio.ColorConverter(input_colorspace=displayio.Colorspace.RGB565)
+    else:
+        palette = color.Palette(value_count)
+    group = displayio.Group(scale=scale)
+    group.append(displayio.TileGrid(bitmap, pixel_shader=color.shader(palette)))
+    return bitmap, palette, group
+
+
+def show(group):
+    """Put a sequence's group on the panel (takes effect at next refresh).
+    None takes the current group off the stage without refreshing."""
+    init()
+    group = _blank if group is None else group
+    if _stage[0] is not group:
+        _stage[0] = group
+
+
+def set_overlay(group):
+    """Keep group above everything shown from now on (None: no overlay)"""
+    init()
+    while len(_stage) > 1:
+        _stage.pop()
+    if group is not None:
+        _stage.append(group)
+
+
+def blank():
+    """Show nothing"""
+    show(None)
+    refresh()
+
+
+def refresh():
+    """Push the current frame to the panel"""
+    if display is not None:
+        try:
+            display.refresh()
+        except Exception as e:
+            print("Refresh error: %s" % str(e))
@@ -0,0 +1,92 @@
+"""
+particles.py - Fixed-capacity particle pool stored as columns
+
+Particles used to be lists of lists, removed with list.remove() while
+iterating over a copy: O(n^2) and new lists every frame. A Pool keeps one
+preallocated array per field instead (x, y, vx, vy, life as floats, color
+as a short, plus any extra float columns). Live particles are packed at
+indexes 0..count-1, so spawn appends at `count` and kill moves the last
+particle into the hole - both O(1), and nothing is allocated per frame:
+
+    pool = particles.Pool(512)
+    pool.spawn(x, y, vx, vy, life=6)
+    pool.step(gravity=0.1, decay=0.15, width=WIDTH, height=HEIGHT)
+    pool.plot(bitmap, source="life", brightest=True)
+
+Custom per-particle logic loops over range(pool.count) and reads the
+columns directly; loop backwards when it may kill particles.
+"""
+import array
+
+
+class Pool:
+    """Columns x, y, vx, vy, life (+ extra floats) and color"""
+
+    def __init__(self, capacity, extra=()):
+        self.capacity = capacity
+        self.count = 0
+        self.x = array.array("f", bytes(4 * capacity))
+        self.y = array.array("f", bytes(4 * capacity))
+        self.vx = array.array("f", bytes(4 * capacity))
+        self.vy = array.array("f", bytes(4 * capacity))
+        self.life = array.array("f", bytes(4 * capacity))
+        self.color = array.array("h", bytes(2 * capacity))
+        self.columns = [self.x, self.y, self.vx, self.vy, self.life, self.color]
+        for name in extra:
+            column = array.array("f", bytes(4 * capacity))
+            setattr(self, name, column)
+            self.columns.append(column)
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, life=1.0, color=1):
+        """Add a particle; returns its index, or -1 if the pool is full"""
+        i = self.count
+        if i >= self.capacity:
+            return -1
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.life[i] = life
+        self.color[i] = color
+        self.count = i + 1
+        return i
+
+    def kill(self, i):
+        """Remove particle i (the last particle takes its index)"""
+        last = self.count - 1
+        if i != last:
+            for column in self.columns:
+                column[i] = column[last]
+        self.count = last
+
+    def clear(self):
+        self.count = 0
+
+    def step(self, gravity=0.0, decay=0.0, width=None, height=None):
+        """Integrate every particle one frame; kill the ones whose life ran
+        out or (if width/height are given) that left the panel"""
+        xs, ys, vxs, vys, lifes = self.x, self.y, self.vx, self.vy, self.life
+        bounded = width is not None and height is not None
+        for i in range(self.count - 1, -1, -1):
+            vy = vys[i] + gravity
+            x = xs[i] + vxs[i]
+            y = ys[i] + vy
+            life = lifes[i] - decay
+            if life <= 0 or (bounded and not (0 <= x < width and 0 <= y < height)):
+                self.kill(i)
+                continue
+            xs[i], ys[i], vys[i], lifes[i] = x, y, vy, life
+
+    def plot(self, bitmap, source="color", brightest=False, value=None):
+        """Draw each particle as one pixel with its color (or int(life));
+        brightest keeps the higher of the new and existing value. With
+        value, every particle is drawn with that one value instead."""
+        values = self.life if source == "life" else self.color
+        xs, ys = self.x, self.y
+        w, h = bitmap.width, bitmap.height
+        for i in range(self.count):
+            ix, iy = int(xs[i]), int(ys[i])
+            if 0 <= ix < w and 0 <= iy < h:
+                v = int(values[i]) if value is None else value
+                if not brightest or v > bitmap[ix, iy]:
+                    bitmap[ix, iy] = v
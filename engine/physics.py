@@ -0,0 +1,180 @@
+"""
+physics.py - Balls with gravity, wall bounces and ball-to-ball collisions
+
+Ball state is an engine.particles Pool with an extra `radius` column.
+Collisions go through a uniform spatial hash: the panel is cut into cells
+at least one ball diameter wide and every ball is linked into its cell's
+list (`head` per cell, `next` per ball, both preallocated arrays), so a
+ball is only tested against balls in its own and the neighbouring cells -
+each pair once - and a frame costs O(balls), not O(balls**2).
+
+Each frame is split into substeps (move, bounce off walls, rebuild the
+grid, resolve overlaps) so fast balls don't tunnel through each other:
+
+    world = physics.World(200, WIDTH, HEIGHT, max_radius=1.5)
+    world.add(x, y, vx, vy, radius=1.0, color=3)
+    world.step(gravity=0.3, bounce=0.85, substeps=2)    # every frame
+    world.draw(bitmap)
+
+Velocities are in pixels per frame. Heavier (bigger) balls push smaller
+ones around: mass is radius squared.
+"""
+import array
+import math
+from engine import particles
+
+_discs = {}
+
+
+def disc(radius):
+    """Pixel offsets covered by a ball of this radius centred on a pixel"""
+    key = int(radius * 2 + 0.5)
+    if key not in _discs:
+        r = key / 2
+        reach = int(r)
+        offsets = []
+        for dy in range(-reach, reach + 1):
+            for dx in range(-reach, reach + 1):
+                if dx * dx + dy * dy <= r * r:
+                    offsets.append((dx, dy))
+        _discs[key] = offsets or [(0, 0)]
+    return _discs[key]
+
+
+class World:
+    """Preallocated balls in a width x height box with a spatial hash"""
+
+    def __init__(self, capacity, width, height, max_radius=1.0):
+        self.balls = particles.Pool(capacity, extra=("radius",))
+        self.width = width
+        self.height = height
+        self.cell = max(1, int(math.ceil(2 * max_radius)))
+        self.grid_width = width // self.cell + 1
+        self.grid_height = height // self.cell + 1
+        self.head = array.array("h", [-1] * (self.grid_width * self.grid_height))
+        self.next = array.array("h", [-1] * capacity)
+        self.home = array.array("h", [0] * capacity)
+        self.checks = 0   # pair tests in the last step (for benchmarks)
+
+    def add(self, x, y, vx=0.0, vy=0.0, radius=0.5, color=1):
+        """Add a ball; returns its index, or -1 if the world is full"""
+        i = self.balls.spawn(x, y, vx, vy, color=color)
+        if i >= 0:
+            self.balls.radius[i] = radius
+        return i
+
+    def clear(self):
+        self.balls.clear()
+
+    def step(self, gravity=0.3, bounce=0.85, substeps=2):
+        """Advance one frame in substeps"""
+        self.checks = 0
+        dt = 1.0 / substeps
+        for _ in range(substeps):
+            self.move(gravity * dt, dt, bounce)
+            self.build_grid()
+            self.collide(bounce)
+
+    def move(self, dv, dt, bounce):
+        b = self.balls
+        xs, ys, vxs, vys, rs = b.x, b.y, b.vx, b.vy, b.radius
+        w, h = self.width, self.height
+        for i in range(b.count):
+            r = rs[i]
+            vx = vxs[i]
+            vy = vys[i] + dv
+            x = xs[i] + vx * dt
+            y = ys[i] + vy * dt
+            # Walls: the ball's edge, not its centre, touches them
+            if y > h - 0.5 - r:
+                y = h - 0.5 - r
+                vy = -vy * bounce
+            elif y < r - 0.5:
+                y = r - 0.5
+                vy = -vy * bounce
+            if x > w - 0.5 - r:
+                x = w - 0.5 - r
+                vx = -vx * bounce
+            elif x < r - 0.5:
+                x = r - 0.5
+                vx = -vx * bounce
+            xs[i], ys[i], vxs[i], vys[i] = x, y, vx, vy
+
+    def build_grid(self):
+        """Link every ball into the list of the cell its centre is in"""
+        head, nxt, home = self.head, self.next, self.home
+        for c in range(len(head)):
+            head[c] = -1
+        cell, gw = self.cell, self.grid_width
+        xs, ys = self.balls.x, self.balls.y
+        for i in range(self.balls.count):
+            c = int(ys[i] + 0.5) // cell * gw + int(xs[i] + 0.5) // cell
+            home[i] = c
+            nxt[i] = head[c]
+            head[c] = i
+
+    def collide(self, bounce):
+        head, nxt, home = self.head, self.next, self.home
+        gw, gh = self.grid_width, self.grid_height
+        for i in range(self.balls.count):
+            c = home[i]
+            # Later balls in the same cell, then all balls in the four
+            # "forward" neighbours: every nearby pair exactly once
+            j = nxt[i]
+            while j >= 0:
+                self.resolve(i, j, bounce)
+                j = nxt[j]
+            cx, cy = c % gw, c // gw
+            for ox, oy in ((1, 0), (-1, 1), (0, 1), (1, 1)):
+                nx, ny = cx + ox, cy + oy
+                if 0 <= nx < gw and ny < gh:
+                    j = head[ny * gw + nx]
+                    while j >= 0:
+                        self.resolve(i, j, bounce)
+                        j = nxt[j]
+
+    def resolve(self, i, j, bounce):
+        """Separate two overlapping balls and exchange momentum"""
+        self.checks += 1
+        b = self.balls
+        xs, ys = b.x, b.y
+        dx = xs[j] - xs[i]
+        dy = ys[j] - ys[i]
+        ri, rj = b.radius[i], b.radius[j]
+        reach = ri + rj
+        d2 = dx * dx + dy * dy
+        if d2 >= reach * reach:
+            return
+        if d2 < 1e-6:
+            dx, dy, d2 = 0.01, 0.0, 0.0001
+        d = math.sqrt(d2)
+        nx, ny = dx / d, dy / d
+        mi, mj = ri * ri, rj * rj
+        total = mi + mj
+        # Push apart in proportion to the other ball's mass
+        push = reach - d
+        xs[i] -= nx * push * mj / total
+        ys[i] -= ny * push * mj / total
+        xs[j] += nx * push * mi / total
+        ys[j] += ny * push * mi / total
+        vxs, vys = b.vx, b.vy
+        closing = (vxs[j] - vxs[i]) * nx + (vys[j] - vys[i]) * ny
+        if closing < 0:
+            impulse = -(1 + bounce) * closing / total
+            vxs[i] -= impulse * mj * nx
+            vys[i] -= impulse * mj * ny
+            vxs[j] += impulse * mi * nx
+            vys[j] += impulse * mi * ny
+
+    def draw(self, bitmap):
+        """Clear bitmap and draw every ball as a disc of its radius"""
+        bitmap.fill(0)
+        b = self.balls
+        xs, ys, rs, cols = b.x, b.y, b.radius, b.color
+        w, h = bitmap.width, bitmap.height
+        for i in range(b.count):
+            px, py, color = int(xs[i] + 0.5), int(ys[i] + 0.5), cols[i]
+            for dx, dy in disc(rs[i]):
+                x, y = px + dx, py + dy
+                if 0 <= x < w and 0 <= y < h:
+                    bitmap[x, y] = color
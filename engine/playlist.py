@@ -0,0 +1,125 @@
+"""
+playlist.py - Playlists of animations with durations and a loop policy
+
+A playlist is a plain dict; the same shape is stored in NVM and accepted
+by the web API:
+
+    {"name": "evening", "shuffle": False, "loop": "repeat",
+     "entries": [{"animation": "plasma", "duration": 60}, ...]}
+
+loop policy:
+    "repeat" - start over after the last entry (reshuffled if shuffle)
+    "once"   - stop after the last entry
+    "hold"   - keep the last entry running
+
+Saved playlists are kept in microcontroller.nvm (flash backed, survives
+power loss) as length-prefixed JSON, after the bytes boot.py/code.py use.
+"""
+import json
+import random
+
+LOOP_POLICIES = ("repeat", "once", "hold")
+DEFAULT_DURATION = 60  # seconds
+MIN_DURATION = 2
+
+NVM_OFFSET = 16        # NVM[0..1] are the animation index + boot mode
+NVM_MAGIC = b"PL"      # followed by a 2-byte big-endian length
+
+
+def validate(data, known):
+    """Clean up a playlist dict from the API. Raises ValueError."""
+    name = str(data.get("name", "")).strip()
+    if not name:
+        raise ValueError("Playlist needs a name")
+    loop = data.get("loop", "repeat")
+    if loop not in LOOP_POLICIES:
+        raise ValueError("loop must be one of %s" % ", ".join(LOOP_POLICIES))
+
+    entries = []
+    for item in data.get("entries", []):
+        anim = item.get("animation", "")
+        if anim not in known:
+            raise ValueError("Unknown animation: %s" % anim)
+        duration = int(item.get("duration", DEFAULT_DURATION))
+        entries.append({"animation": anim, "duration": max(MIN_DURATION, duration)})
+    if not entries:
+        raise ValueError("Playlist has no entries")
+
+    return {"name": name, "shuffle": bool(data.get("shuffle", False)),
+            "loop": loop, "entries": entries}
+
+
+def load(nvm):
+    """Saved playlists: {"active": name_or_None, "playlists": {name: playlist}}"""
+    empty = {"active": None, "playlists": {}}
+    try:
+        if bytes(nvm[NVM_OFFSET:NVM_OFFSET + 2]) != NVM_MAGIC:
+            return empty
+        size = (nvm[NVM_OFFSET + 2] << 8) | nvm[NVM_OFFSET + 3]
+        start = NVM_OFFSET + 4
+        store = json.loads(bytes(nvm[start:start + size]).decode("utf-8"))
+        if "playlists" not in store:
+            return empty
+        return store
+    except Exception as e:
+        print("Playlist load error: %s" % str(e))
+        return empty
+
+
+def save(nvm, store):
+    """Write saved playlists back to NVM. Raises ValueError if they don't fit."""
+    blob = json.dumps(store).encode("utf-8")
+    start = NVM_OFFSET + 4
+    if start + len(blob) > len(nvm) or len(blob) > 0xFFFF:
+        raise ValueError("Playlists too large for NVM (%d bytes)" % len(blob))
+    nvm[start:start + len(blob)] = blob
+    nvm[NVM_OFFSET + 2] = len(blob) >> 8
+    nvm[NVM_OFFSET + 3] = len(blob) & 0xFF
+    nvm[NVM_OFFSET:NVM_OFFSET + 2] = NVM_MAGIC
+
+
+class Player:
+    """Walks a playlist: which entry is on now, which one comes next"""
+
+    def __init__(self, playlist):
+        self.playlist = playlist
+        self.order = self._new_pass(None)
+        self.next_order = None
+        self.pos = 0
+
+    def _new_pass(self, last):
+        """Entry order for one pass; shuffled passes don't repeat `last` first"""
+        count = len(self.playlist["entries"])
+        order = list(range(count))
+        if self.playlist["shuffle"] and count > 1:
+            # Fisher-Yates (CircuitPython's random has no shuffle)
+            for i in range(count - 1, 0, -1):
+                j = random.randint(0, i)
+                order[i], order[j] = order[j], order[i]
+            if order[0] == last:
+                order[0], order[-1] = order[-1], order[0]
+        return order
+
+    def current(self):
+        return self.playlist["entries"][self.order[self.pos]]
+
+    def upcoming(self):
+        """Entry that follows the current one, or None if the playlist ends"""
+        if self.pos + 1 < len(self.order):
+            return self.playlist["entries"][self.order[self.pos + 1]]
+        if self.playlist["loop"] != "repeat":
+            return None
+        if self.next_order is None:
+            self.next_order = self._new_pass(self.order[-1])
+        return self.playlist["entries"][self.next_order[0]]
+
+    def advance(self):
+        """Move to the upcoming entry; returns it, or None at the end"""
+        entry = self.upcoming()
+        if entry is None:
+            return None
+        if self.pos + 1 < len(self.order):
+            self.pos += 1
+        else:
+            self.order, self.next_order, self.pos = self.next_order, None, 0
+        return entry
@@ -0,0 +1,100 @@
+"""
+prng.py - Fast seeded xorshift32 random numbers, integers only
+
+random.randint()/uniform() are slow, go through floats and make every run
+different. This is Marsaglia's xorshift32 (13, 17, 5) kept as two 16-bit
+halves, so every intermediate stays a small int on CircuitPython (no long
+int allocation) and the period is still 2**32 - 1.
+
+Use the shared generator like the random module:
+
+    from engine import prng
+    prng.seed(1234)                 # host benchmarks / golden frames
+    x = prng.randint(0, WIDTH - 1)
+    prng.fill(values, 100, 255)     # batch into a preallocated array
+
+or make a private one with prng.Xorshift32(seed).
+"""
+import time
+
+DEFAULT_SEED = 0x2545F491
+
+
+class Xorshift32:
+    """xorshift32 over (hi, lo) 16-bit halves"""
+
+    def __init__(self, seed=None):
+        self.hi = 0
+        self.lo = 0
+        self.seed(seed)
+
+    def seed(self, value=None):
+        """Restart the sequence; None seeds from the clock"""
+        if value is None:
+            value = time.monotonic_ns()
+        self.hi = (value >> 16) & 0xFFFF
+        self.lo = value & 0xFFFF
+        if not (self.hi or self.lo):
+            self.hi = DEFAULT_SEED >> 16
+            self.lo = DEFAULT_SEED & 0xFFFF
+
+    def next16(self):
+        """Next 16 random bits"""
+        hi, lo = self.hi, self.lo
+        # x ^= x << 13
+        hi ^= ((hi << 13) | (lo >> 3)) & 0xFFFF
+        lo ^= (lo << 13) & 0xFFFF
+        # x ^= x >> 17
+        lo ^= hi >> 1
+        # x ^= x << 5
+        hi ^= ((hi << 5) | (lo >> 11)) & 0xFFFF
+        lo ^= (lo << 5) & 0xFFFF
+        self.hi, self.lo = hi, lo
+        return hi
+
+    def below(self, n):
+        """Integer in 0 .. n-1 (n up to 2**30)"""
+        if n <= 0x4000:
+            return (self.next16() * n) >> 16
+        self.next16()
+        return ((self.hi << 14) | (self.lo >> 2)) % n
+
+    def randint(self, a, b):
+        """Integer in a .. b inclusive, like random.randint"""
+        return a + self.below(b - a + 1)
+
+    def chance(self, numerator, denominator=256):
+        """True with probability numerator/denominator"""
+        return self.below(denominator) < numerator
+
+    def choice(self, seq):
+        return seq[self.below(len(seq))]
+
+    def fill(self, out, a, b, count=None):
+        """out[i] = randint(a, b) for the first count (default all) items"""
+        n = b - a + 1
+        if count is None:
+            count = len(out)
+        if n > 0x4000:
+            for i in range(count):
+                out[i] = a + self.below(n)
+            return
+        hi, lo = self.hi, self.lo
+        for i in range(count):
+            hi ^= ((hi << 13) | (lo >> 3)) & 0xFFFF
+            lo ^= (lo << 13) & 0xFFFF
+            lo ^= hi >> 1
+            hi ^= ((hi << 5) | (lo >> 11)) & 0xFFFF
+            lo ^= (lo << 5) & 0xFFFF
+            out[i] = a + ((hi * n) >> 16)
+        self.hi, self.lo = hi, lo
+
+
+_shared = Xorshift32()
+seed = _shared.seed
+next16 = _shared.next16
+below = _shared.below
+randint = _shared.randint
+chance = _shared.chance
+choice = _shared.choice
+fill = _shared.fill
@@ -0,0 +1,94 @@
+"""
+rotozoom.py - Zoom/rotate a pre-rendered master bitmap onto the panel
+
+Effects whose only per-frame change is a zoom (plus palette animation)
+don't need to rebuild the image: render it once at a higher resolution
+into a Master, then each frame is one native bitmaptools.rotozoom pass.
+Coordinates are "world" units = panel pixels at zoom 1:
+
+    master = rotozoom.master("helmet", 64, 36, 8, shade, origin=(0, -4))
+    master.draw(bitmap, 32, 13, zoom=1.1)                  # every frame
+
+Rendering a master is slow (one shade() call per master pixel), so masters
+are cached by name and survive the sequence being re-imported.
+
+On the host (no bitmaptools) a slow software version is used instead.
+"""
+import math
+import displayio
+
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+_masters = {}
+
+
+def rotozoom(dest, source, ox, oy, px, py, angle=0.0, scale=1.0, skip_index=None):
+    """Draw source point (px, py) at dest (ox, oy), rotated and scaled"""
+    if bitmaptools is not None and hasattr(bitmaptools, "rotozoom"):
+        bitmaptools.rotozoom(dest, source, ox=ox, oy=oy, px=px, py=py,
+                             angle=angle, scale=scale, skip_index=skip_index)
+        return
+    cos_a = math.cos(angle) / scale
+    sin_a = math.sin(angle) / scale
+    w, h = source.width, source.height
+    for y in range(dest.height):
+        dy = y - oy
+        for x in range(dest.width):
+            dx = x - ox
+            sx = px + dx * cos_a + dy * sin_a
+            sy = py - dx * sin_a + dy * cos_a
+            if 0 <= sx < w and 0 <= sy < h:
+                value = source[int(sx), int(sy)]
+                if value != skip_index:
+                    dest[x, y] = value
+
+
+class Master:
+    """A world rectangle pre-rendered at `resolution` pixels per world unit"""
+
+    def __init__(self, width, height, value_count, resolution=2, origin=(0, 0), centred=False):
+        self.resolution = resolution
+        self.origin = origin
+        self.centred = centred
+        self.bitmap = displayio.Bitmap(width * resolution, height * resolution, value_count)
+
+    def render(self, shade):
+        """Fill the master from shade(world_x, world_y) -> palette index"""
+        s = self.resolution
+        x0, y0 = self.origin
+        # Master pixel (mx, my) samples world (x0 + mx/s, y0 + my/s), so at
+        # zoom 1 panel pixels sample exactly the same points as a direct
+        # render. centred masters sample the middle of each master pixel
+        # instead: half the error when the zoom is rarely 1.
+        if self.centred:
+            x0 += 0.5 / s
+            y0 += 0.5 / s
+        for my in range(self.bitmap.height):
+            wy = y0 + my / s
+            for mx in range(self.bitmap.width):
+                self.bitmap[mx, my] = shade(x0 + mx / s, wy)
+
+    def draw(self, dest, x, y, zoom=1.0, angle=0.0, background=0, centre=None):
+        """Show the master magnified by zoom about panel pixel (x, y), where
+        world point `centre` (default: (x, y) itself) is drawn. Pixels
+        outside the master get `background`."""
+        dest.fill(background)
+        s = self.resolution
+        cx, cy = centre if centre is not None else (x, y)
+        rotozoom(dest, self.bitmap, x, y,
+                 int((cx - self.origin[0]) * s), int((cy - self.origin[1]) * s),
+                 angle, zoom / s)
+
+
+def master(name, width, height, value_count, shade, resolution=2, origin=(0, 0),
+           centred=False):
+    """Cached Master covering the world rect origin + (width, height),
+    rendered from shade(world_x, world_y) the first time it is asked for"""
+    if name not in _masters:
+        m = Master(width, height, value_count, resolution, origin, centred)
+        m.render(shade)
+        _masters[name] = m
+    return _masters[name]
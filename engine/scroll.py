@@ -0,0 +1,100 @@
+"""
+scroll.py - Ring-buffer scrolling: move the picture, draw only what's new
+
+A Ring is a full-panel bitmap shown through a TileGrid two tiles long, both
+tiles being the same bitmap. Scrolling is just moving the TileGrid by the
+ring origin (one native operation), so a sequence that travels sideways
+only renders the column (or row) that just came into view instead of the
+whole panel:
+
+    ring = scroll.Ring(palette, WIDTH, HEIGHT, 8)
+    for w in ring.advance(1):         # world columns that came into view
+        ring.clear_line(w)
+        ...draw world column w at x = ring.slot(w)...
+
+World column w lives in bitmap column w % WIDTH. Sequences using a Ring
+expose it as the module attribute `scroll_ring` so transitions can unroll
+it into screen order.
+"""
+import displayio
+from engine import color
+
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+
+class Ring:
+    """Full-panel ring buffer scrolled horizontally (or vertically)"""
+
+    def __init__(self, palette, width, height, value_count, vertical=False):
+        self.width = width
+        self.height = height
+        self.vertical = vertical
+        self.size = height if vertical else width
+        self.bitmap = displayio.Bitmap(width, height, value_count)
+        self.grid = displayio.TileGrid(
+            self.bitmap, pixel_shader=color.shader(palette),
+            width=1 if vertical else 2, height=2 if vertical else 1,
+            tile_width=width, tile_height=height)
+        self.group = displayio.Group()
+        self.group.append(self.grid)
+        self.origin = 0
+
+    def slot(self, line):
+        """Bitmap column (row if vertical) that holds world line `line`"""
+        return line % self.size
+
+    def move_to(self, origin):
+        """Show world lines origin .. origin+size-1 (nothing is redrawn)"""
+        self.origin = origin
+        if self.vertical:
+            self.grid.y = -(origin % self.size)
+        else:
+            self.grid.x = -(origin % self.size)
+
+    def advance(self, step=1):
+        """Scroll by step lines; returns the world lines that came into view"""
+        self.move_to(self.origin + step)
+        if step >= 0:
+            return range(self.origin + self.size - min(step, self.size),
+                         self.origin + self.size)
+        return range(self.origin, self.origin + min(-step, self.size))
+
+    def clear_line(self, line, value=0):
+        """Fill one world line with value"""
+        i = self.slot(line)
+        if self.vertical:
+            self._fill(0, i, self.width, i + 1, value)
+        else:
+            self._fill(i, 0, i + 1, self.height, value)
+
+    def clear(self, value=0):
+        self._fill(0, 0, self.width, self.height, value)
+
+    def _fill(self, x1, y1, x2, y2, value):
+        if bitmaptools is not None:
+            bitmaptools.fill_region(self.bitmap, x1, y1, x2, y2, value)
+            return
+        for y in range(y1, y2):
+            for x in range(x1, x2):
+                self.bitmap[x, y] = value
+
+    def unroll(self, dest):
+        """Copy the visible picture into dest in screen order"""
+        split = self.size - self.origin % self.size
+        if self.vertical:
+            self._blit(dest, 0, 0, 0, self.size - split, self.width, self.size)
+            self._blit(dest, 0, split, 0, 0, self.width, self.size - split)
+        else:
+            self._blit(dest, 0, 0, self.size - split, 0, self.size, self.height)
+            self._blit(dest, split, 0, 0, 0, self.size - split, self.height)
+
+    def _blit(self, dest, x, y, x1, y1, x2, y2):
+        if x2 <= x1 or y2 <= y1:
+            return
+        if bitmaptools is not None and hasattr(bitmaptools, "blit"):
+            bitmaptools.blit(dest, self.bitmap, x, y, x1=x1, y1=y1, x2=x2, y2=y2)
+        else:
+            dest.blit(x, y, self.bitmap, x1=x1, y1=y1, x2=x2, y2=y2)
@@ -0,0 +1,101 @@
+"""
+sprites.py - Sprite layer: moving objects as TileGrids instead of pixels
+
+Each object is a small TileGrid pointing at a shared sprite sheet, kept in
+a displayio.Group above the sequence's background bitmap. Moving an object
+is just `sprite.x = ...; sprite.y = ...` - displayio redraws the dirty
+area natively, so Python work per object is O(1) instead of clearing and
+redrawing its pixels every frame.
+
+Sprite sheets are cached here by name, so they survive the sequence being
+re-imported (playlists, preloading) and are shared by every sprite using
+them. Sprite palettes are copies of the sequence palette with one index
+made transparent, so sprite pixels use the same color indexes as the
+background (transitions rely on this when they snapshot a frame).
+"""
+import displayio
+from engine import color
+
+_sheets = {}
+shaders = []    # sprite palettes, for color.refresh(sprites)
+
+
+def sheet(name, build):
+    """Cached sprite sheet: build() runs only the first time name is asked for"""
+    if name not in _sheets:
+        _sheets[name] = build()
+    return _sheets[name]
+
+
+def forget(name):
+    """Drop a cached sheet (it is rebuilt on next use)"""
+    _sheets.pop(name, None)
+
+
+def shader(palette, transparent=0):
+    """Copy of palette with `transparent` see-through, for sprites"""
+    copy = color.Palette(len(palette))
+    for i in range(len(palette)):
+        copy[i] = palette[i]
+    copy.make_transparent(transparent)
+    shaders.append(copy)
+    return copy
+
+
+class SpriteLayer:
+    """A Group of sprites kept in z order (higher z is drawn on top)"""
+
+    def __init__(self):
+        self.group = displayio.Group()
+        self._z = []
+        self._transparent = {}
+
+    def add(self, bitmap, palette, x=0, y=0, z=0, tile=0,
+            tile_width=None, tile_height=None, transparent=0):
+        """Create a sprite from a sheet; returns its TileGrid"""
+        sprite = displayio.TileGrid(
+            bitmap, pixel_shader=color.shader(palette),
+            tile_width=tile_width or bitmap.width,
+            tile_height=tile_height or bitmap.height,
+            default_tile=tile, x=x, y=y)
+        index = len(self._z)
+        while index > 0 and self._z[index - 1] > z:
+            index -= 1
+        self._z.insert(index, z)
+        self.group.insert(index, sprite)
+        self._transparent[id(sprite)] = transparent
+        return sprite
+
+    def remove(self, sprite):
+        index = self.group.index(sprite)
+        self.group.pop(index)
+        self._z.pop(index)
+        self._transparent.pop(id(sprite), None)
+
+    def clear(self):
+        while len(self.group):
+            self.group.pop()
+        self._z = []
+        self._transparent = {}
+
+    def stamp(self, dest):
+        """Draw the visible sprites into dest (used to snapshot a frame)"""
+        for sprite in self.group:
+            if sprite.hidden:
+                continue
+            tw, th = sprite.tile_width, sprite.tile_height
+            sheet_bitmap = sprite.bitmap
+            tiles_across = sheet_bitmap.width // tw
+            tile = sprite[0]
+            sx, sy = (tile % tiles_across) * tw, (tile // tiles_across) * th
+            skip = self._transparent.get(id(sprite), 0)
+            for yy in range(th):
+                py = sprite.y + yy
+                if not 0 <= py < dest.height:
+                    continue
+                for xx in range(tw):
+                    px = sprite.x + xx
+                    if 0 <= px < dest.width:
+                        value = sheet_bitmap[sx + xx, sy + yy]
+                        if value != skip:
+                            dest[px, py] = value
@@ -0,0 +1,124 @@
+"""
+starfield.py - Fixed-point 3D starfield with table projection
+
+Every star is three small ints: x, y on the camera plane scaled by ONE
+(-ONE..ONE = -1.0..1.0) and depth z in 1/DEPTH_ONE units. Projection is a
+multiply and a shift through a reciprocal table built once
+(recip[z] = focal * 65536 / z), so a frame does no float division and no
+round(); streaks are integer Bresenham lines drawn from the head back
+toward where the star was a moment ago.
+
+    field = starfield.Starfield(140, WIDTH, HEIGHT, focal=24.0)
+    field.spawn_all(z_range=(0.2, 1.4), colors=(1, 2))
+    field.step(speed, z_range=(0.8, 1.6), colors=(1, 2))    # every frame
+    field.draw(bitmap, trail=speed * 0.9, head=5, max_streak=8)
+
+Speeds and depths are given in float world units for readability; they
+are converted to fixed point once per call, not per star.
+"""
+import array
+from engine import prng
+
+ONE = 256          # camera plane: 1.0
+DEPTH_ONE = 256    # depth: 1.0
+DEPTH_LIMIT = 2.0  # deepest z (incl. trail) the table covers
+
+
+class Starfield:
+    """Preallocated stars: arrays x, y, z (fixed point) and color"""
+
+    def __init__(self, capacity, width, height, focal=24.0, near=0.02,
+                 spread_x=1.0, spread_y=0.6):
+        self.capacity = capacity
+        self.count = 0
+        self.width = width
+        self.height = height
+        self.near = int(near * DEPTH_ONE)
+        self.spread_x = int(spread_x * ONE)
+        self.spread_y = int(spread_y * ONE)
+        self.x = array.array("h", bytes(2 * capacity))
+        self.y = array.array("h", bytes(2 * capacity))
+        self.z = array.array("h", bytes(2 * capacity))
+        self.color = array.array("B", bytes(capacity))
+        size = int(DEPTH_LIMIT * DEPTH_ONE) + 1
+        self.recip = array.array("i", bytes(4 * size))
+        for z in range(1, size):
+            self.recip[z] = int(focal * 65536 / z + 0.5)
+        self.recip[0] = self.recip[1]
+
+    def respawn(self, i, z_range, colors):
+        """Put star i somewhere random at depth z_range[0]..z_range[1]"""
+        self.x[i] = prng.randint(-self.spread_x, self.spread_x)
+        self.y[i] = prng.randint(-self.spread_y, self.spread_y)
+        self.z[i] = prng.randint(int(z_range[0] * DEPTH_ONE), int(z_range[1] * DEPTH_ONE))
+        self.color[i] = prng.choice(colors)
+
+    def spawn_all(self, z_range=(0.2, 1.4), colors=(1,), count=None):
+        self.count = self.capacity if count is None else count
+        for i in range(self.count):
+            self.respawn(i, z_range, colors)
+
+    def step(self, speed, z_range=(0.8, 1.6), colors=(1,)):
+        """Move every star speed closer; stars that pass the near plane
+        respawn far away with one of colors"""
+        dz = int(speed * DEPTH_ONE + 0.5)
+        near = self.near
+        zs = self.z
+        for i in range(self.count):
+            z = zs[i] - dz
+            if z <= near:
+                self.respawn(i, z_range, colors)
+            else:
+                zs[i] = z
+
+    def draw(self, bitmap, trail=0.0, head=None, max_streak=8):
+        """Streak from depth z + trail to z for every star, at most
+        max_streak pixels (shorter for far stars); head colors the star"""
+        w, h = self.width, self.height
+        cx, cy = w // 2, h // 2
+        xs, ys, zs, cols, recip = self.x, self.y, self.z, self.color, self.recip
+        dt = int(trail * DEPTH_ONE + 0.5)
+        last = len(recip) - 1
+        # streak cap = max_streak * (1.5 - z), clamped to 2..max_streak
+        far = 3 * DEPTH_ONE // 2
+        for i in range(self.count):
+            x, y, z = xs[i], ys[i], zs[i]
+            r = recip[z]
+            px = ((x * r + 32768) >> 16) + cx
+            py = ((y * r + 32768) >> 16) + cy
+            cap = (max_streak * (far - z)) // DEPTH_ONE
+            if cap > max_streak:
+                cap = max_streak
+            elif cap < 2:
+                cap = 2
+            if not (-cap <= px < w + cap and -cap <= py < h + cap):
+                continue
+            z0 = z + dt
+            r = recip[z0 if z0 < last else last]
+            line(bitmap, px, py, ((x * r + 32768) >> 16) + cx,
+                 ((y * r + 32768) >> 16) + cy, cols[i], cap)
+            if head is not None and 0 <= px < w and 0 <= py < h:
+                bitmap[px, py] = head
+
+
+def line(bitmap, x0, y0, x1, y1, value, limit):
+    """Bresenham from (x0, y0) toward (x1, y1), at most limit + 1 pixels,
+    clipped to the bitmap"""
+    w, h = bitmap.width, bitmap.height
+    dx = x1 - x0 if x1 >= x0 else x0 - x1
+    dy = y0 - y1 if y1 >= y0 else y1 - y0
+    sx = 1 if x1 >= x0 else -1
+    sy = 1 if y1 >= y0 else -1
+    err = dx + dy
+    for _ in range(limit + 1):
+        if 0 <= x0 < w and 0 <= y0 < h:
+            bitmap[x0, y0] = value
+        if x0 == x1 and y0 == y1:
+            return
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
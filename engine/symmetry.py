@@ -0,0 +1,102 @@
+"""
+symmetry.py - Compute the fundamental region of a symmetric effect once
+
+Mirror: for effects symmetric about the panel centre (x <-> width - x
+and/or y <-> height - y, even panel sizes). The sequence draws only the
+region x <= width/2, y <= height/2 into mirror.bitmap; the other quadrants
+are the same bitmap shown through flipped TileGrids, so displayio does the
+mirroring natively and the sequence does ~1/4 of the per-pixel math:
+
+    mirror = symmetry.Mirror(palette, WIDTH, HEIGHT, 8)
+    for y in range(mirror.region_height):
+        for x in range(mirror.region_width):
+            mirror.bitmap[x, y] = ...
+
+IndexMap: for any other symmetry. Pixels are grouped into orbits that
+always show the same color (key(x, y) equal) and bake() writes each
+pixel's orbit number into the bitmap once. From then on the picture is
+animated through the palette alone - one color per orbit per frame, no
+pixel writes - so there can be at most as many orbits as palette entries:
+
+    rays = symmetry.IndexMap(WIDTH, HEIGHT, key)
+    rays.bake(bitmap)
+    for orbit, k in enumerate(rays.keys):
+        palette[orbit] = ...
+
+Sequences using a Mirror expose it as the module attribute `mirror` so
+transitions can unroll it to a full-panel snapshot.
+"""
+import array
+import displayio
+from engine import color
+
+
+class Mirror:
+    """Region bitmap + flipped TileGrids covering the whole panel"""
+
+    def __init__(self, palette, width, height, value_count, mirror_x=True, mirror_y=True):
+        self.width = width
+        self.height = height
+        self.mirror_x = mirror_x
+        self.mirror_y = mirror_y
+        self.region_width = width // 2 + 1 if mirror_x else width
+        self.region_height = height // 2 + 1 if mirror_y else height
+        self.bitmap = displayio.Bitmap(self.region_width, self.region_height, value_count)
+        self.group = displayio.Group()
+        # The flipped copies start on the centre line; that column/row is
+        # drawn twice with the same pixels
+        for flip_y in ((False, True) if mirror_y else (False,)):
+            for flip_x in ((False, True) if mirror_x else (False,)):
+                grid = displayio.TileGrid(self.bitmap, pixel_shader=color.shader(palette),
+                                          x=width // 2 if flip_x else 0,
+                                          y=height // 2 if flip_y else 0)
+                grid.flip_x = flip_x
+                grid.flip_y = flip_y
+                self.group.append(grid)
+
+    def source(self, x, y):
+        """Region pixel shown at panel pixel (x, y)"""
+        if self.mirror_x and x >= self.region_width:
+            x = self.width - x
+        if self.mirror_y and y >= self.region_height:
+            y = self.height - y
+        return x, y
+
+    def unroll(self, dest):
+        """Write the full mirrored picture into dest"""
+        for y in range(self.height):
+            for x in range(self.width):
+                dest[x, y] = self.bitmap[self.source(x, y)]
+
+
+class IndexMap:
+    """Orbits of pixels sharing a value, from key(x, y) -> hashable"""
+
+    def __init__(self, width, height, key):
+        self.width = width
+        self.height = height
+        self.keys = []                    # orbit -> key
+        self.index = array.array("H", bytes(2 * width * height))
+        orbits = {}
+        i = 0
+        for y in range(height):
+            for x in range(width):
+                k = key(x, y)
+                orbit = orbits.get(k)
+                if orbit is None:
+                    orbit = orbits[k] = len(self.keys)
+                    self.keys.append(k)
+                self.index[i] = orbit
+                i += 1
+
+    def bake(self, bitmap, first=0):
+        """bitmap[x, y] = first + orbit of (x, y); the bitmap needs
+        first + len(keys) values. Only done once, so the per-pixel index
+        is released afterwards."""
+        index = self.index
+        i = 0
+        for y in range(self.height):
+            for x in range(self.width):
+                bitmap[x, y] = first + index[i]
+                i += 1
+        self.index = None
@@ -0,0 +1,235 @@
+"""
+tetris.py - Bitboard Tetris playfield and a time-bounded autoplayer
+
+The playfield is one int per row (bit x = column x, row 0 at the top), so
+a collision test is a shift and an AND per piece row and a full line is
+`row == full`. A piece in one rotation is a tuple of row masks.
+
+The Planner tries every rotation/column of the current piece, drops it
+and scores the resulting board with a heuristic (El-Tetris features:
+landing height, lines cleared, row/column transitions, holes, wells).
+think(budget_ms) only evaluates candidates until the budget is used up,
+so the search is spread over as many frames as it needs:
+
+    board = tetris.Board(10, 16)
+    planner = tetris.Planner(board)
+    planner.start(piece)
+    if planner.think(4):                 # every frame, until True
+        rotation, x = planner.best
+
+board.dirty has a bit set for every row that changed since the caller
+last cleared it, so only those rows need redrawing.
+"""
+import time
+
+# Cells of each piece in its spawn rotation
+SHAPES = (
+    ((0, 0), (1, 0), (2, 0), (3, 0)),          # I
+    ((0, 0), (1, 0), (0, 1), (1, 1)),          # O
+    ((0, 0), (1, 0), (2, 0), (1, 1)),          # T
+    ((1, 0), (2, 0), (0, 1), (1, 1)),          # S
+    ((0, 0), (1, 0), (1, 1), (2, 1)),          # Z
+    ((0, 0), (1, 0), (2, 0), (0, 1)),          # L
+    ((0, 0), (1, 0), (2, 0), (2, 1)),          # J
+)
+
+# El-Tetris weights
+WEIGHTS = (-4.500158825082766,   # landing height
+           3.4181268101392694,   # lines cleared
+           -3.2178882868487753,  # row transitions
+           -9.348695305445199,   # column transitions
+           -7.899265427351652,   # holes
+           -3.3855972247263626)  # well cells
+
+_POP6 = bytes(bin(i).count("1") for i in range(64))
+
+
+def popcount(v):
+    """Set bits in a non-negative int"""
+    n = 0
+    while v:
+        n += _POP6[v & 63]
+        v >>= 6
+    return n
+
+
+def _masks(cells):
+    """Row masks (top to bottom) of a cell list, moved to the top left"""
+    x0 = min(x for x, _ in cells)
+    y0 = min(y for _, y in cells)
+    rows = [0] * (max(y for _, y in cells) - y0 + 1)
+    for x, y in cells:
+        rows[y - y0] |= 1 << (x - x0)
+    return tuple(rows), max(x for x, _ in cells) - x0 + 1
+
+
+def rotations(shape):
+    """Distinct rotations of a shape: list of (row masks, width)"""
+    out = []
+    cells = shape
+    for _ in range(4):
+        masks = _masks(cells)
+        if masks not in out:
+            out.append(masks)
+        cells = tuple((-y, x) for x, y in cells)
+    return out
+
+
+PIECES = [rotations(shape) for shape in SHAPES]
+
+
+class Board:
+    """width x height playfield: row masks plus a color per cell"""
+
+    def __init__(self, width=10, height=20):
+        self.width = width
+        self.height = height
+        self.full = (1 << width) - 1
+        self.rows = [0] * height
+        self.colors = bytearray(width * height)
+        self.dirty = 0
+        self.lines = 0
+
+    def clear(self):
+        for y in range(self.height):
+            self.rows[y] = 0
+        for i in range(len(self.colors)):
+            self.colors[i] = 0
+        self.dirty = (1 << self.height) - 1
+        self.lines = 0
+
+    def fits(self, masks, x, y, rows=None):
+        """True if a piece (row masks, shifted x columns right) fits at row y"""
+        rows = self.rows if rows is None else rows
+        if x < 0 or y < 0 or y + len(masks) > self.height:
+            return False
+        full = self.full
+        for i, m in enumerate(masks):
+            m <<= x
+            if m & ~full or m & rows[y + i]:
+                return False
+        return True
+
+    def drop(self, masks, x, y=0, rows=None):
+        """Lowest row the piece reaches falling from y (or -1 if blocked)"""
+        if not self.fits(masks, x, y, rows):
+            return -1
+        while self.fits(masks, x, y + 1, rows):
+            y += 1
+        return y
+
+    def place(self, masks, x, y, color):
+        """Lock a piece in; clears full lines and returns how many"""
+        w = self.width
+        for i, m in enumerate(masks):
+            self.rows[y + i] |= m << x
+            for bx in range(w - x):
+                if m >> bx & 1:
+                    self.colors[(y + i) * w + x + bx] = color
+        self.dirty |= ((1 << len(masks)) - 1) << y
+        cleared = 0
+        for row in range(y, y + len(masks)):
+            if self.rows[row] == self.full:
+                self.remove_row(row)
+                cleared += 1
+        self.lines += cleared
+        return cleared
+
+    def remove_row(self, row):
+        """Drop every row above `row` down by one"""
+        w = self.width
+        for y in range(row, 0, -1):
+            self.rows[y] = self.rows[y - 1]
+            self.colors[y * w:(y + 1) * w] = self.colors[(y - 1) * w:y * w]
+        self.rows[0] = 0
+        for x in range(w):
+            self.colors[x] = 0
+        self.dirty |= (2 << row) - 1
+
+    def color(self, x, y):
+        return self.colors[y * self.width + x]
+
+
+def evaluate(board, rows, landing, height, cleared, weights=WEIGHTS):
+    """Heuristic score of rows after a piece of `height` rows landed at
+    row `landing` and `cleared` lines went away (higher is better)"""
+    w, h, full = board.width, board.height, board.full
+    walls = (1 << (w + 1)) | 1
+    row_trans = col_trans = holes = wells = 0
+    covered = 0
+    above = 0
+    for y in range(h):
+        r = rows[y]
+        # Walls count as filled
+        v = (r << 1) | walls
+        row_trans += popcount(v ^ (v >> 1))
+        col_trans += popcount(r ^ above)
+        holes += popcount(covered & ~r & full)
+        # Empty, open to the sky, filled (or wall) on both sides
+        left = ((r << 1) | 1) & full
+        right = (r >> 1) | (1 << (w - 1))
+        wells += popcount(~r & left & right & ~covered & full)
+        covered |= r
+        above = r
+    col_trans += popcount(above ^ full)
+    landing_height = h - landing - height / 2
+    return (weights[0] * landing_height + weights[1] * cleared + weights[2] * row_trans
+            + weights[3] * col_trans + weights[4] * holes + weights[5] * wells)
+
+
+class Planner:
+    """Incremental best-placement search for one piece at a time"""
+
+    def __init__(self, board, weights=WEIGHTS):
+        self.board = board
+        self.weights = weights
+        self.piece = None
+        self.candidates = []
+        self.next = 0
+        self.best = None
+        self.best_score = None
+        self.evaluated = 0
+
+    def start(self, piece):
+        """New search for PIECES[piece] on the board as it is now"""
+        self.piece = piece
+        self.candidates = []
+        for r, (masks, width) in enumerate(PIECES[piece]):
+            for x in range(self.board.width - width + 1):
+                self.candidates.append((r, x))
+        self.next = 0
+        self.best = None
+        self.best_score = None
+
+    def done(self):
+        return self.next >= len(self.candidates)
+
+    def think(self, budget_ms):
+        """Evaluate candidates for up to budget_ms; True once all are done"""
+        deadline = time.monotonic_ns() + int(budget_ms * 1000000)
+        board = self.board
+        while self.next < len(self.candidates):
+            r, x = self.candidates[self.next]
+            self.next += 1
+            masks = PIECES[self.piece][r][0]
+            y = board.drop(masks, x)
+            if y >= 0:
+                score = self.score(masks, x, y)
+                if self.best_score is None or score > self.best_score:
+                    self.best_score = score
+                    self.best = (r, x)
+            self.evaluated += 1
+            if time.monotonic_ns() >= deadline:
+                break
+        return self.done()
+
+    def score(self, masks, x, y):
+        board = self.board
+        rows = list(board.rows)
+        for i, m in enumerate(masks):
+            rows[y + i] |= m << x
+        kept = [r for r in rows if r != board.full]
+        cleared = len(rows) - len(kept)
+        if cleared:
+            rows = [0] * cleared + kept
+        return evaluate(board, rows, y, len(masks), cleared, self.weights)
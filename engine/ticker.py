@@ -0,0 +1,138 @@
+"""
+ticker.py - Streaming text ticker on a scroll ring
+
+Text is never turned into a label or a bitmap as long as the message:
+the ticker is a panel-sized scroll.Ring, and each frame only the pixel
+columns scrolling into view are looked up in the font and drawn. Memory
+is the ring plus a bounded message queue, whatever the text length.
+
+Messages are queued at module level (push() from code.py's /api/ticker)
+so they survive the ticker sequence being reloaded; the Ticker shows them
+in order, then the loop text, if any, over and over:
+
+    ticker.push("Hello")                       # anywhere
+    t = ticker.Ticker(palette, WIDTH, HEIGHT, ticker.BuiltinFont(terminalio.FONT))
+    t.advance(1)                               # every frame
+
+A font is anything with `height`, glyph_width(char) and column(char, x)
+-> bits (bit y set = pixel y lit), e.g. BuiltinFont below.
+"""
+from engine import scroll
+
+MAX_QUEUE = 16      # queued messages
+MAX_LENGTH = 512    # characters per message
+SPACING = 16        # blank columns between messages
+
+queue = []
+loop_text = None
+
+
+def push(text, replace=False):
+    """Queue a message; replace drops what is queued. Raises ValueError
+    if the text is empty/too long or the queue is full."""
+    if not isinstance(text, str) or not text:
+        raise ValueError("text must be a non-empty string")
+    if len(text) > MAX_LENGTH:
+        raise ValueError("text longer than %d characters" % MAX_LENGTH)
+    if replace:
+        del queue[:]
+    if len(queue) >= MAX_QUEUE:
+        raise ValueError("ticker queue is full (%d)" % MAX_QUEUE)
+    queue.append(text)
+    return len(queue)
+
+
+def set_loop(text):
+    """Text shown again and again while the queue is empty (None: blank)"""
+    global loop_text
+    if text is not None and len(text) > MAX_LENGTH:
+        raise ValueError("text longer than %d characters" % MAX_LENGTH)
+    loop_text = text or None
+
+
+class BuiltinFont:
+    """Fixed-size displayio BuiltinFont (terminalio.FONT) as columns"""
+
+    def __init__(self, font):
+        self.font = font
+        self.sheet = font.bitmap
+        self.tile_width, self.height = font.get_bounding_box()[:2]
+        self.tiles_across = self.sheet.width // self.tile_width
+
+    def glyph_width(self, char):
+        return self.tile_width
+
+    def column(self, char, x):
+        glyph = self.font.get_glyph(ord(char))
+        if glyph is None:
+            return 0
+        tile = glyph.tile_index
+        sx = (tile % self.tiles_across) * self.tile_width + x
+        sy = (tile // self.tiles_across) * self.height
+        sheet = self.sheet
+        bits = 0
+        for y in range(self.height):
+            if sheet[sx, sy + y]:
+                bits |= 1 << y
+        return bits
+
+
+class Ticker:
+    """Ring bitmap + a cursor into the message being shown"""
+
+    def __init__(self, palette, width, height, font, color=1, y=None, value_count=2):
+        self.ring = scroll.Ring(palette, width, height, value_count)
+        self.group = self.ring.group
+        self.font = font
+        self.color = color
+        self.top = (height - font.height) // 2 if y is None else y
+        self.text = None
+        self.index = 0
+        self.col = 0
+        self.gap = 0
+
+    def reset(self):
+        self.ring.clear()
+        self.ring.move_to(0)
+        self.text = None
+        self.gap = 0
+
+    def next_column(self):
+        """Bits of the next text column (0 between messages)"""
+        if self.text is None:
+            if self.gap > 0:
+                self.gap -= 1
+                return 0
+            if queue:
+                self.text = queue.pop(0)
+            elif loop_text:
+                self.text = loop_text
+            else:
+                return 0
+            self.index = 0
+            self.col = 0
+        char = self.text[self.index]
+        bits = self.font.column(char, self.col)
+        self.col += 1
+        if self.col >= self.font.glyph_width(char):
+            self.col = 0
+            self.index += 1
+            if self.index >= len(self.text):
+                self.text = None
+                self.gap = SPACING
+        return bits
+
+    def advance(self, step=1):
+        """Scroll step pixels, drawing only the columns that came in"""
+        ring, top, color = self.ring, self.top, self.color
+        bitmap = ring.bitmap
+        for line in ring.advance(step):
+            ring.clear_line(line)
+            bits = self.next_column()
+            x = ring.slot(line)
+            y = top
+            while bits:
+                if bits & 1:
+                    bitmap[x, y] = color
+                bits >>= 1
+                y += 1
@@ -0,0 +1,211 @@
+"""
+transitions.py - Crossfade / wipe / dissolve between two animations
+
+When code.py switches animations it captures the outgoing animation's last
+frame into a snapshot layer drawn ON TOP of the incoming animation. Each
+transition frame turns part of the snapshot transparent, so the incoming
+animation (which keeps running underneath) shows through:
+
+    crossfade - outgoing palette fades toward black while an 8x8 Bayer
+                screen opens evenly across the panel
+    wipe      - columns open left to right
+    dissolve  - pixels open in pseudo-random (LFSR) order
+
+All buffers are allocated once in Transition(); a transition never
+allocates, and each frame touches only width*height/frames pixels.
+"""
+import array
+import time
+import displayio
+from engine import color
+
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+STYLES = ("cut", "crossfade", "wipe", "dissolve")
+TRANSPARENT = 256  # snapshot index that lets the incoming animation through
+
+# Module attributes with an unroll(dest) method: engine.scroll.Ring,
+# engine.symmetry.Mirror
+UNROLL_ATTRS = ("scroll_ring", "mirror")
+
+# Galois LFSR masks with a full 2**n - 1 period
+LFSR_MASKS = {4: 0x9, 5: 0x12, 6: 0x21, 7: 0x41, 8: 0x8E, 9: 0x108,
+              10: 0x204, 11: 0x402, 12: 0x829, 13: 0x100D, 14: 0x2015,
+              15: 0x4001, 16: 0x8016}
+
+
+def _bayer_positions():
+    """Cell position (y*8 + x) for each 8x8 Bayer threshold 0..63"""
+    matrix = [[0]]
+    while len(matrix) < 8:
+        matrix = ([[4 * v for v in row] + [4 * v + 2 for v in row] for row in matrix] +
+                  [[4 * v + 3 for v in row] + [4 * v + 1 for v in row] for row in matrix])
+    positions = bytearray(64)
+    for y in range(8):
+        for x in range(8):
+            positions[matrix[y][x]] = y * 8 + x
+    return positions
+
+
+def scale_color(col, f):
+    """Scale a 0xRRGGBB color by 0..1"""
+    r = int(((col >> 16) & 0xFF) * f)
+    g = int(((col >> 8) & 0xFF) * f)
+    b = int((col & 0xFF) * f)
+    return (r << 16) | (g << 8) | b
+
+
+def _fill(bitmap, x1, y1, x2, y2, value):
+    if bitmaptools is not None:
+        bitmaptools.fill_region(bitmap, x1, y1, x2, y2, value)
+        return
+    for y in range(y1, y2):
+        for x in range(x1, x2):
+            bitmap[x, y] = value
+
+
+def _copy(dest, source):
+    if bitmaptools is not None and hasattr(bitmaptools, "blit"):
+        bitmaptools.blit(dest, source, 0, 0)
+    else:
+        dest.blit(0, 0, source)
+
+
+class Transition:
+    """Preallocated snapshot layer + per-style progress"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.snapshot = displayio.Bitmap(width, height, TRANSPARENT + 1)
+        self.palette = displayio.Palette(TRANSPARENT + 1)
+        self.palette.make_transparent(TRANSPARENT)
+        self.layer = displayio.TileGrid(self.snapshot, pixel_shader=self.palette)
+        self.group = displayio.Group()
+        self.colors = array.array("L", [0] * TRANSPARENT)
+        self.bayer = _bayer_positions()
+        bits = 4
+        while (1 << bits) < width * height:
+            bits += 1
+        self.lfsr_mask = LFSR_MASKS[bits]
+
+        self.active = False
+        self.style = "cut"
+        self.frames = 0
+        self.frame = 0
+        self.done = 0
+        self.lfsr = 1
+        self.count = 0
+        self.step_ms = 0.0  # slowest step of the last transition
+
+    def begin(self, outgoing, incoming_group, style, frames):
+        """Capture outgoing's last frame over incoming_group.
+
+        Sequences whose picture isn't a plain full-panel bitmap expose an
+        object that can unroll it in screen order (UNROLL_ATTRS). Sprites
+        in outgoing.sprite_layer (engine.sprites.SpriteLayer) are stamped
+        on top. Returns False (caller should just cut) if the style is
+        "cut" or there is no full-panel picture + palette to copy (a
+        true-color surface has a ColorConverter instead).
+        """
+        self.end()
+        palette = getattr(outgoing, "palette", None)
+        if style not in STYLES or style == "cut" or palette is None:
+            return False
+        if isinstance(palette, displayio.ColorConverter) or len(palette) > TRANSPARENT:
+            return False
+        for name in UNROLL_ATTRS:
+            source = getattr(outgoing, name, None)
+            if source is not None:
+                break
+        if source is not None:
+            source.unroll(self.snapshot)
+        else:
+            bitmap = getattr(outgoing, "bitmap", None)
+            if bitmap is None or bitmap.width != self.width or bitmap.height != self.height:
+                return False
+            _copy(self.snapshot, bitmap)
+
+        layer = getattr(outgoing, "sprite_layer", None)
+        if layer is not None:
+            layer.stamp(self.snapshot)
+        # The colors as shown (gamma/brightness corrected)
+        shown = color.shader(palette)
+        self.count = len(palette)
+        for i in range(self.count):
+            self.colors[i] = shown[i]
+            self.palette[i] = self.colors[i]
+
+        self.group.append(incoming_group)
+        self.group.append(self.layer)
+        self.style = style
+        self.frames = max(2, frames)
+        self.frame = 0
+        self.done = 0
+        self.lfsr = 1
+        self.step_ms = 0.0
+        self.active = True
+        return True
+
+    def step(self):
+        """Advance one frame. Returns False once finished; the caller then
+        shows the incoming group directly."""
+        if not self.active:
+            return False
+        self.frame += 1
+        if self.frame >= self.frames:
+            self.end()
+            return False
+        start = time.monotonic_ns()
+        progress = self.frame / self.frames
+        if self.style == "crossfade":
+            self._crossfade(progress)
+        elif self.style == "wipe":
+            self._wipe(progress)
+        else:
+            self._dissolve(progress)
+        self.step_ms = max(self.step_ms, (time.monotonic_ns() - start) / 1000000)
+        return True
+
+    def end(self):
+        """Drop the snapshot layer and release the incoming group"""
+        while len(self.group):
+            self.group.pop()
+        self.active = False
+
+    def _crossfade(self, progress):
+        target = int(64 * progress)
+        w, h = self.width, self.height
+        while self.done < target:
+            cell = self.bayer[self.done]
+            for y in range(cell >> 3, h, 8):
+                for x in range(cell & 7, w, 8):
+                    self.snapshot[x, y] = TRANSPARENT
+            self.done += 1
+        fade = 1.0 - progress
+        for i in range(self.count):
+            self.palette[i] = scale_color(self.colors[i], fade)
+
+    def _wipe(self, progress):
+        target = int(self.width * progress)
+        if target > self.done:
+            _fill(self.snapshot, self.done, 0, target, self.height, TRANSPARENT)
+            self.done = target
+
+    def _dissolve(self, progress):
+        total = self.width * self.height
+        target = int(total * progress)
+        w, mask, s = self.width, self.lfsr_mask, self.lfsr
+        while self.done < target:
+            index = s - 1
+            if index < total:
+                self.snapshot[index % w, index // w] = TRANSPARENT
+                self.done += 1
+            lsb = s & 1
+            s >>= 1
+            if lsb:
+                s ^= mask
+        self.lfsr = s
@@ -1,28 +1,29 @@
 """
 bouncing_balls.py - Physics simulation with gravity and bounce
+
+Two modes, chosen with the "mode" option (POST /api/options); MODE is the
+one it starts in.
+
+"physics": a crowd of balls of different sizes that also bounce off
+each other (engine.physics: spatial hash + substeps), drawn as discs. They
+get kicked back up every few seconds once they've piled up.
+
+"sprites": the original 8 balls, wall bounces only. Balls are 1x1
+sprites (engine.sprites) over a black background, so a frame only moves 8
+TileGrids instead of clearing and redrawing the whole panel. Ball state
+lives in a preallocated engine.particles pool.
 """
 import time
-import random
-import board
 import displayio
-import framebufferio
-import rgbmatrix
+from engine import panel, particles, physics, prng, sprites
 
-# Display setup
-displayio.release_displays()
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+FPS = 30
+COST = "medium"
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+bitmap, palette, group = panel.surface(8)
 
 palette[0] = 0x000000
 palette[1] = 0xFF0000
@@ -33,45 +34,107 @@ palette[5] = 0xFF00FF
 palette[6] = 0x00FFFF
 palette[7] = 0xFFFFFF
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
+MODE = "physics"  # "physics" or "sprites"
+MODES = ("physics", "sprites")
+OPTIONS = {"mode": list(MODES)}
+mode = MODE
 
 # Animation setup
-balls = []
-for i in range(8):
-    balls.append([random.uniform(2, WIDTH-2), random.uniform(2, HEIGHT-2),
-                  random.uniform(-2, 2), random.uniform(-2, 2), i % 7 + 1])
+NUM_BALLS = 8
+balls = particles.Pool(NUM_BALLS)
 
 GRAVITY = 0.3
 BOUNCE = 0.85
 
+# Physics mode
+NUM_PHYSICS_BALLS = panel.per_area(60)  # same crowd density on any wall
+RADII = (0.5, 0.5, 1.0, 1.5)
+SUBSTEPS = 2
+KICK_FRAMES = 150
+world = physics.World(NUM_PHYSICS_BALLS, WIDTH, HEIGHT, max_radius=max(RADII))
+
+
+def _ball_sheet():
+    # One 1x1 tile per ball color 1..7
+    bmp = displayio.Bitmap(7, 1, 8)
+    for i in range(7):
+        bmp[i, 0] = i + 1
+    return bmp, sprites.shader(palette)
+
+
+# Built in either mode (8 TileGrids); hidden while the physics mode runs
+sprite_layer = sprites.SpriteLayer()
+group.append(sprite_layer.group)
+ball_bmp, ball_pal = sprites.sheet("bouncing_balls.balls", _ball_sheet)
+ball_sprites = [sprite_layer.add(ball_bmp, ball_pal, tile=i % 7, tile_width=1)
+                for i in range(NUM_BALLS)]
+
 # Main loop with web server integration
 print("Starting animation...")
 
 
+def random_velocity():
+    return prng.randint(-200, 200) / 100
+
+
+def configure(options):
+    """Choose the mode; returns the options now in effect"""
+    global mode
+    for key in options:
+        if key not in OPTIONS:
+            raise ValueError("Unknown option: %s" % key)
+    choice = options.get("mode", mode)
+    if choice not in MODES:
+        raise ValueError("Unknown mode: %s" % choice)
+    mode = choice
+    return {"mode": mode}
+
+
 def init_animation():
     """Initialize animation state"""
+    for sprite in ball_sprites:
+        sprite.hidden = mode != "sprites"
+    if mode == "physics":
+        world.clear()
+        for i in range(NUM_PHYSICS_BALLS):
+            world.add(prng.randint(2, WIDTH-3), prng.randint(2, HEIGHT-3),
+                      random_velocity(), random_velocity(),
+                      radius=RADII[i % len(RADII)], color=i % 7 + 1)
+        return {"frame": 0}
+    # Physics mode drew its balls into the bitmap
+    bitmap.fill(0)
+    balls.clear()
+    for i in range(NUM_BALLS):
+        balls.spawn(prng.randint(200, (WIDTH-2) * 100) / 100,
+                    prng.randint(200, (HEIGHT-2) * 100) / 100,
+                    random_velocity(), random_velocity(), color=i % 7 + 1)
     return {
-        "balls": [[random.uniform(2, WIDTH-2), random.uniform(2, HEIGHT-2),
-                   random.uniform(-2, 2), random.uniform(-2, 2), i % 7 + 1] for i in range(8)],
         "frame": 0,
     }
 
+
+def update_physics(state):
+    if state["frame"] % KICK_FRAMES == 0:
+        # Throw the pile back up
+        vxs, vys = world.balls.vx, world.balls.vy
+        for i in range(world.balls.count):
+            vxs[i] += random_velocity()
+            vys[i] -= prng.randint(200, 500) / 100
+    world.step(gravity=GRAVITY, bounce=BOUNCE, substeps=SUBSTEPS)
+    world.draw(bitmap)
+    return state
+
+
 def update_animation(state):
     """Update one frame and return new state"""
     state["frame"] += 1
-    balls = state["balls"]
-    
-    # Clear display
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            bitmap[x, y] = 0
+    if mode == "physics":
+        return update_physics(state)
+    xs, ys, vxs, vys, cols = balls.x, balls.y, balls.vx, balls.vy, balls.color
     
-    # Update and draw balls
-    for ball in balls:
-        x, y, vx, vy, col = ball
+    # Update and move balls
+    for i in range(balls.count):
+        x, y, vx, vy = xs[i], ys[i], vxs[i], vys[i]
         vy += GRAVITY
         x += vx
         y += vy
@@ -89,10 +152,9 @@ def update_animation(state):
             x = 0
             vx = -vx * BOUNCE
         
-        ball[0], ball[1], ball[2], ball[3] = x, y, vx, vy
-        ix, iy = int(x), int(y)
-        if 0 <= ix < WIDTH and 0 <= iy < HEIGHT:
-            bitmap[ix, iy] = col
+        xs[i], ys[i], vxs[i], vys[i] = x, y, vx, vy
+        sprite = ball_sprites[i]
+        sprite[0] = cols[i] - 1
+        sprite.x, sprite.y = int(x), int(y)
     
-    state["balls"] = balls
     return state
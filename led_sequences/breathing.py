@@ -1,39 +1,31 @@
 """
 breathing.py - Pulsing geometric patterns with color cycling
+
+The rings are symmetric about the panel centre, so only the top-left
+quadrant is computed; engine.symmetry mirrors it to the rest of the panel.
 """
 import time
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-
-displayio.release_displays()
+from engine import color, panel, symmetry
 
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+FPS = 30
+COST = "heavy"
+BIT_DEPTH = 6     # slow fades: worth the extra scan-out CPU
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+palette = color.Palette(8)
+mirror = symmetry.Mirror(palette, WIDTH, HEIGHT, 8)
+bitmap = mirror.bitmap
+group = mirror.group
 
 palette[0] = 0x000000
 for i in range(1, 8):
     palette[i] = 0xFF0000
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
-
 cx, cy = WIDTH / 2.0, HEIGHT / 2.0
+SCALE = panel.SCALE  # ring width grows with the wall
 
 def init_animation():
     """Initialize animation state"""
@@ -60,15 +52,14 @@ def update_animation(state):
     elif h < 5: r, g, b = h-4, 0, 1
     else: r, g, b = 1, 0, 6-h
     
-    for i in range(1, 8):
-        v = i / 7.0
-        palette[i] = (int(r*v*255) << 16) | (int(g*v*255) << 8) | int(b*v*255)
+    # One color, seven brightness steps (integer scaling in engine.color)
+    color.ramp(palette, 1, 7, (int(r*255) << 16) | (int(g*255) << 8) | int(b*255))
     
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
+    for y in range(mirror.region_height):
+        for x in range(mirror.region_width):
             dx, dy = x - cx, y - cy
             dist = math.sqrt(dx*dx + dy*dy)
-            ring = (dist + pulse * 8) % 12
+            ring = (dist / SCALE + pulse * 8) % 12
             if ring < 6:
                 bitmap[x, y] = int(ring) + 1
             else:
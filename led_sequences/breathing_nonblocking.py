@@ -4,37 +4,21 @@ This version uses state machine pattern instead of while True loop
 """
 import time
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
+from engine import panel
 
-# Initialize display ONCE at module import
-displayio.release_displays()
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-WIDTH = 64
-HEIGHT = 32
+FPS = 30
+COST = "heavy"
+LISTED = False  # example only, not shown in the manifest
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
-
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+bitmap, palette, group = panel.surface(8)
 
 palette[0] = 0x000000
 for i in range(1, 8):
     palette[i] = 0xFF0000
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
-
 cx, cy = WIDTH / 2.0, HEIGHT / 2.0
 
 def init_animation():
@@ -1,9 +1,14 @@
+"""
+cap-shield.py - Captain America shield with breathing rings and a star
+
+The shield is rendered once into a master (engine.rotozoom) whose pixels
+hold a radius bucket, plus a flag for "inside the star". Each frame is one
+native zoom pass; the breathing rings and color rotation are palette
+writes on the buckets.
+"""
 import time
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
+from engine import panel, rotozoom
 
 # Provide hypot fallback for CircuitPython builds without math.hypot
 try:
@@ -14,49 +19,25 @@ except Exception:
         return _math.sqrt(dx*dx + dy*dy)
 
 # --- Setup Display ---
-displayio.release_displays()
-
-WIDTH = 64
-HEIGHT = 32
-USE_ADDR_E = False  # set True for 64x64 panels
-
-addr_pins = [
-    board.MTX_ADDRA,
-    board.MTX_ADDRB,
-    board.MTX_ADDRC,
-    board.MTX_ADDRD,
-]
-if USE_ADDR_E:
-    addr_pins.append(board.MTX_ADDRE)
-
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH,
-    height=HEIGHT,
-    bit_depth=4,
-    rgb_pins=[
-        board.MTX_R1, board.MTX_G1, board.MTX_B1,
-        board.MTX_R2, board.MTX_G2, board.MTX_B2,
-    ],
-    addr_pins=addr_pins,
-    clock_pin=board.MTX_CLK,
-    latch_pin=board.MTX_LAT,
-    output_enable_pin=board.MTX_OE,
-)
-
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 30
+COST = "medium"
+
+# --- Radius buckets (palette layout) ---
+# 0 = outside the master, 1..BUCKETS = ring buckets of BUCKET_SIZE shield
+# units (the last one is everything past the outer ring), BUCKETS+1.. = the
+# same buckets inside the star
+BUCKETS = 61
+BUCKET_SIZE = 0.25 * panel.SCALE  # 61 buckets reach r_outer on any wall
+PALETTE_SIZE = 1 + 2 * BUCKETS
 
 # --- Colors and Layers ---
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
-palette[0] = 0x000002  # dark background
-palette[1] = 0x1030FF  # blue
-palette[2] = 0xFFFFFF  # white
-palette[3] = 0xFF2030  # red
-palette[4] = 0x101020  # inner core (dark gray)
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
+bitmap, palette, group = panel.surface(PALETTE_SIZE)
+BACKGROUND = 0x000002  # dark background
+CORE = 0x101020        # inner core (dark gray)
+palette[0] = BACKGROUND
 
 # --- Shield Geometry ---
 cx = WIDTH / 2.0
@@ -71,9 +52,8 @@ r_core  = max_r * 0.25
 STAR_POINTS = 5
 star_angle_step = 2 * math.pi / STAR_POINTS
 
-def in_star(x, y, zoom, thickness=0.9):
-    dx = (x - cx) * zoom
-    dy = (y - cy) * zoom
+def in_star(dx, dy, thickness=0.9):
+    """Is shield point (dx, dy) inside the star"""
     angle = math.atan2(dy, dx)
     r = hypot(dx, dy)
     a = (angle + math.pi) % (2 * math.pi)
@@ -82,6 +62,25 @@ def in_star(x, y, zoom, thickness=0.9):
     allowed = max_arm_r * (1.0 - abs(a) / (star_angle_step / 2))
     return r < allowed * thickness
 
+# --- Pre-rendered shield ---
+# Master coordinates are shield units: panel distance from the centre times
+# zoom. The shield is no bigger than r_outer, so 16 units each way is enough
+# at the design size (r_outer grows with panel.SCALE).
+MASTER_RADIUS = 16 * panel.SCALE
+
+
+def shade(dx, dy):
+    """Radius bucket (+ star flag) of shield point (dx, dy)"""
+    k = 1 + min(int(hypot(dx, dy) / BUCKET_SIZE), BUCKETS - 1)
+    if in_star(dx, dy, thickness=0.95):
+        k += BUCKETS
+    return k
+
+
+master = rotozoom.master("cap-shield", 2 * MASTER_RADIUS, 2 * MASTER_RADIUS, PALETTE_SIZE,
+                         shade, origin=(-MASTER_RADIUS, -MASTER_RADIUS), centred=True)
+bucket_r = [(k + 0.5) * BUCKET_SIZE for k in range(BUCKETS - 1)] + [MASTER_RADIUS * 2]
+
 # --- Animation Loop ---
 t = 0.0
 
@@ -131,31 +130,27 @@ def update_animation(state):
     mix = (math.sin(t * 0.25 - math.pi/2) + 1.0) * 0.5
     schemeA = [0x1030FF, 0xFFFFFF, 0xFF2030]
     schemeB = [0xFF2030, 0x1030FF, 0xFFFFFF]
-    for i in range(3):
-        palette[1 + i] = lerp_color(schemeA[i], schemeB[i], mix)
-    outer_col = 1
-    mid_col = 2
-    inner_col = 3
-
-    # --- Draw Shield Frame ---
-    for y in range(HEIGHT):
-        dy = y - cy
-        for x in range(WIDTH):
-            dx = x - cx
-            r = hypot(dx, dy) * zoom
-
-            c = 0
-            if r < r_outer_mod:
-                c = outer_col
-            if r < r_mid_mod:
-                c = mid_col
-            if r < r_inner_mod:
-                c = inner_col
-            if r < r_core * zoom:
-                c = 4
-            if in_star(x, y, zoom, thickness=0.95) and r < r_inner_mod:
-                c = 2
-            bitmap[x, y] = c
+    rings = [BACKGROUND] + [lerp_color(schemeA[i], schemeB[i], mix) for i in range(3)] + [CORE]
+    star = rings[2]
+
+    # --- Shield colors by radius bucket ---
+    core_r = r_core * zoom
+    for k in range(BUCKETS):
+        r = bucket_r[k]
+        c = 0
+        if r < r_outer_mod:
+            c = 1
+        if r < r_mid_mod:
+            c = 2
+        if r < r_inner_mod:
+            c = 3
+        if r < core_r:
+            c = 4
+        palette[1 + k] = rings[c]
+        palette[1 + BUCKETS + k] = star if r < r_inner_mod else rings[c]
+
+    # --- Draw Shield Frame: zoom the master about the panel centre ---
+    master.draw(bitmap, int(cx), int(cy), 1.0 / zoom, centre=(0, 0))
 
     state["t"] = t
     return state
@@ -0,0 +1,103 @@
+"""
+cellular_automata.py - Multi-state cellular automata (engine/automata.py)
+
+Brian's Brain, Wireworld, Star Wars (a generations rule), Life and a
+cyclic CA, each with a few palettes. Pick them with
+
+    POST /api/options {"options": {"rule": "wireworld", "palette": "ice"}}
+
+which calls configure() and restarts the animation. The board reseeds
+itself when nothing changes any more.
+"""
+import time
+from engine import panel, automata
+
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 30
+COST = "heavy"
+
+MAX_STATES = 16
+RULE = "brians-brain"
+PALETTE = "classic"
+
+# Gradients from the first live state to the last; state 0 stays black
+PALETTES = {
+    "classic": None,
+    "fire": (0xFFFFC0, 0xFF8000, 0x800000),
+    "ice": (0xFFFFFF, 0x40C0FF, 0x000060),
+    "neon": (0xFF00FF, 0x00FFFF, 0x004040),
+}
+
+# Choices for /api/options
+OPTIONS = {"rule": sorted(automata.RULES), "palette": sorted(PALETTES)}
+
+bitmap, palette, group = panel.surface(MAX_STATES)
+
+world = automata.Automaton(WIDTH, HEIGHT)
+rule_name = RULE
+palette_name = PALETTE
+
+
+def blend(a, b, t):
+    """Mix two 0xRRGGBB colors, t = 0..1"""
+    out = 0
+    for shift in (16, 8, 0):
+        ca = (a >> shift) & 0xFF
+        cb = (b >> shift) & 0xFF
+        out |= int(ca + (cb - ca) * t) << shift
+    return out
+
+
+def apply_palette(rule):
+    stops = PALETTES[palette_name]
+    for s in range(MAX_STATES):
+        palette[s] = 0
+    if stops is None:
+        for s, color in enumerate(rule.colors):
+            palette[s] = color
+        return
+    live = rule.states - 1
+    for s in range(1, rule.states):
+        t = (s - 1) / max(1, live - 1) * (len(stops) - 1)
+        i = min(int(t), len(stops) - 2)
+        palette[s] = blend(stops[i], stops[i + 1], t - i)
+
+
+def configure(options):
+    """Choose rule/palette; returns the options now in effect"""
+    global rule_name, palette_name
+    for key in options:
+        if key not in OPTIONS:
+            raise ValueError("Unknown option: %s" % key)
+    rule = options.get("rule", rule_name)
+    colors = options.get("palette", palette_name)
+    if rule not in automata.RULES:
+        raise ValueError("Unknown rule: %s" % rule)
+    if colors not in PALETTES:
+        raise ValueError("Unknown palette: %s" % colors)
+    rule_name, palette_name = rule, colors
+    return {"rule": rule_name, "palette": palette_name}
+
+
+def init_animation():
+    """Initialize animation state"""
+    rule = automata.rule(rule_name)
+    world.set_rule(rule)
+    apply_palette(rule)
+    world.seed()
+    world.draw(bitmap)
+    return {
+        "frame": 0,
+        "rule": rule_name,
+    }
+
+def update_animation(state):
+    """Update one frame and return new state"""
+    state["frame"] += 1
+    if not world.step(bitmap):
+        # Died out or frozen
+        world.seed()
+        world.draw(bitmap)
+    return state
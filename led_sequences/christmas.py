@@ -8,31 +8,36 @@ Non-blocking animation with stable, flicker-free scenes:
 4. Gift Opening - presents appear with sparkles
 5. Starry Finale - peaceful night sky
 
-Each scene uses solid backgrounds with smooth sprite movement.
+Each scene uses solid backgrounds with smooth sprite movement. Snow,
+Santa's sleigh and the gifts are real sprites (engine.sprites): they are
+drawn once into cached sheets and moved by TileGrid position only. The
+static part of each scene (sky, house, tree, text) is rendered once per
+phase into a cached background; each frame copies it natively and adds
+only the twinkling pixels.
 """
 print("Christmas Story loading")
 import time
-import board
 import displayio
-import framebufferio
-import rgbmatrix
+from engine import glyphfont, panel, sprites
 
-WIDTH = 64
-HEIGHT = 32
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+# The story is pixel art: it is drawn at the design height and shown
+# scaled up on bigger walls (a wider wall just shows more sky)
+SCALE = panel.SCALE
+WIDTH = panel.WIDTH // SCALE
+HEIGHT = panel.HEIGHT // SCALE
+
+FPS = 30
+COST = "medium"
 
 # Setup display
 try:
     print("Display setup")
-    displayio.release_displays()
-    matrix = rgbmatrix.RGBMatrix(
-        width=WIDTH, height=HEIGHT, bit_depth=4,
-        rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                  board.MTX_R2, board.MTX_G2, board.MTX_B2],
-        addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-        clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
-    display = framebufferio.FramebufferDisplay(matrix, auto_refresh=False)
-    bitmap = displayio.Bitmap(WIDTH, HEIGHT, 16)
-    palette = displayio.Palette(16)
+    bitmap, palette, group = panel.surface(16, scale=SCALE)
 
     # Colorful palette
     palette[0] = (0, 0, 20)        # dark night blue
@@ -52,16 +57,15 @@ try:
     palette[14] = (180, 120, 80)   # tan/beige
     palette[15] = (10, 10, 40)     # deep night
 
-    tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-    group = displayio.Group()
-    group.append(tg)
-    display.root_group = group
     display_ok = True
     print("Display ready")
 except Exception as e:
     print("Display failed:", e)
     display_ok = False
 
+# Compiled 3x5 font, glyphs read from flash as they are drawn
+small_font = glyphfont.load("3x5.glf")
+
 
 def set_pixel(bmp, x, y, c):
     """Safely set pixel with bounds check."""
@@ -79,6 +83,7 @@ def fill_rect(bmp, x, y, w, h, c):
 
 def init_animation():
     """Initialize Christmas story state."""
+    release_scene()
     # Precompute snowflakes with deterministic starting positions
     snowflakes = []
     for i in range(15):  # 15 gentle snowflakes
@@ -195,31 +200,243 @@ def draw_gift(bmp, x, y, color):
 
 
 def draw_text_small(bmp, text, x, y, color):
-    """Draw simple 3x5 pixel font text."""
-    # Simple letter patterns (3 pixels wide, 5 tall)
-    letters = {
-        'M': [[1,1,1],[1,0,1],[1,0,1],[1,0,1],[1,0,1]],
-        'E': [[1,1,1],[1,0,0],[1,1,1],[1,0,0],[1,1,1]],
-        'R': [[1,1,0],[1,0,1],[1,1,0],[1,0,1],[1,0,1]],
-        'Y': [[1,0,1],[1,0,1],[0,1,0],[0,1,0],[0,1,0]],
-        'C': [[1,1,1],[1,0,0],[1,0,0],[1,0,0],[1,1,1]],
-        'H': [[1,0,1],[1,0,1],[1,1,1],[1,0,1],[1,0,1]],
-        'I': [[1,1,1],[0,1,0],[0,1,0],[0,1,0],[1,1,1]],
-        'S': [[1,1,1],[1,0,0],[1,1,1],[0,0,1],[1,1,1]],
-        'T': [[1,1,1],[0,1,0],[0,1,0],[0,1,0],[0,1,0]],
-        'A': [[0,1,0],[1,0,1],[1,1,1],[1,0,1],[1,0,1]],
-        ' ': [[0,0,0],[0,0,0],[0,0,0],[0,0,0],[0,0,0]],
-    }
+    """Draw text in the 3x5 pixel font (lib/fonts/3x5.glf)."""
+    small_font.draw(bmp, text.upper(), x, y, color)
+
+
+# --- Cached scene backgrounds ---
+# Each phase's static content is drawn once into `scene` when the phase (or
+# the text/decoration stage of the finale) starts, and dropped when it ends.
+# Static pixels that the original scene drew ON TOP of the twinkling bits
+# are also marked in `cover`, so put_pixel() keeps the same layering and the
+# output is identical to redrawing everything every frame.
+UNCOVERED = 16  # cover value: nothing static drawn over this pixel
+
+scene = None
+cover = None
+scene_key = None
+
+
+def copy_bitmap(dest, source):
+    """Native full-bitmap copy"""
+    if bitmaptools is not None and hasattr(bitmaptools, "blit"):
+        bitmaptools.blit(dest, source, 0, 0)
+    else:
+        dest.blit(0, 0, source)
+
+
+def put_pixel(x, y, c):
+    """set_pixel() for moving/twinkling pixels: skips covered pixels"""
+    if 0 <= x < WIDTH and 0 <= y < HEIGHT and cover[x, y] == UNCOVERED:
+        bitmap[x, y] = c
+
+
+def draw_merry_decorations(bmp):
+    """Little trees and Santa's face for the Merry Christmas scene"""
+    # Little trees on far sides
+    for tx in [4, WIDTH - 8]:
+        # Mini tree
+        set_pixel(bmp, tx, HEIGHT - 4, 5)
+        set_pixel(bmp, tx - 1, HEIGHT - 5, 3)
+        set_pixel(bmp, tx, HEIGHT - 5, 3)
+        set_pixel(bmp, tx + 1, HEIGHT - 5, 3)
+        set_pixel(bmp, tx, HEIGHT - 6, 3)
+        set_pixel(bmp, tx, HEIGHT - 7, 4)
+    
+    # Santa's face on the right side (EXTRA LARGE with maximum detail)
+    sx = WIDTH - 17
+    sy = 5
+    
+    # Red hat (large and detailed)
+    fill_rect(bmp, sx + 1, sy, 8, 4, 2)            # Hat body red
+    fill_rect(bmp, sx + 2, sy - 1, 6, 1, 2)        # Hat top red
+    set_pixel(bmp, sx + 3, sy - 2, 2)              # Hat tip
+    # Hat trim (fluffy white fur)
+    fill_rect(bmp, sx, sy + 4, 10, 2, 1)           # Hat trim white thick
+    # Large pom-pom with shading
+    fill_rect(bmp, sx + 8, sy + 1, 3, 3, 1)        # White pom-pom
+    set_pixel(bmp, sx + 9, sy + 2, 13)             # Pom-pom highlight
+    
+    # Face outline and main color (beige/tan - extra large)
+    fill_rect(bmp, sx + 1, sy + 6, 8, 7, 14)       # Face main
+    
+    # Eyes (large with detail)
+    # Left eye
+    fill_rect(bmp, sx + 2, sy + 7, 2, 3, 0)        # Left eye black
+    set_pixel(bmp, sx + 3, sy + 7, 7)              # Left eye sparkle top
+    set_pixel(bmp, sx + 2, sy + 8, 1)              # Left eye sparkle mid
+    # Right eye  
+    fill_rect(bmp, sx + 6, sy + 7, 2, 3, 0)        # Right eye black
+    set_pixel(bmp, sx + 7, sy + 7, 7)              # Right eye sparkle top
+    set_pixel(bmp, sx + 6, sy + 8, 1)              # Right eye sparkle mid
     
-    cursor_x = x
-    for char in text.upper():
-        if char in letters:
-            pattern = letters[char]
-            for row in range(5):
-                for col in range(3):
-                    if pattern[row][col]:
-                        set_pixel(bmp, cursor_x + col, y + row, color)
-            cursor_x += 4  # 3 pixel width + 1 pixel spacing
+    # Eyebrows (gray/dark)
+    fill_rect(bmp, sx + 2, sy + 6, 2, 1, 15)       # Left eyebrow
+    fill_rect(bmp, sx + 6, sy + 6, 2, 1, 15)       # Right eyebrow
+    
+    # Rosy cheeks (pink)
+    fill_rect(bmp, sx + 1, sy + 9, 2, 2, 8)        # Left cheek
+    fill_rect(bmp, sx + 7, sy + 9, 2, 2, 8)        # Right cheek
+    
+    # Nose (red, round and prominent)
+    fill_rect(bmp, sx + 4, sy + 9, 2, 2, 2)        # Nose main
+    set_pixel(bmp, sx + 5, sy + 9, 12)             # Nose highlight
+    
+    # Mouth (big smile)
+    fill_rect(bmp, sx + 3, sy + 11, 4, 1, 2)       # Smile
+    set_pixel(bmp, sx + 2, sy + 12, 2)             # Smile left curve
+    set_pixel(bmp, sx + 7, sy + 12, 2)             # Smile right curve
+    
+    # White mustache (big and bushy)
+    fill_rect(bmp, sx, sy + 10, 4, 2, 1)           # Left mustache
+    fill_rect(bmp, sx + 6, sy + 10, 4, 2, 1)       # Right mustache
+    set_pixel(bmp, sx + 1, sy + 12, 1)             # Mustache curl left
+    set_pixel(bmp, sx + 8, sy + 12, 1)             # Mustache curl right
+    
+    # White beard (full, fluffy and long)
+    fill_rect(bmp, sx, sy + 13, 10, 5, 1)          # Beard main body
+    fill_rect(bmp, sx + 1, sy + 18, 8, 2, 1)       # Beard mid layer
+    fill_rect(bmp, sx + 2, sy + 20, 6, 1, 1)       # Beard lower layer
+    fill_rect(bmp, sx + 3, sy + 21, 4, 1, 1)       # Beard point
+    # Beard texture and shading
+    set_pixel(bmp, sx + 2, sy + 15, 13)            # Beard highlight left
+    set_pixel(bmp, sx + 7, sy + 15, 13)            # Beard highlight right
+    set_pixel(bmp, sx + 4, sy + 16, 13)            # Beard highlight center
+    set_pixel(bmp, sx + 1, sy + 14, 7)             # Beard shadow left
+    set_pixel(bmp, sx + 8, sy + 14, 7)             # Beard shadow right
+
+
+def draw_backdrop(bmp, state, key):
+    """Static content that sits UNDER the moving/twinkling pixels"""
+    phase = key[0]
+    if phase == "santa_flying":
+        # Stars in background
+        for i, (sx, sy) in enumerate(state["stars"]):
+            if i % 3 == 0:
+                set_pixel(bmp, sx, sy, 1)
+    elif phase == "gifts_appear":
+        # Night sky, house and tree
+        for sx, sy in state["stars"]:
+            set_pixel(bmp, sx, sy, 1)
+        draw_house(bmp, 8, HEIGHT - 3)
+        draw_tree(bmp, WIDTH - 12, HEIGHT - 3)
+    elif phase == "starry_finale":
+        # Full starry sky
+        for sx, sy in state["stars"]:
+            set_pixel(bmp, sx, sy, 1)
+
+
+def draw_foreground(bmp, key):
+    """Static content that sits ON TOP of the moving/twinkling pixels"""
+    phase = key[0]
+    if phase == "cozy_house":
+        draw_house(bmp, 8, HEIGHT - 3)
+        # Christmas tree visible through window area
+        draw_tree(bmp, WIDTH - 12, HEIGHT - 3)
+    elif phase == "starry_finale":
+        # Peaceful tree silhouette
+        draw_tree(bmp, WIDTH // 2, HEIGHT - 3)
+    elif phase == "merry_christmas":
+        merry, christmas, decorations = key[1:]
+        if merry:
+            draw_text_small(bmp, "MERRY", 14, 9, 2)
+        if christmas:
+            draw_text_small(bmp, "CHRISTMAS", 2, 17, 3)
+        if decorations:
+            draw_merry_decorations(bmp)
+    # Snowy ground
+    fill_rect(bmp, 0, HEIGHT - 3, WIDTH, 3, 1)
+
+
+def scene_key_for(state, phase, elapsed):
+    """What the cached background depends on"""
+    if phase == "merry_christmas":
+        alpha = state["text_alpha"]
+        return (phase, alpha > 0.3, alpha > 0.6, elapsed > 1)
+    return (phase,)
+
+
+def build_scene(state, key):
+    """Render the static background + cover mask for key"""
+    global scene, cover, scene_key
+    release_scene()
+    scene = displayio.Bitmap(WIDTH, HEIGHT, 16)
+    draw_backdrop(scene, state, key)
+    draw_foreground(scene, key)
+    cover = displayio.Bitmap(WIDTH, HEIGHT, UNCOVERED + 1)
+    cover.fill(UNCOVERED)
+    draw_foreground(cover, key)
+    scene_key = key
+
+
+def release_scene():
+    """Drop the cached background (phase ended)"""
+    global scene, cover, scene_key
+    scene = cover = scene_key = None
+
+
+# --- Sprites (snow, sleigh, gifts) ---
+GIFT_COLORS = [2, 8, 9]  # red, pink, purple
+GIFTS_APPEAR_X = [WIDTH - 20, WIDTH - 16, WIDTH - 12]
+GIFTS_FINALE_X = [WIDTH // 2 - 8, WIDTH // 2 - 4, WIDTH // 2 + 4]
+
+
+def _snow_sheet():
+    bmp = displayio.Bitmap(1, 1, 16)
+    bmp[0, 0] = 1
+    return bmp, sprites.shader(palette)
+
+
+def _sleigh_sheet():
+    # Sleigh + reindeer span x-3..x+7, y-2..y+2 around draw_santa_sleigh's origin
+    bmp = displayio.Bitmap(11, 5, 16)
+    draw_santa_sleigh(bmp, 3, 2)
+    return bmp, sprites.shader(palette)
+
+
+def _gift_sheet():
+    # One 3x4 tile per gift color (bow row on top)
+    bmp = displayio.Bitmap(3 * len(GIFT_COLORS), 4, 16)
+    for i, color in enumerate(GIFT_COLORS):
+        draw_gift(bmp, i * 3, 1, color)
+    return bmp, sprites.shader(palette)
+
+
+if display_ok:
+    sprite_layer = sprites.SpriteLayer()
+    group.append(sprite_layer.group)
+    snow_bmp, snow_pal = sprites.sheet("christmas.snow", _snow_sheet)
+    snow_sprites = [sprite_layer.add(snow_bmp, snow_pal, z=0) for _ in range(15)]
+    sleigh_bmp, sleigh_pal = sprites.sheet("christmas.sleigh", _sleigh_sheet)
+    sleigh_sprite = sprite_layer.add(sleigh_bmp, sleigh_pal, z=1)
+    gift_bmp, gift_pal = sprites.sheet("christmas.gifts", _gift_sheet)
+    gift_sprites = [sprite_layer.add(gift_bmp, gift_pal, z=1, tile=i,
+                                     tile_width=3, tile_height=4)
+                    for i in range(len(GIFT_COLORS))]
+
+
+def place_sprites(state, phase):
+    """Move/show/hide sprites for this frame - no pixel drawing"""
+    for flake, sprite in zip(state["snowflakes"], snow_sprites):
+        sprite.x = int(flake[0])
+        sprite.y = int(flake[1])
+
+    sleigh_sprite.hidden = phase != "santa_flying"
+    if phase == "santa_flying":
+        sleigh_sprite.x = int(state["santa_x"]) - 3
+        sleigh_sprite.y = HEIGHT // 2 - 2
+
+    if phase == "gifts_appear":
+        shown, positions = state["gifts_shown"], GIFTS_APPEAR_X
+    elif phase == "starry_finale":
+        shown, positions = len(GIFT_COLORS), GIFTS_FINALE_X
+    else:
+        shown, positions = 0, None
+    for i, sprite in enumerate(gift_sprites):
+        sprite.hidden = i >= shown
+        if i < shown:
+            sprite.x = positions[i]
+            sprite.y = HEIGHT - 7
 
 
 def update_animation(state):
@@ -275,249 +492,73 @@ def update_animation(state):
     if not display_ok:
         return state
 
-    # Clear with dark night background
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            bitmap[x, y] = 0
+    # Static parts of the scene come from the cached background; only the
+    # moving/twinkling pixels are drawn per frame
+    if phase == "merry_christmas" and elapsed < 2:
+        # Fade in text effect (gradual appearance)
+        if state["frame"] % 3 == 0:
+            state["text_alpha"] = min(1, state["text_alpha"] + 0.05)
+    key = scene_key_for(state, phase, elapsed)
+    if key != scene_key:
+        build_scene(state, key)
+    copy_bitmap(bitmap, scene)
+    frame = state["frame"]
 
     # === SCENE 1: Snowy Night ===
     if phase == "snowy_night":
-        # Draw twinkling stars
+        # Twinkling stars
         for i, (sx, sy) in enumerate(state["stars"]):
-            if (state["frame"] + i * 3) % 20 < 10:
-                set_pixel(bitmap, sx, sy, 1)
-        
-        # Draw gentle snowfall
-        for flake in state["snowflakes"]:
-            x, y = int(flake[0]), int(flake[1])
-            set_pixel(bitmap, x, y, 1)
-        
-        # Ground
-        fill_rect(bitmap, 0, HEIGHT - 3, WIDTH, 3, 1)
+            if (frame + i * 3) % 20 < 10:
+                put_pixel(sx, sy, 1)
 
     # === SCENE 2: Santa Flying ===
     elif phase == "santa_flying":
-        # Stars in background
-        for i, (sx, sy) in enumerate(state["stars"]):
-            if i % 3 == 0:
-                set_pixel(bitmap, sx, sy, 1)
-        
-        # Gentle snowfall continues
-        for flake in state["snowflakes"]:
-            x, y = int(flake[0]), int(flake[1])
-            set_pixel(bitmap, x, y, 1)
-        
-        # Santa's sleigh
-        draw_santa_sleigh(bitmap, int(state["santa_x"]), HEIGHT // 2)
-        
         # Trail sparkles behind santa
         for i in range(5):
             tx = int(state["santa_x"]) - i * 3
             ty = HEIGHT // 2 - 1 + (i % 2)
-            if (state["frame"] + i) % 6 < 3:
-                set_pixel(bitmap, tx, ty, 4)
-        
-        # Snowy ground
-        fill_rect(bitmap, 0, HEIGHT - 3, WIDTH, 3, 1)
+            if (frame + i) % 6 < 3:
+                put_pixel(tx, ty, 4)
 
     # === SCENE 3: Cozy House ===
     elif phase == "cozy_house":
         # Night sky with stars
         for i, (sx, sy) in enumerate(state["stars"]):
-            if (state["frame"] + i * 2) % 15 < 8:
-                set_pixel(bitmap, sx, sy, 1)
-        
-        # Draw house
-        draw_house(bitmap, 8, HEIGHT - 3)
-        
-        # Draw Christmas tree visible through window area
-        draw_tree(bitmap, WIDTH - 12, HEIGHT - 3)
-        
-        # Gentle snow
-        for flake in state["snowflakes"]:
-            x, y = int(flake[0]), int(flake[1])
-            set_pixel(bitmap, x, y, 1)
-        
-        # Snowy ground
-        fill_rect(bitmap, 0, HEIGHT - 3, WIDTH, 3, 1)
+            if (frame + i * 2) % 15 < 8:
+                put_pixel(sx, sy, 1)
 
     # === SCENE 4: Gifts Appear ===
     elif phase == "gifts_appear":
-        # Night sky
-        for sx, sy in state["stars"]:
-            set_pixel(bitmap, sx, sy, 1)
-        
-        # Gentle snowfall continues
-        for flake in state["snowflakes"]:
-            x, y = int(flake[0]), int(flake[1])
-            set_pixel(bitmap, x, y, 1)
-        
-        # House and tree
-        draw_house(bitmap, 8, HEIGHT - 3)
-        draw_tree(bitmap, WIDTH - 12, HEIGHT - 3)
-        
-        # Gifts appearing one by one with sparkles
-        gift_colors = [2, 8, 9]  # red, pink, purple
-        gift_x_positions = [WIDTH - 20, WIDTH - 16, WIDTH - 12]
-        
-        for i in range(state["gifts_shown"]):
-            gx = gift_x_positions[i]
+        # Sparkles around newest gift (gift sprites are placed below)
+        i = state["gifts_shown"] - 1
+        if i >= 0 and state["gift_delay"] < 20 and state["sparkle_frame"] % 8 < 4:
+            gx = GIFTS_APPEAR_X[i]
             gy = HEIGHT - 6
-            draw_gift(bitmap, gx, gy, gift_colors[i])
-            
-            # Sparkles around newest gift
-            if i == state["gifts_shown"] - 1 and state["gift_delay"] < 20:
-                for dx in [-2, 2]:
-                    for dy in [-2, 2]:
-                        if state["sparkle_frame"] % 8 < 4:
-                            set_pixel(bitmap, gx + 1 + dx, gy + 1 + dy, 4)
-        
-        # Ground
-        fill_rect(bitmap, 0, HEIGHT - 3, WIDTH, 3, 1)
+            for dx in [-2, 2]:
+                for dy in [-2, 2]:
+                    put_pixel(gx + 1 + dx, gy + 1 + dy, 4)
 
     # === SCENE 5: Starry Finale ===
     elif phase == "starry_finale":
-        # Full starry sky
-        for sx, sy in state["stars"]:
-            set_pixel(bitmap, sx, sy, 1)
-        
         # Extra twinkling stars
         for i in range(10):
             tx = (i * 11 + 5) % WIDTH
             ty = (i * 7 + 10) % 20
-            if (state["frame"] + i) % 12 < 6:
-                set_pixel(bitmap, tx, ty, 4)
-        
-        # Gentle snowfall continues
-        for flake in state["snowflakes"]:
-            x, y = int(flake[0]), int(flake[1])
-            set_pixel(bitmap, x, y, 1)
-        
-        # Peaceful tree silhouette
-        draw_tree(bitmap, WIDTH // 2, HEIGHT - 3)
-        
-        # Gifts under tree
-        draw_gift(bitmap, WIDTH // 2 - 8, HEIGHT - 6, 2)
-        draw_gift(bitmap, WIDTH // 2 - 4, HEIGHT - 6, 8)
-        draw_gift(bitmap, WIDTH // 2 + 4, HEIGHT - 6, 9)
-        
-        # Snowy ground
-        fill_rect(bitmap, 0, HEIGHT - 3, WIDTH, 3, 1)
+            if (frame + i) % 12 < 6:
+                put_pixel(tx, ty, 4)
 
     # === SCENE 6: Merry Christmas Text ===
     elif phase == "merry_christmas":
         # Twinkling starry background
         for i, (sx, sy) in enumerate(state["stars"]):
-            if (state["frame"] + i * 2) % 18 < 9:
-                set_pixel(bitmap, sx, sy, 1)
-        
+            if (frame + i * 2) % 18 < 9:
+                put_pixel(sx, sy, 1)
         # Extra sparkles
         for i in range(15):
             tx = (i * 9 + 7) % WIDTH
             ty = (i * 5 + 3) % HEIGHT
-            if (state["frame"] + i * 3) % 15 < 8:
-                set_pixel(bitmap, tx, ty, 4)
-        
-        # Gentle snow
-        for flake in state["snowflakes"]:
-            x, y = int(flake[0]), int(flake[1])
-            set_pixel(bitmap, x, y, 1)
-        
-        # Fade in text effect
-        if elapsed < 2:
-            # Gradual appearance
-            if state["frame"] % 3 == 0:
-                state["text_alpha"] = min(1, state["text_alpha"] + 0.05)
-        
-        # Draw "MERRY" on top line (centered)
-        if state["text_alpha"] > 0.3:
-            draw_text_small(bitmap, "MERRY", 14, 9, 2)
-        
-        # Draw "CHRISTMAS" on bottom line (one word)
-        if state["text_alpha"] > 0.6:
-            draw_text_small(bitmap, "CHRISTMAS", 2, 17, 3)
-        
-        # Decorative elements
-        if elapsed > 1:
-            # Little trees on far sides
-            for tx in [4, WIDTH - 8]:
-                # Mini tree
-                set_pixel(bitmap, tx, HEIGHT - 4, 5)
-                set_pixel(bitmap, tx - 1, HEIGHT - 5, 3)
-                set_pixel(bitmap, tx, HEIGHT - 5, 3)
-                set_pixel(bitmap, tx + 1, HEIGHT - 5, 3)
-                set_pixel(bitmap, tx, HEIGHT - 6, 3)
-                set_pixel(bitmap, tx, HEIGHT - 7, 4)
-            
-            # Santa's face on the right side (EXTRA LARGE with maximum detail)
-            sx = WIDTH - 17
-            sy = 5
-            
-            # Red hat (large and detailed)
-            fill_rect(bitmap, sx + 1, sy, 8, 4, 2)         # Hat body red
-            fill_rect(bitmap, sx + 2, sy - 1, 6, 1, 2)     # Hat top red
-            set_pixel(bitmap, sx + 3, sy - 2, 2)           # Hat tip
-            # Hat trim (fluffy white fur)
-            fill_rect(bitmap, sx, sy + 4, 10, 2, 1)        # Hat trim white thick
-            # Large pom-pom with shading
-            fill_rect(bitmap, sx + 8, sy + 1, 3, 3, 1)     # White pom-pom
-            set_pixel(bitmap, sx + 9, sy + 2, 13)          # Pom-pom highlight
-            
-            # Face outline and main color (beige/tan - extra large)
-            fill_rect(bitmap, sx + 1, sy + 6, 8, 7, 14)    # Face main
-            
-            # Eyes (large with detail)
-            # Left eye
-            fill_rect(bitmap, sx + 2, sy + 7, 2, 3, 0)     # Left eye black
-            set_pixel(bitmap, sx + 3, sy + 7, 7)           # Left eye sparkle top
-            set_pixel(bitmap, sx + 2, sy + 8, 1)           # Left eye sparkle mid
-            # Right eye  
-            fill_rect(bitmap, sx + 6, sy + 7, 2, 3, 0)     # Right eye black
-            set_pixel(bitmap, sx + 7, sy + 7, 7)           # Right eye sparkle top
-            set_pixel(bitmap, sx + 6, sy + 8, 1)           # Right eye sparkle mid
-            
-            # Eyebrows (gray/dark)
-            fill_rect(bitmap, sx + 2, sy + 6, 2, 1, 15)    # Left eyebrow
-            fill_rect(bitmap, sx + 6, sy + 6, 2, 1, 15)    # Right eyebrow
-            
-            # Rosy cheeks (pink)
-            fill_rect(bitmap, sx + 1, sy + 9, 2, 2, 8)     # Left cheek
-            fill_rect(bitmap, sx + 7, sy + 9, 2, 2, 8)     # Right cheek
-            
-            # Nose (red, round and prominent)
-            fill_rect(bitmap, sx + 4, sy + 9, 2, 2, 2)     # Nose main
-            set_pixel(bitmap, sx + 5, sy + 9, 12)          # Nose highlight
-            
-            # Mouth (big smile)
-            fill_rect(bitmap, sx + 3, sy + 11, 4, 1, 2)    # Smile
-            set_pixel(bitmap, sx + 2, sy + 12, 2)          # Smile left curve
-            set_pixel(bitmap, sx + 7, sy + 12, 2)          # Smile right curve
-            
-            # White mustache (big and bushy)
-            fill_rect(bitmap, sx, sy + 10, 4, 2, 1)        # Left mustache
-            fill_rect(bitmap, sx + 6, sy + 10, 4, 2, 1)    # Right mustache
-            set_pixel(bitmap, sx + 1, sy + 12, 1)          # Mustache curl left
-            set_pixel(bitmap, sx + 8, sy + 12, 1)          # Mustache curl right
-            
-            # White beard (full, fluffy and long)
-            fill_rect(bitmap, sx, sy + 13, 10, 5, 1)       # Beard main body
-            fill_rect(bitmap, sx + 1, sy + 18, 8, 2, 1)    # Beard mid layer
-            fill_rect(bitmap, sx + 2, sy + 20, 6, 1, 1)    # Beard lower layer
-            fill_rect(bitmap, sx + 3, sy + 21, 4, 1, 1)    # Beard point
-            # Beard texture and shading
-            set_pixel(bitmap, sx + 2, sy + 15, 13)         # Beard highlight left
-            set_pixel(bitmap, sx + 7, sy + 15, 13)         # Beard highlight right
-            set_pixel(bitmap, sx + 4, sy + 16, 13)         # Beard highlight center
-            set_pixel(bitmap, sx + 1, sy + 14, 7)          # Beard shadow left
-            set_pixel(bitmap, sx + 8, sy + 14, 7)          # Beard shadow right
-        
-        # Ground
-        fill_rect(bitmap, 0, HEIGHT - 3, WIDTH, 3, 1)
-
-    # Manual refresh to control timing and reduce flicker
-    try:
-        display.refresh()
-    except:
-        pass
+            if (frame + i * 3) % 15 < 8:
+                put_pixel(tx, ty, 4)
 
+    place_sprites(state, phase)
     return state
\ No newline at end of file
@@ -1,28 +1,24 @@
 """
 dna.py - Rotating double helix
+
+Every frame of the helix is the previous one shifted sideways, so it is
+drawn into a scroll ring (engine.scroll): scrolling moves the picture and
+only the column that comes into view on the right is rendered.
 """
 import time
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-
-displayio.release_displays()
+from engine import color, panel, scroll
 
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+FPS = 30
+COST = "medium"
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+palette = color.Palette(8)
+scroll_ring = scroll.Ring(palette, WIDTH, HEIGHT, 8)
+bitmap = scroll_ring.bitmap
+group = scroll_ring.group
 
 palette[0] = 0x000000
 palette[1] = 0xFF0040
@@ -33,17 +29,42 @@ palette[5] = 0xFFFF00
 palette[6] = 0x8080FF
 palette[7] = 0xFFFFFF
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
-
 t = 0.0
 cy = HEIGHT / 2.0
+STEP = 0.3   # helix phase per column
+SPEED = 0.12  # helix phase per frame
+
+
+def draw_column(w):
+    """Render world column w of the helix into its ring slot"""
+    scroll_ring.clear_line(w)
+    x = scroll_ring.slot(w)
+    angle = w * STEP
+    y1 = cy + math.sin(angle) * 10
+    y2 = cy - math.sin(angle) * 10
+
+    iy1 = int(y1)
+    iy2 = int(y2)
+
+    if 0 <= iy1 < HEIGHT:
+        bitmap[x, iy1] = 1
+    if 0 <= iy2 < HEIGHT:
+        bitmap[x, iy2] = 3
+
+    # Rungs are tied to the helix, so they travel with it
+    if w % 6 == 0 and abs(y1 - y2) > 2:
+        steps = int(abs(y2 - y1))
+        for s in range(steps):
+            yy = int(y1 + (y2 - y1) * s / steps)
+            if 0 <= yy < HEIGHT:
+                bitmap[x, yy] = 7
 
 
 def init_animation():
     """Initialize animation state"""
+    scroll_ring.move_to(0)
+    for w in range(WIDTH):
+        draw_column(w)
     return {
         "t": 0.0,
         "frame": 0,
@@ -54,30 +75,10 @@ def update_animation(state):
     state["frame"] += 1
     t = state["t"]
     
-    t += 0.12
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            bitmap[x, y] = 0
-    
-    for x in range(WIDTH):
-        angle = x * 0.3 + t
-        y1 = cy + math.sin(angle) * 10
-        y2 = cy - math.sin(angle) * 10
-        
-        ix1, iy1 = int(x), int(y1)
-        ix2, iy2 = int(x), int(y2)
-        
-        if 0 <= iy1 < HEIGHT:
-            bitmap[ix1, iy1] = 1
-        if 0 <= iy2 < HEIGHT:
-            bitmap[ix2, iy2] = 3
-        
-        if x % 6 == 0 and abs(y1 - y2) > 2:
-            steps = int(abs(y2 - y1))
-            for s in range(steps):
-                yy = int(y1 + (y2 - y1) * s / steps)
-                if 0 <= yy < HEIGHT:
-                    bitmap[ix1, yy] = 7
+    t += SPEED
+    # Scroll whole columns only; draw just the ones that came into view
+    for w in scroll_ring.advance(int(t / STEP) - scroll_ring.origin):
+        draw_column(w)
     
     state["t"] = t
     return state
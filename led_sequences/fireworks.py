@@ -1,29 +1,20 @@
 """
 fireworks.py - Particle explosions with gravity and fade
+
+Sparks live in a preallocated engine.particles pool.
 """
 import time
-import random
+import array
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-
-displayio.release_displays()
+from engine import panel, particles, prng
 
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+FPS = 30
+COST = "medium"
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+bitmap, palette, group = panel.surface(8)
 
 palette[0] = 0x000000
 palette[1] = 0x200000
@@ -34,19 +25,27 @@ palette[5] = 0xFFFF00
 palette[6] = 0xFFFFFF
 palette[7] = 0x8080FF
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
+# Bursts grow with panel.SCALE; enough sparks and launches to keep the same
+# share of a bigger wall busy
+MAX_SPARKS = panel.per_area(512)
+sparks = particles.Pool(MAX_SPARKS)
 
-particles = []
+BURST = 30
+DIRECTIONS = 64
+SPEED_STEPS = 64  # speed = 0.5 + step / 32 -> 0.5 .. ~2.5 (x SCALE)
+SCALE = panel.SCALE
+LAUNCH = SCALE * SCALE / panel.per_area(1)  # launch interval factor
+COS = array.array("f", [math.cos(2 * math.pi * i / DIRECTIONS) for i in range(DIRECTIONS)])
+SIN = array.array("f", [math.sin(2 * math.pi * i / DIRECTIONS) for i in range(DIRECTIONS)])
+burst_direction = array.array("B", bytes(BURST))
+burst_speed = array.array("B", bytes(BURST))
 next_firework = 0
 
 
 def init_animation():
     """Initialize animation state"""
+    sparks.clear()
     return {
-        "particles": [],
         "next_firework": 0,
         "frame": 0,
     }
@@ -54,7 +53,6 @@ def init_animation():
 def update_animation(state):
     """Update one frame and return new state"""
     state["frame"] += 1
-    particles = state["particles"]
     next_firework = state["next_firework"]
     
     # Fade out pixels
@@ -65,31 +63,20 @@ def update_animation(state):
     
     # Trigger new fireworks
     if next_firework <= 0:
-        cx, cy = random.randint(10, WIDTH-10), random.randint(5, HEIGHT-10)
-        for i in range(30):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(0.5, 2.5)
-            particles.append([cx, cy, math.cos(angle)*speed, math.sin(angle)*speed, 6])
-        next_firework = random.randint(15, 40)
+        cx, cy = prng.randint(10, WIDTH-10), prng.randint(5, HEIGHT-10)
+        prng.fill(burst_direction, 0, DIRECTIONS - 1)
+        prng.fill(burst_speed, 0, SPEED_STEPS - 1)
+        for i in range(BURST):
+            d = burst_direction[i]
+            speed = (0.5 + burst_speed[i] / 32) * SCALE
+            sparks.spawn(cx, cy, COS[d]*speed, SIN[d]*speed, life=6)
+        next_firework = int(prng.randint(15, 40) * LAUNCH)
     
     next_firework -= 1
     
-    # Update particles
-    for p in particles[:]:
-        x, y, vx, vy, life = p
-        vy += 0.1
-        x += vx
-        y += vy
-        life -= 0.15
-        
-        if life <= 0 or x < 0 or x >= WIDTH or y < 0 or y >= HEIGHT:
-            particles.remove(p)
-        else:
-            p[0], p[1], p[3], p[4] = x, y, vy, life
-            ix, iy = int(x), int(y)
-            if 0 <= ix < WIDTH and 0 <= iy < HEIGHT:
-                bitmap[ix, iy] = max(bitmap[ix, iy], int(life))
+    # Update and draw sparks (burnt out / off-panel ones are dropped)
+    sparks.step(gravity=0.1 * SCALE, decay=0.15, width=WIDTH, height=HEIGHT)
+    sparks.plot(bitmap, source="life", brightest=True)
     
-    state["particles"] = particles
     state["next_firework"] = next_firework
     return state
@@ -1,28 +1,19 @@
 """
 game_of_life.py - Conway's Game of Life with color-coded generations
+
+The color is the cell's age. When the board settles into a still life or
+a short cycle, random cells are sprinkled in to keep it going.
 """
 import time
-import random
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-
-displayio.release_displays()
+from engine import panel, life
 
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+FPS = 30
+COST = "medium"
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+bitmap, palette, group = panel.surface(8)
 
 palette[0] = 0x000000
 palette[1] = 0x002000
@@ -33,23 +24,15 @@ palette[5] = 0x00FF00
 palette[6] = 0x80FF80
 palette[7] = 0xFFFFFF
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
-
-grid = [[0]*HEIGHT for _ in range(WIDTH)]
-for x in range(WIDTH):
-    for y in range(HEIGHT):
-        grid[x][y] = random.randint(0, 1)
-
-gen = 0
+# Rows are bit-packed ints; see engine/life.py
+world = life.Life(WIDTH, HEIGHT)
 
 
 def init_animation():
     """Initialize animation state"""
+    bitmap.fill(0)
+    world.randomize()
     return {
-        "grid": [[random.randint(0, 1) for _ in range(HEIGHT)] for _ in range(WIDTH)],
         "gen": 0,
         "frame": 0,
     }
@@ -57,41 +40,11 @@ def init_animation():
 def update_animation(state):
     """Update one frame and return new state"""
     state["frame"] += 1
-    grid = state["grid"]
-    gen = state["gen"]
-    
-    new_grid = [[0]*HEIGHT for _ in range(WIDTH)]
-    for x in range(WIDTH):
-        for y in range(HEIGHT):
-            neighbors = 0
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx, ny = (x + dx) % WIDTH, (y + dy) % HEIGHT
-                    if grid[nx][ny] > 0:
-                        neighbors += 1
-            
-            if grid[x][y] > 0:
-                new_grid[x][y] = grid[x][y] + 1 if neighbors in [2, 3] else 0
-            else:
-                new_grid[x][y] = 1 if neighbors == 3 else 0
-            
-            if new_grid[x][y] > 7:
-                new_grid[x][y] = 7
-    
-    grid = new_grid
-    for x in range(WIDTH):
-        for y in range(HEIGHT):
-            bitmap[x, y] = grid[x][y]
-    
-    gen += 1
-    if gen % 100 == 0:
-        for x in range(WIDTH):
-            for y in range(HEIGHT):
-                if random.random() < 0.05:
-                    grid[x][y] = 1
-    
-    state["grid"] = grid
-    state["gen"] = gen
+
+    # Settled into a still life / short cycle (or died out): add fresh cells
+    if world.step():
+        world.sprinkle()
+    world.draw(bitmap)
+
+    state["gen"] = world.generation
     return state
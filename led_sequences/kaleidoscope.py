@@ -1,40 +1,58 @@
 """
 kaleidoscope.py - Mirrored rotating patterns with color shifts
+
+A pixel's color depends only on 3x its angle from the centre (the pattern
+repeats every third of a turn), so the angle is cut into RAYS buckets and
+engine.symmetry bakes each pixel's bucket into the bitmap once. A frame
+is then palette writes only: one gray per bucket, read from a table of
+the color around the phase circle and rotated as time goes on - no pixel
+writes, no trigonometry.
 """
 import time
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
+from engine import panel, symmetry
 
-displayio.release_displays()
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-WIDTH = 64
-HEIGHT = 32
+FPS = 30
+COST = "light"
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+RAYS = 255                  # angle buckets; index 0 is the centre pixel
+SAMPLES = RAYS * 4          # gray table resolution around the phase circle
+TWO_PI = 2 * math.pi
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
+bitmap, palette, group = panel.surface(RAYS + 1)
 
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 256)
+cx, cy = WIDTH / 2.0, HEIGHT / 2.0
+t = 0.0
 
-palette = displayio.Palette(256)
-for i in range(256):
-    palette[i] = (i << 16) | (i << 8) | i  # grayscale
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
+def gray(phase):
+    """Brightness of the pattern at phase = 3 * (angle + t)"""
+    r = int(128 + 127 * math.sin(phase))
+    g = int(128 + 127 * math.sin(phase + 2))
+    b = int(128 + 127 * math.sin(phase + 4))
+    return (r + g + b) // 3
 
-cx, cy = WIDTH / 2.0, HEIGHT / 2.0
-t = 0.0
+
+GRAYS = bytearray(gray((i + 0.5) * TWO_PI / SAMPLES) for i in range(SAMPLES))
+
+
+def ray(x, y):
+    """Bucket of 3x the angle of (x, y) from the centre; None for the centre"""
+    dx, dy = x - cx, y - cy
+    if dx == 0 and dy == 0:
+        return None
+    phase = (3 * math.atan2(dy, dx)) % TWO_PI
+    return min(int(phase * RAYS / TWO_PI), RAYS - 1)
+
+
+rays = symmetry.IndexMap(WIDTH, HEIGHT, ray)
+rays.bake(bitmap)
+# Table offset of each orbit's bucket centre (-1: the centre, always black)
+offsets = [-1 if k is None else k * (SAMPLES // RAYS) + SAMPLES // RAYS // 2
+           for k in rays.keys]
 
 
 def init_animation():
@@ -50,19 +68,13 @@ def update_animation(state):
     t = state["t"]
     
     t += 0.06
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            dx, dy = x - cx, y - cy
-            angle = math.atan2(dy, dx) + t
-            dist = math.sqrt(dx*dx + dy*dy)
-            if dist == 0:
-                bitmap[x, y] = 0
-            else:
-                r = int(128 + 127 * math.sin(angle * 3))
-                g = int(128 + 127 * math.sin(angle * 3 + 2))
-                b = int(128 + 127 * math.sin(angle * 3 + 4))
-                color = (r + g + b) // 3
-                bitmap[x, y] = color % 256
+    shift = int(3 * t * SAMPLES / TWO_PI + 0.5)
+    for i, offset in enumerate(offsets):
+        if offset < 0:
+            palette[i] = 0
+        else:
+            v = GRAYS[(offset + shift) % SAMPLES]
+            palette[i] = (v << 16) | (v << 8) | v
     
     state["t"] = t
-    return state
\ No newline at end of file
+    return state
@@ -0,0 +1,147 @@
+"""
+life_universe.py - Game of Life in an unbounded universe (engine/hashlife.py)
+
+Unlike game_of_life (the 64x32 screen is the whole, wrapped world) the
+universe here has no edges: the panel is a viewport that follows the
+pattern and zooms out as it grows (several cells per pixel, brighter
+where denser). Options (POST /api/options):
+
+    pattern  "gun", "acorn", "r-pentomino" or "soup"
+    speed    generations per frame (1..1024)
+    zoom     "auto" or a fixed 0..8 (2**zoom cells per pixel)
+    x, y     "auto" (follow the pattern) or the universe cell to keep in
+             the middle of the panel; setting either pans the viewport
+             there and stops it re-centring on that axis
+"""
+import time
+from engine import panel, hashlife, prng
+
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 15
+COST = "heavy"
+BIT_DEPTH = 3     # few shades, every bit of CPU goes to the universe
+
+LEVELS = 8
+NODE_CAP = 6000
+MAX_ZOOM = 8
+REFIT_FRAMES = 8   # how often the viewport re-fits the pattern
+PAN_LIMIT = 1 << 24   # |x|, |y| accepted for a fixed viewport centre
+
+PATTERNS = {
+    "gun": (
+        "........................O...........",
+        "......................O.O...........",
+        "............OO......OO............OO",
+        "...........O...O....OO............OO",
+        "OO........O.....O...OO..............",
+        "OO........O...O.OO....O.O...........",
+        "..........O.....O.......O...........",
+        "...........O...O....................",
+        "............OO......................",
+    ),
+    "acorn": (".O.....", "...O...", "OO..OOO"),
+    "r-pentomino": (".OO", "OO.", ".O."),
+    "soup": None,
+}
+
+OPTIONS = {"pattern": sorted(PATTERNS), "speed": [1, 1024], "zoom": ["auto", 0, MAX_ZOOM],
+           "x": ["auto", -PAN_LIMIT, PAN_LIMIT], "y": ["auto", -PAN_LIMIT, PAN_LIMIT]}
+
+bitmap, palette, group = panel.surface(LEVELS)
+palette[0] = 0x000000
+for i in range(1, LEVELS):
+    level = 60 + 195 * i // (LEVELS - 1)
+    palette[i] = (level // 4 << 16) | (level << 8) | level // 2
+
+universe = hashlife.Universe(node_cap=NODE_CAP)
+settings = {"pattern": "gun", "speed": 1, "zoom": "auto", "x": "auto", "y": "auto"}
+
+
+def configure(options):
+    """Choose pattern/speed/zoom; returns the options now in effect"""
+    for key in options:
+        if key not in OPTIONS:
+            raise ValueError("Unknown option: %s" % key)
+    pattern = options.get("pattern", settings["pattern"])
+    speed = int(options.get("speed", settings["speed"]))
+    zoom = options.get("zoom", settings["zoom"])
+    if pattern not in PATTERNS:
+        raise ValueError("Unknown pattern: %s" % pattern)
+    if not 1 <= speed <= 1024:
+        raise ValueError("speed must be 1..1024")
+    if zoom != "auto":
+        zoom = int(zoom)
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ValueError("zoom must be auto or 0..%d" % MAX_ZOOM)
+    pan = {}
+    for axis in ("x", "y"):
+        value = options.get(axis, settings[axis])
+        if value != "auto":
+            value = int(value)
+            if not -PAN_LIMIT <= value <= PAN_LIMIT:
+                raise ValueError("%s must be auto or %d..%d" % (axis, -PAN_LIMIT, PAN_LIMIT))
+        pan[axis] = value
+    settings.update({"pattern": pattern, "speed": speed, "zoom": zoom})
+    settings.update(pan)
+    return dict(settings)
+
+
+def seed():
+    universe.clear()
+    rows = PATTERNS[settings["pattern"]]
+    if rows is None:
+        for y in range(-HEIGHT // 4, HEIGHT // 4):
+            for x in range(-WIDTH // 4, WIDTH // 4):
+                if prng.chance(96):
+                    universe.set_cell(x, y)
+        return
+    for y, row in enumerate(rows):
+        for x, c in enumerate(row):
+            if c == "O":
+                universe.set_cell(x - len(row) // 2, y - len(rows) // 2)
+
+
+def fit(state):
+    """Centre the viewport on the pattern (or the panned-to cell) and pick
+    a zoom that shows the pattern; False if even MAX_ZOOM is not enough"""
+    bounds = universe.bounds()
+    if bounds is None:
+        return True
+    x0, y0, x1, y1 = bounds
+    state["cx"] = (x0 + x1) // 2 if settings["x"] == "auto" else settings["x"]
+    state["cy"] = (y0 + y1) // 2 if settings["y"] == "auto" else settings["y"]
+    if settings["zoom"] == "auto":
+        zoom = 0
+        while (x1 - x0) >> zoom >= WIDTH - 2 or (y1 - y0) >> zoom >= HEIGHT - 2:
+            if zoom == MAX_ZOOM:
+                # Spread too far to show any more: start over
+                return False
+            zoom += 1
+        state["zoom"] = zoom
+    else:
+        state["zoom"] = settings["zoom"]
+    return True
+
+
+def init_animation():
+    """Initialize animation state"""
+    seed()
+    state = {"frame": 0, "cx": 0, "cy": 0, "zoom": 0}
+    fit(state)
+    universe.draw(bitmap, state["cx"], state["cy"], state["zoom"], LEVELS)
+    return state
+
+def update_animation(state):
+    """Update one frame and return new state"""
+    state["frame"] += 1
+    universe.advance(settings["speed"])
+    if universe.full or universe.population() == 0:
+        seed()
+    if state["frame"] % REFIT_FRAMES == 0 and not fit(state):
+        seed()
+        fit(state)
+    universe.draw(bitmap, state["cx"], state["cy"], state["zoom"], LEVELS)
+    state["generation"] = universe.generation
+    return state
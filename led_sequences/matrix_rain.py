@@ -1,28 +1,67 @@
 """
 matrix_rain.py - Falling green characters (Matrix style)
+
+MODE = "glyphs" draws real characters: the screen is a TileGrid of 4x6
+glyph cells cut from one sprite sheet that holds every glyph at every
+brightness level. A stream only rewrites the few cells where its trail
+changes brightness (head, neck, tail end, cleared cell), so a frame costs
+a handful of tile index writes per stream, whatever the panel size.
+
+MODE = "pixels" is the original per-pixel rain with a full-bitmap fade.
 """
 import time
-import random
-import board
 import displayio
-import framebufferio
-import rgbmatrix
+from engine import color, panel, prng
+
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 30
+COST = "medium"
 
-displayio.release_displays()
+MODE = "glyphs"  # "glyphs" or "pixels"
 
-WIDTH = 64
-HEIGHT = 32
+# --- Glyph mode layout ---
+GLYPH_W = 4   # 3x5 character + 1px gap
+GLYPH_H = 6
+LEVELS = 8    # brightness variants per glyph = palette indexes 0..7
+COLS = WIDTH // GLYPH_W
+ROWS = (HEIGHT + GLYPH_H - 1) // GLYPH_H
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+# 3x5 katakana-ish shapes and digits
+GLYPHS = [
+    ("111", "001", "011", "001", "110"),
+    ("101", "101", "001", "010", "100"),
+    ("111", "010", "111", "010", "010"),
+    ("100", "111", "100", "100", "011"),
+    ("111", "001", "001", "010", "100"),
+    ("010", "111", "010", "110", "010"),
+    ("110", "001", "111", "001", "110"),
+    ("101", "111", "001", "001", "001"),
+    ("111", "101", "101", "101", "111"),
+    ("010", "110", "010", "010", "111"),
+    ("011", "100", "111", "101", "111"),
+    ("111", "100", "110", "001", "110"),
+]
+GLYPH_COUNT = len(GLYPHS)
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
+if MODE == "glyphs":
+    # Tile index = level * GLYPH_COUNT + glyph; level 0 is blank
+    palette = color.Palette(LEVELS)
+    glyph_sheet = displayio.Bitmap(GLYPH_COUNT * GLYPH_W, LEVELS * GLYPH_H, LEVELS)
+    for level in range(1, LEVELS):
+        for g, rows in enumerate(GLYPHS):
+            for gy, row in enumerate(rows):
+                for gx, bit in enumerate(row):
+                    if bit == "1":
+                        glyph_sheet[g * GLYPH_W + gx, level * GLYPH_H + gy] = level
+    cells = displayio.TileGrid(glyph_sheet, pixel_shader=color.shader(palette), width=COLS, height=ROWS,
+                               tile_width=GLYPH_W, tile_height=GLYPH_H)
+    group = displayio.Group()
+    group.append(cells)
+    bitmap = None
+else:
+    bitmap, palette, group = panel.surface(8)
 
 palette[0] = 0x000000
 palette[1] = 0x001000
@@ -33,43 +72,105 @@ palette[5] = 0x00C000
 palette[6] = 0x00FF00
 palette[7] = 0xFFFFFF
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
-
 streams = []
 for x in range(WIDTH):
-    if random.random() < 0.3:
-        streams.append([x, random.randint(-20, 0), random.uniform(0.5, 1.2), 
-                       random.randint(5, 15)])
+    if prng.chance(77):
+        streams.append([x, prng.randint(-20, 0), prng.randint(50, 120) / 100,
+                       prng.randint(5, 15)])
+
 
 def init_animation():
     """Initialize animation state"""
+    if MODE == "glyphs":
+        for row in range(ROWS):
+            for col in range(COLS):
+                cells[col, row] = 0
+        columns = []
+        for col in range(COLS):
+            column = [0, 0, 0, 0, 0]
+            respawn(column)
+            columns.append(column)
+        return {"frame": 0, "columns": columns}
     return {
         "frame": 0,
         "streams": streams.copy() if streams else [],
     }
 
-def update_animation(state):
-    """Update one frame and return new state"""
-    state["frame"] += 1
-    
+
+# --- Glyph mode ---
+# column = [head (float row), speed (rows/frame), length (cells),
+#           delay (frames before it starts), drawn (last head row drawn)]
+
+def respawn(column):
+    """Start a new stream in a column after a random pause"""
+    column[0] = -1.0
+    column[1] = prng.randint(80, 200) / 1000
+    column[2] = prng.randint(3, max(4, ROWS))
+    column[3] = prng.randint(0, 90)
+    column[4] = -1
+
+
+def trail_level(d, length):
+    """Brightness of the cell d rows above the head"""
+    if d == 0:
+        return 7
+    if d >= length:
+        return 0
+    if d == length - 1:
+        return 2
+    if d == 1:
+        return 6
+    return 4
+
+
+def set_cell(col, row, level, glyph=None):
+    if 0 <= row < ROWS:
+        if glyph is None:
+            glyph = cells[col, row] % GLYPH_COUNT
+        cells[col, row] = level * GLYPH_COUNT + glyph
+
+
+def advance(col, head, length):
+    """Head moved down one row: only cells on a brightness boundary change"""
+    set_cell(col, head, 7, prng.below(GLYPH_COUNT))
+    for d in (1, 2, length - 1, length):
+        set_cell(col, head - d, trail_level(d, length))
+
+
+def update_glyphs(state):
+    for col, column in enumerate(state["columns"]):
+        if column[3] > 0:
+            column[3] -= 1
+            continue
+        column[0] += column[1]
+        while column[4] < int(column[0]):
+            column[4] += 1
+            advance(col, column[4], column[2])
+        if column[4] - column[2] >= ROWS:
+            respawn(column)
+        elif 0 <= column[4] < ROWS and prng.chance(51):
+            # Head character keeps changing
+            set_cell(col, column[4], 7, prng.below(GLYPH_COUNT))
+
+
+# --- Pixel mode ---
+
+def update_pixels(state):
     # Fade out all pixels
     for y in range(HEIGHT):
         for x in range(WIDTH):
             if bitmap[x, y] > 0:
                 bitmap[x, y] = max(0, bitmap[x, y] - 1)
-    
+
     # Update streams
     for s in streams:
         x, y, speed, length = s
         y += speed
-        
+
         if y > HEIGHT + length:
-            s[1] = random.randint(-20, -5)
-            s[2] = random.uniform(0.5, 1.2)
-            s[3] = random.randint(5, 15)
+            s[1] = prng.randint(-20, -5)
+            s[2] = prng.randint(50, 120) / 100
+            s[3] = prng.randint(5, 15)
         else:
             s[1] = y
             for i in range(length):
@@ -81,11 +182,19 @@ def update_animation(state):
                         bitmap[x, yy] = 6
                     else:
                         bitmap[x, yy] = max(bitmap[x, yy], 5 - i // 2)
-    
+
     # Maybe add new stream
-    if len(streams) < WIDTH * 0.4 and random.random() < 0.1:
-        x = random.randint(0, WIDTH-1)
-        streams.append([x, random.randint(-10, 0), random.uniform(0.5, 1.2),
-                       random.randint(5, 15)])
-    
+    if len(streams) < WIDTH * 0.4 and prng.chance(26):
+        x = prng.randint(0, WIDTH-1)
+        streams.append([x, prng.randint(-10, 0), prng.randint(50, 120) / 100,
+                       prng.randint(5, 15)])
+
+
+def update_animation(state):
+    """Update one frame and return new state"""
+    state["frame"] += 1
+    if MODE == "glyphs":
+        update_glyphs(state)
+    else:
+        update_pixels(state)
     return state
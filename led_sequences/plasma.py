@@ -1,44 +1,73 @@
 """
 plasma.py - Flowing colorful plasma waves
 Classic demo-scene effect using sine/cosine math to create hypnotic patterns.
+
+The rainbow is ordered-dithered (engine/dither.py): each of its 64 colors
+takes four palette entries, one per cell of a 2x2 Bayer tile, so at the
+panel's 4-bit depth neighbouring pixels mix the two nearest levels and
+the gradient has no visible bands.
+
+MODE = "true_color" draws on an RGB565 surface instead (panel.TRUE_COLOR):
+each pixel takes one of 256 rainbow colors from a lookup table of
+pixel values, with twice the bitmap memory and no palette.
 """
 import time
 import math
-import board
-import displayio
-import framebufferio
-import rgbmatrix
+import array
+from engine import color, dither, panel
+
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-displayio.release_displays()
+FPS = 30
+COST = "heavy"
 
-WIDTH = 64
-HEIGHT = 32
+MODE = "dither"  # "dither" (palette) or "true_color" (RGB565)
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+COLORS = 64
+CELLS = 4                      # 2x2 dither tile: palette entry = color * 4 + cell
+TRUE_COLORS = 256              # rainbow steps in true-color mode
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 256)
-palette = displayio.Palette(256)
+# Wave frequencies per pixel, lower on bigger walls so the waves keep
+# their size relative to the picture
+FX = 0.1 / panel.SCALE
+FY = 0.15 / panel.SCALE
+FXY = 0.08 / panel.SCALE
 
-# Build rainbow palette
-for i in range(256):
+
+def rainbow(i):
+    """0xRRGGBB of rainbow position i, 0..255"""
     if i < 85:
         r, g, b = i * 3, 255 - i * 3, 0
     elif i < 170:
         r, g, b = 255 - (i - 85) * 3, 0, (i - 85) * 3
     else:
         r, g, b = 0, (i - 170) * 3, 255 - (i - 170) * 3
-    palette[i] = (r << 16) | (g << 8) | b
+    return (r << 16) | (g << 8) | b
+
 
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
+if MODE == "true_color":
+    bitmap, palette, group = panel.surface(panel.TRUE_COLOR)
+    pixels = array.array("H", [0] * TRUE_COLORS)
+    pixels_generation = None
+else:
+    bitmap, palette, group = panel.surface(COLORS * CELLS)
+    palette.set_dither(dither.Ordered(2))
+    CODES = palette.dither.rows
+
+    # Build rainbow palette
+    for c in range(COLORS):
+        rgb = rainbow(c * 255 // (COLORS - 1))
+        for cell in range(CELLS):
+            palette[c * CELLS + cell] = rgb
+
+
+def build_pixels():
+    """Rainbow as RGB565 pixel values at the current color correction"""
+    global pixels_generation
+    for i in range(TRUE_COLORS):
+        pixels[i] = color.rgb565(rainbow(i))
+    pixels_generation = color.generation
 
 t = 0.0
 
@@ -55,12 +84,22 @@ def update_animation(state):
     t = state["t"]
     
     t += 0.05
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            v = math.sin(x * 0.1 + t) + math.sin(y * 0.15 - t * 0.5)
-            v += math.sin((x + y) * 0.08 + t * 0.3)
-            v = (v + 3.0) / 6.0
-            bitmap[x, y] = int(v * 255) % 256
+    if MODE == "true_color":
+        if pixels_generation != color.generation:
+            build_pixels()
+        for y in range(HEIGHT):
+            for x in range(WIDTH):
+                v = math.sin(x * FX + t) + math.sin(y * FY - t * 0.5)
+                v += math.sin((x + y) * FXY + t * 0.3)
+                bitmap[x, y] = pixels[int((v + 3.0) * ((TRUE_COLORS - 1) / 6.0))]
+    else:
+        for y in range(HEIGHT):
+            codes = CODES[y & 1]
+            for x in range(WIDTH):
+                v = math.sin(x * FX + t) + math.sin(y * FY - t * 0.5)
+                v += math.sin((x + y) * FXY + t * 0.3)
+                v = (v + 3.0) / 6.0
+                bitmap[x, y] = (int(v * (COLORS - 1)) << 2) | codes[x & 1]
     
     state["t"] = t
     return state
@@ -1,80 +1,85 @@
 """
 rain.py - Falling rain droplets with trails
+
+Drops live in a preallocated engine.particles pool (vy = fall speed),
+integrated and drawn by the pool. A trail is the pixels a drop passed in
+the last TRAIL frames, brightest where it is now. Instead of fading every
+pixel each frame, a drop writes the current frame's stamp (1..STAMPS,
+cycling) and the palette maps each stamp to the brightness of its age:
+fading the whole panel is TRAIL + 1 palette writes. Pixels whose stamp has
+gone dark are cleared a few rows per frame, before the value comes round
+again.
 """
 import time
-import random
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-
-displayio.release_displays()
-
-WIDTH = 64
-HEIGHT = 32
-
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
-
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-bitmap = displayio.Bitmap(WIDTH, HEIGHT, 8)
-palette = displayio.Palette(8)
-
-palette[0] = 0x000010
-palette[1] = 0x001040
-palette[2] = 0x003080
-palette[3] = 0x0060C0
-palette[4] = 0x00A0FF
-palette[5] = 0x40D0FF
-palette[6] = 0x80F0FF
-palette[7] = 0xFFFFFF
-
-tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-group = displayio.Group()
-group.append(tg)
-display.root_group = group
-
-drops = []
-for i in range(40):
-    drops.append([random.randint(0, WIDTH-1), random.randint(-10, HEIGHT-1), 
-                  random.uniform(0.8, 1.5)])
+from engine import panel, particles, prng
+
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 30
+COST = "medium"
+
+STAMPS = 15   # bitmap values 1..STAMPS (0 = never rained on)
+TRAIL = 7     # frames a pixel stays lit after a drop passed
+
+BACKGROUND = 0x000010
+# Color of a pixel by age in frames (0 = the drop itself)
+RAMP = (0xFFFFFF, 0x80F0FF, 0x40D0FF, 0x00A0FF, 0x0060C0, 0x003080, 0x001040)
+
+bitmap, palette, group = panel.surface(STAMPS + 1)
+
+# Every row is swept at least once while a stamp is dark, so it is cleared
+# before it would light up again
+SWEEP_ROWS = -(-HEIGHT // (STAMPS - TRAIL))
+
+NUM_DROPS = panel.per_area(40)
+drops = particles.Pool(NUM_DROPS)
+
+
+def fall_speed():
+    return prng.randint(80, 150) / 100
 
 
 def init_animation():
     """Initialize animation state"""
+    bitmap.fill(0)
+    for i in range(STAMPS + 1):
+        palette[i] = BACKGROUND
+    drops.clear()
+    for _ in range(NUM_DROPS):
+        drops.spawn(prng.randint(0, WIDTH-1), prng.randint(-10, HEIGHT-1),
+                    vy=fall_speed(), color=7)
     return {
-        "drops": [[random.randint(0, WIDTH-1), random.randint(-10, HEIGHT-1), random.uniform(0.8, 1.5)] for _ in range(40)],
         "frame": 0,
+        "sweep": 0,
     }
 
 def update_animation(state):
     """Update one frame and return new state"""
     state["frame"] += 1
-    drops = state["drops"]
-    
-    # fade trails
-    for y in range(HEIGHT):
+    stamp = state["frame"] % STAMPS + 1
+
+    # fade trails: every stamp one frame older
+    for age in range(TRAIL + 1):
+        palette[(stamp - 1 - age) % STAMPS + 1] = RAMP[age] if age < TRAIL else BACKGROUND
+
+    # move drops: ones that reach the bottom start again at the top
+    drops.step()
+    xs, ys, speeds = drops.x, drops.y, drops.vy
+    for i in range(drops.count):
+        if ys[i] >= HEIGHT:
+            xs[i] = prng.randint(0, WIDTH-1)
+            ys[i] = prng.randint(-5, 0)
+            speeds[i] = fall_speed()
+    drops.plot(bitmap, value=stamp)
+
+    # clear dark stamps in the next few rows
+    top = state["sweep"]
+    for y in range(top, min(top + SWEEP_ROWS, HEIGHT)):
         for x in range(WIDTH):
-            if bitmap[x, y] > 0:
-                bitmap[x, y] = max(0, bitmap[x, y] - 1)
-    
-    # update drops
-    for d in drops:
-        x, y, speed = d
-        y += speed
-        if y >= HEIGHT:
-            d[0] = random.randint(0, WIDTH-1)
-            d[1] = random.randint(-5, 0)
-            d[2] = random.uniform(0.8, 1.5)
-        else:
-            d[1] = y
-            ix, iy = int(x), int(y)
-            if 0 <= ix < WIDTH and 0 <= iy < HEIGHT:
-                bitmap[ix, iy] = 7
-    
-    state["drops"] = drops
+            v = bitmap[x, y]
+            if v and (stamp - v) % STAMPS >= TRAIL:
+                bitmap[x, y] = 0
+    state["sweep"] = top + SWEEP_ROWS if top + SWEEP_ROWS < HEIGHT else 0
+
     return state
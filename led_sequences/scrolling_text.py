@@ -1,54 +1,45 @@
 """
 scrolling_text.py - Smooth pixel-perfect scrolling text
+
+A streaming ticker (engine/ticker.py): messages pushed with
+POST /api/ticker scroll through in order, then TEXT repeats. Only the
+glyph columns entering on the right are drawn each frame, so any message
+length costs the same memory.
 """
 import time
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-from adafruit_display_text import label
 import terminalio
+from engine import color, panel, ticker
 
-displayio.release_displays()
-
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
 
-matrix = rgbmatrix.RGBMatrix(
-    width=WIDTH, height=HEIGHT, bit_depth=4,
-    rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-              board.MTX_R2, board.MTX_G2, board.MTX_B2],
-    addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-    clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+FPS = 30
+COST = "light"
 
-display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
+TEXT = "Hello World! CircuitPython rocks!"
+SPEED = 1  # pixels per frame
 
-text = "  Hello World! CircuitPython rocks!  "
-text_area = label.Label(terminalio.FONT, text=text, color=0x00FF00)
-text_area.x = WIDTH
-text_area.y = HEIGHT // 2
+palette = color.Palette(2)
+palette[0] = 0x000000
+palette[1] = 0x00FF00
 
-group = displayio.Group()
-group.append(text_area)
-display.root_group = group
+if ticker.loop_text is None:
+    ticker.set_loop(TEXT)
+tape = ticker.Ticker(palette, WIDTH, HEIGHT, ticker.BuiltinFont(terminalio.FONT))
+group = tape.group
+scroll_ring = tape.ring
 
 
 def init_animation():
     """Initialize animation state"""
+    tape.reset()
     return {
-        "x": WIDTH,
         "frame": 0,
     }
 
 def update_animation(state):
     """Update one frame and return new state"""
     state["frame"] += 1
-    x = state["x"]
-    
-    text_area.x = x
-    x -= 1
-    if x < -len(text) * 6:
-        x = WIDTH
-    
-    state["x"] = x
+    tape.advance(SPEED)
+    state["text"] = tape.text
     return state
@@ -9,33 +9,27 @@ This is intentionally generic and avoids copyrighted material.
 """
 print("Strange things starting")
 import time
-import random
-import board
-import displayio
-import framebufferio
-import rgbmatrix
+import array
+from engine import panel, prng
 
-WIDTH = 64
-HEIGHT = 32
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 30
+COST = "medium"
+
+STATIC = panel.per_area(50)  # static pixels per frame
+
+# Batches of random coordinates/levels, refilled in place every frame
+static_x = array.array("H", bytes(2 * STATIC))
+static_y = array.array("H", bytes(2 * STATIC))
+static_v = array.array("H", bytes(2 * STATIC))
 
 try:
     print("Setting up display")
-    displayio.release_displays()
-    matrix = rgbmatrix.RGBMatrix(
-        width=WIDTH, height=HEIGHT, bit_depth=4,
-        rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                  board.MTX_R2, board.MTX_G2, board.MTX_B2],
-        addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-        clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
-    display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-    bitmap = displayio.Bitmap(WIDTH, HEIGHT, 256)
-    palette = displayio.Palette(256)
+    bitmap, palette, group = panel.surface(256)
     for i in range(256):
         palette[i] = (i, 0, 0)  # red
-    tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-    group = displayio.Group()
-    group.append(tg)
-    display.root_group = group
     print("Display setup done")
     display_ok = True
 except Exception as e:
@@ -61,15 +55,14 @@ def update_animation(state):
     
     if display_ok:
         # Clear
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                bitmap[x, y] = 0
+        bitmap.fill(0)
         
         # Add some red static
-        for i in range(50):
-            x = random.randint(0, WIDTH-1)
-            y = random.randint(0, HEIGHT-1)
-            bitmap[x, y] = random.randint(100, 255)
+        prng.fill(static_x, 0, WIDTH-1)
+        prng.fill(static_y, 0, HEIGHT-1)
+        prng.fill(static_v, 100, 255)
+        for i in range(STATIC):
+            bitmap[static_x[i], static_y[i]] = static_v[i]
     
     t += 0.1
     state["t"] = t
@@ -2,26 +2,10 @@ import microcontroller
 import supervisor
 import board
 
-# List of available animations
-ANIMATIONS = [
-    "bouncing_balls",
-    "breathing",
-    "cap-shield",
-    "dna",
-    "fireworks",
-    "game_of_life",
-    "ironman",
-    "kaleidoscope",
-    "matrix_rain",
-    "moving-lines",
-    "plasma",
-    "rain",
-    "scrolling_text",
-    "warp",
-    "strange_things",
-    "christmas",
-    "tetris",
-]
+from engine import manifest
+
+# List of available animations (manifest order = NVM index order)
+ANIMATIONS = manifest.names(manifest.load()[1])
 
 # Get current index
 current_index = microcontroller.nvm[0]
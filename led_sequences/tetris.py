@@ -1,81 +1,154 @@
 """
-tetris.py - Tetris-inspired animation with falling blocks
+tetris.py - Tetris played by an autoplayer (engine/tetris.py)
+
+A 10-wide well on a row-bitmask board. While a new piece hangs at the top
+the planner searches every rotation/column for it a few milliseconds per
+frame; then the piece rotates, slides over and drops. Only the rows that
+changed (board rows touched by a lock or line clear, and the rows the
+falling piece left or entered) are redrawn. When the well fills up it
+starts over.
 """
-print("Tetris starting")
 import time
-import random
-import board
-import displayio
-import framebufferio
-import rgbmatrix
-
-WIDTH = 64
-HEIGHT = 32
-
-try:
-    print("Setting up display")
-    displayio.release_displays()
-    matrix = rgbmatrix.RGBMatrix(
-        width=WIDTH, height=HEIGHT, bit_depth=4,
-        rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                  board.MTX_R2, board.MTX_G2, board.MTX_B2],
-        addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
-        clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
-    display = framebufferio.FramebufferDisplay(matrix, auto_refresh=True)
-    bitmap = displayio.Bitmap(WIDTH, HEIGHT, 256)
-    palette = displayio.Palette(256)
-    for i in range(256):
-        palette[i] = (min(255, i*3), min(255, i*2), 0)  # yellow-green
-    tg = displayio.TileGrid(bitmap, pixel_shader=palette)
-    group = displayio.Group()
-    group.append(tg)
-    display.root_group = group
-    print("Display setup done")
-    display_ok = True
-except Exception as e:
-    print(f"Display setup failed: {e}")
-    display_ok = False
-
-blocks = []
-colors = [50, 100, 150, 200]  # different shades
-
-print("Starting animation loop")
+from engine import panel, prng, tetris
+
+WIDTH = panel.WIDTH
+HEIGHT = panel.HEIGHT
+
+FPS = 30
+COST = "medium"
+
+CELL = 2 * panel.SCALE         # pixels per cell
+COLS = 10
+ROWS = HEIGHT // CELL
+WELL_X = (WIDTH - COLS * CELL) // 2
+THINK_MS = 4                   # planner budget per frame
+FALL_FRAMES = 6                # gravity while planning
+WALL = 8
+PREVIEW_X = WELL_X + COLS * CELL + 2 * CELL
+PREVIEW_Y = CELL
+
+bitmap, palette, group = panel.surface(16)
+palette[0] = 0x000000
+palette[1] = 0x00FFFF  # I
+palette[2] = 0xFFFF00  # O
+palette[3] = 0xA000FF  # T
+palette[4] = 0x00FF00  # S
+palette[5] = 0xFF0000  # Z
+palette[6] = 0xFF8000  # L
+palette[7] = 0x0000FF  # J
+palette[WALL] = 0x303030
+
+board = tetris.Board(COLS, ROWS)
+planner = tetris.Planner(board)
+
+
+def fill_cell(x, y, value):
+    px, py = WELL_X + x * CELL, y * CELL
+    for dy in range(CELL):
+        for dx in range(CELL):
+            bitmap[px + dx, py + dy] = value
+
+
+def piece_rows(state):
+    """Bitmask of the rows the active piece covers"""
+    masks = tetris.PIECES[state["piece"]][state["rot"]][0]
+    return ((1 << len(masks)) - 1) << state["y"]
+
+
+def draw_rows(state, rows):
+    """Redraw the given rows (bitmask) of the well, piece included"""
+    masks = tetris.PIECES[state["piece"]][state["rot"]][0]
+    py, px, color = state["y"], state["x"], state["piece"] + 1
+    y = 0
+    while rows:
+        if rows & 1:
+            piece = masks[y - py] << px if 0 <= y - py < len(masks) else 0
+            for x in range(COLS):
+                fill_cell(x, y, color if piece >> x & 1 else board.color(x, y))
+        rows >>= 1
+        y += 1
+
+
+def draw_preview(piece):
+    masks = tetris.PIECES[piece][0][0]
+    for y in range(2 * CELL):
+        for x in range(4 * CELL):
+            bitmap[PREVIEW_X + x, PREVIEW_Y + y] = 0
+    for y, m in enumerate(masks):
+        for x in range(4):
+            if m >> x & 1:
+                for dy in range(CELL):
+                    for dx in range(CELL):
+                        bitmap[PREVIEW_X + x * CELL + dx, PREVIEW_Y + y * CELL + dy] = piece + 1
+
+
+def spawn(state):
+    """Bring in the next piece; start over if it doesn't fit"""
+    state["piece"] = state["next"]
+    state["next"] = prng.below(len(tetris.PIECES))
+    masks, width = tetris.PIECES[state["piece"]][0]
+    state["rot"], state["x"], state["y"] = 0, (COLS - width) // 2, 0
+    if not board.fits(masks, state["x"], 0):
+        board.clear()
+    planner.start(state["piece"])
+    state["phase"] = "plan"
+    draw_preview(state["next"])
+
 
 def init_animation():
     """Initialize animation state"""
-    return {
-        "blocks": [],
-        "frame": 0,
-    }
+    bitmap.fill(0)
+    for y in range(HEIGHT):
+        bitmap[WELL_X - 1, y] = WALL
+        bitmap[WELL_X + COLS * CELL, y] = WALL
+    board.clear()
+    state = {"frame": 0, "next": prng.below(len(tetris.PIECES))}
+    spawn(state)
+    return state
+
+
+def try_move(state, rot, x, y):
+    masks = tetris.PIECES[state["piece"]][rot][0]
+    if board.fits(masks, x, y):
+        state["rot"], state["x"], state["y"] = rot, x, y
+        return True
+    return False
+
 
 def update_animation(state):
     """Update one frame and return new state"""
     state["frame"] += 1
-    blocks = state["blocks"]
-    
-    if display_ok:
-        # Clear
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                bitmap[x, y] = 0
-        
-        # Add new block occasionally
-        if random.random() < 0.1 and len(blocks) < 10:
-            blocks.append([random.randint(0, WIDTH-4), 0, random.choice(colors), random.randint(2, 4)])
-        
-        # Update blocks
-        new_blocks = []
-        for block in blocks:
-            block[1] += 1  # fall
-            if block[1] + block[3] < HEIGHT:
-                new_blocks.append(block)
-            # Draw block
-            for bx in range(block[3]):
-                for by in range(block[3]):
-                    ix, iy = block[0] + bx, block[1] + by
-                    if 0 <= ix < WIDTH and 0 <= iy < HEIGHT:
-                        bitmap[ix, iy] = block[2]
-        blocks = new_blocks
-    
-    state["blocks"] = blocks
-    return state
\ No newline at end of file
+    dirty = piece_rows(state)
+    phase = state["phase"]
+
+    if phase == "plan":
+        if planner.think(THINK_MS):
+            state["phase"] = "move"
+        elif state["frame"] % FALL_FRAMES == 0:
+            try_move(state, state["rot"], state["x"], state["y"] + 1)
+    elif phase == "move":
+        target = planner.best
+        if target is None:
+            state["phase"] = "drop"
+        else:
+            rot, x = target
+            turns = len(tetris.PIECES[state["piece"]])
+            moved = False
+            if state["rot"] != rot:
+                moved = try_move(state, (state["rot"] + 1) % turns, state["x"], state["y"])
+            elif state["x"] != x:
+                step = 1 if x > state["x"] else -1
+                moved = try_move(state, rot, state["x"] + step, state["y"])
+            if not moved:
+                # There, or blocked on the way: drop from here
+                state["phase"] = "drop"
+    elif not try_move(state, state["rot"], state["x"], state["y"] + 1):
+        masks = tetris.PIECES[state["piece"]][state["rot"]][0]
+        board.place(masks, state["x"], state["y"], state["piece"] + 1)
+        spawn(state)
+
+    dirty |= piece_rows(state) | board.dirty
+    board.dirty = 0
+    draw_rows(state, dirty)
+    state["lines"] = board.lines
+    return state
@@ -0,0 +1,132 @@
+"""
+conftest.py - Host setup for the tests
+
+Puts the repo root on sys.path so the engine and sequences import from
+anywhere, and, when displayio is not installed, provides a small
+pure-Python one: enough of Bitmap, Palette, TileGrid, Group and
+ColorConverter for sequences to build their surfaces and draw into them.
+Nothing is shown; tests read the bitmaps back.
+
+The repo's code.py still shadows the standard library's `code` whenever
+the root is on sys.path first (`python -m pytest`, or pytest started in
+the root). Only pdb imports `code` here, so pytest.ini turns the
+debugging plugin off (`-p no:debugging`): --pdb is unavailable.
+"""
+import os
+import sys
+import types
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self.pixels = [0] * (width * height)
+
+    def __getitem__(self, xy):
+        x, y = xy
+        return self.pixels[y * self.width + x]
+
+    def __setitem__(self, xy, value):
+        x, y = xy
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("pixel (%d, %d) outside %dx%d" % (x, y, self.width, self.height))
+        if not 0 <= value < self.value_count:
+            raise ValueError("value %d out of range" % value)
+        self.pixels[y * self.width + x] = value
+
+    def fill(self, value):
+        self.pixels = [value] * (self.width * self.height)
+
+    def blit(self, x, y, source, *, x1=0, y1=0, x2=None, y2=None, skip_index=None):
+        x2 = source.width if x2 is None else x2
+        y2 = source.height if y2 is None else y2
+        for sy in range(y1, y2):
+            for sx in range(x1, x2):
+                value = source[sx, sy]
+                if value != skip_index:
+                    self[x + sx - x1, y + sy - y1] = value
+
+
+class Palette:
+    def __init__(self, color_count):
+        self.colors = [0] * color_count
+        self.transparent = set()
+
+    def __len__(self):
+        return len(self.colors)
+
+    def __getitem__(self, index):
+        return self.colors[index]
+
+    def __setitem__(self, index, rgb):
+        if isinstance(rgb, tuple):
+            rgb = (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]
+        self.colors[index] = rgb
+
+    def make_transparent(self, index):
+        self.transparent.add(index)
+
+    def make_opaque(self, index):
+        self.transparent.discard(index)
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1, tile_width=None,
+                 tile_height=None, default_tile=0, x=0, y=0):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width or bitmap.width
+        self.tile_height = tile_height or bitmap.height
+        self.tiles = [default_tile] * (width * height)
+        self.x = x
+        self.y = y
+        self.flip_x = False
+        self.flip_y = False
+        self.transpose_xy = False
+        self.hidden = False
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        return self.tiles[index]
+
+    def __setitem__(self, index, tile):
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        self.tiles[index] = tile
+
+
+class Group(list):
+    def __init__(self, *, scale=1, x=0, y=0):
+        super().__init__()
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+class Colorspace:
+    RGB888 = 0
+    RGB565 = 1
+
+
+class ColorConverter:
+    def __init__(self, *, input_colorspace=Colorspace.RGB888, dither=False):
+        self.input_colorspace = input_colorspace
+        self.dither = dither
+
+
+try:
+    import displayio  # noqa: F401
+except ImportError:
+    displayio = types.ModuleType("displayio")
+    for value in (Bitmap, Palette, TileGrid, Group, Colorspace, ColorConverter):
+        setattr(displayio, value.__name__, value)
+    displayio.release_displays = lambda: None
+    sys.modules["displayio"] = displayio
@@ -0,0 +1,109 @@
+"""
+test_hashlife.py - engine.hashlife against a naive set-based Life step
+
+Run from the repo root:  pytest -q
+"""
+from engine import hashlife
+
+GLIDER = (".O.", "..O", "OOO")
+ACORN = (".O.....", "...O...", "OO..OOO")
+GUN = (
+    "........................O...........",
+    "......................O.O...........",
+    "............OO......OO............OO",
+    "...........O...O....OO............OO",
+    "OO........O.....O...OO..............",
+    "OO........O...O.OO....O.O...........",
+    "..........O.....O.......O...........",
+    "...........O...O....................",
+    "............OO......................",
+)
+
+
+def cells_of(rows):
+    """Live cells of a pattern, centred on (0, 0)"""
+    x0, y0 = -(len(rows[0]) // 2), -(len(rows) // 2)
+    return {(x0 + x, y0 + y) for y, row in enumerate(rows) for x, c in enumerate(row) if c == "O"}
+
+
+def step(cells):
+    """One generation of B3/S23 on a set of live cells"""
+    counts = {}
+    for x, y in cells:
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx or dy:
+                    p = (x + dx, y + dy)
+                    counts[p] = counts.get(p, 0) + 1
+    return {p for p, n in counts.items() if n == 3 or (n == 2 and p in cells)}
+
+
+def universe_of(cells, node_cap=6000):
+    universe = hashlife.Universe(node_cap=node_cap)
+    for x, y in cells:
+        universe.set_cell(x, y)
+    return universe
+
+
+def live(universe):
+    """Live cells of a universe, read back through bounds() and get_cell()"""
+    box = universe.bounds()
+    if box is None:
+        return set()
+    x0, y0, x1, y1 = box
+    return {(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1) if universe.get_cell(x, y)}
+
+
+def check(rows, jumps, node_cap=6000):
+    cells = cells_of(rows)
+    universe = universe_of(cells, node_cap)
+    for jump in jumps:
+        universe.advance(jump)
+        for _ in range(jump):
+            cells = step(cells)
+        assert universe.population() == len(cells)
+        assert live(universe) == cells
+    assert universe.generation == sum(jumps)
+    return universe
+
+
+def test_set_and_get():
+    cells = cells_of(GUN)
+    assert live(universe_of(cells)) == cells
+
+
+def test_glider():
+    check(GLIDER, [1] * 40)
+
+
+def test_gosper_gun():
+    check(GUN, [1] * 60 + [30] * 3)
+
+
+def test_acorn():
+    check(ACORN, [1] * 20 + [16] * 10)
+
+
+def test_uneven_jumps():
+    jumps = [1, 3, 7, 13, 2, 29, 64, 5, 100]
+    check(GLIDER, jumps)
+    check(GUN, jumps)
+    check(ACORN, jumps)
+
+
+def test_compact_under_small_node_cap():
+    compactions = []
+    original = hashlife.Universe.compact
+
+    def counted(self):
+        compactions.append(len(self.level))
+        original(self)
+
+    hashlife.Universe.compact = counted
+    try:
+        universe = check(ACORN, [1, 3, 7, 13, 29, 64, 100], node_cap=200)
+        check(GUN, [5, 11, 37, 90], node_cap=200)
+    finally:
+        hashlife.Universe.compact = original
+    assert compactions
+    assert universe.generation == 217
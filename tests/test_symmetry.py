@@ -0,0 +1,178 @@
+"""
+test_symmetry.py - Symmetric sequences render the same as per-pixel ones
+
+Each sequence using symmetry.Mirror is imported twice: as shipped, and
+with Mirror swapped for one whose region is the whole panel, so it
+computes every pixel itself. Both are run for FRAMES frames and the
+panel pictures and palettes must match every frame. The mirrored picture
+is read back the way displayio shows it, through the group's flipped
+TileGrids.
+
+The shipped sequences are also compared, frame by frame, with golden
+frames from the per-pixel renderers they had before engine.symmetry
+(kept below as reference functions), as the colors shown at every pixel.
+breathing must match exactly. kaleidoscope animates angle buckets through
+its palette (symmetry.IndexMap), so a pixel shows the color of its
+bucket's centre angle: up to TOLERANCE[name] per channel off. ironman and
+cap-shield were mirrored too until they moved to engine.rotozoom, which
+resamples a master and is not pixel-identical, so they are not compared
+here.
+
+Run from the repo root:  pytest -q
+"""
+import importlib
+import math
+import sys
+
+import pytest
+
+from engine import color, panel, prng, symmetry
+
+FRAMES = 60
+MIRRORED = ("breathing",)
+SEQUENCES = ("breathing", "kaleidoscope")
+TOLERANCE = {"breathing": 0, "kaleidoscope": 1}
+GEOMETRIES = ((64, 32, 1, 1), (64, 32, 2, 2))
+
+
+class FullMirror(symmetry.Mirror):
+    """A Mirror whose region is the whole panel: no mirroring"""
+
+    def __init__(self, palette, width, height, value_count, mirror_x=True, mirror_y=True):
+        super().__init__(palette, width, height, value_count, mirror_x=False, mirror_y=False)
+
+
+def load(name, per_pixel, monkeypatch):
+    """A fresh import of led_sequences.<name>"""
+    for module in list(sys.modules):
+        if module.startswith("led_sequences"):
+            del sys.modules[module]
+    with monkeypatch.context() as patch:
+        if per_pixel:
+            patch.setattr(symmetry, "Mirror", FullMirror)
+        return importlib.import_module("led_sequences." + name)
+
+
+def composite(group, width, height):
+    """Panel pixels of a group of unscaled TileGrids, as displayio draws them"""
+    shown = [[None] * width for _ in range(height)]
+    for grid in group:
+        bitmap = grid.bitmap
+        for gy in range(bitmap.height):
+            for gx in range(bitmap.width):
+                x, y = grid.x + gx, grid.y + gy
+                if x < width and y < height:
+                    sx = bitmap.width - 1 - gx if grid.flip_x else gx
+                    sy = bitmap.height - 1 - gy if grid.flip_y else gy
+                    shown[y][x] = bitmap[sx, sy]
+    return shown
+
+
+def colors(module):
+    return [color.shader(module.palette)[i] for i in range(len(module.palette))]
+
+
+def breathing_frames(width, height):
+    """Golden frames: breathing as it drew every pixel itself"""
+    cx, cy = width / 2.0, height / 2.0
+    scale = panel.SCALE
+    t = 0.0
+    while True:
+        t += 0.08
+        pulse = (math.sin(t * 1.2) + 1.0) * 0.5
+        h = (t * 0.3) % 6.0
+        if h < 1: r, g, b = 1, h, 0
+        elif h < 2: r, g, b = 2-h, 1, 0
+        elif h < 3: r, g, b = 0, 1, h-2
+        elif h < 4: r, g, b = 0, 4-h, 1
+        elif h < 5: r, g, b = h-4, 0, 1
+        else: r, g, b = 1, 0, 6-h
+        palette = [0] * 8
+        color.ramp(palette, 1, 7, (int(r*255) << 16) | (int(g*255) << 8) | int(b*255))
+        pixels = [[0] * width for _ in range(height)]
+        for y in range(height):
+            for x in range(width):
+                dx, dy = x - cx, y - cy
+                ring = (math.sqrt(dx*dx + dy*dy) / scale + pulse * 8) % 12
+                pixels[y][x] = int(ring) + 1 if ring < 6 else 0
+        yield pixels, palette
+
+
+def kaleidoscope_frames(width, height):
+    """Golden frames: kaleidoscope with an atan2/sqrt per pixel"""
+    cx, cy = width / 2.0, height / 2.0
+    palette = [(i << 16) | (i << 8) | i for i in range(256)]
+    t = 0.0
+    while True:
+        t += 0.06
+        pixels = [[0] * width for _ in range(height)]
+        for y in range(height):
+            for x in range(width):
+                dx, dy = x - cx, y - cy
+                angle = math.atan2(dy, dx) + t
+                if math.sqrt(dx*dx + dy*dy) != 0:
+                    r = int(128 + 127 * math.sin(angle * 3))
+                    g = int(128 + 127 * math.sin(angle * 3 + 2))
+                    b = int(128 + 127 * math.sin(angle * 3 + 4))
+                    pixels[y][x] = (r + g + b) // 3 % 256
+        yield pixels, palette
+
+
+GOLDEN = {"breathing": breathing_frames, "kaleidoscope": kaleidoscope_frames}
+
+
+@pytest.fixture(params=GEOMETRIES, ids=lambda g: "%dx%d" % (g[0] * g[2], g[1] * g[3]))
+def geometry(request):
+    panel.set_geometry(*request.param)
+    yield request.param
+    panel.set_geometry()
+
+
+@pytest.mark.parametrize("name", MIRRORED)
+def test_matches_per_pixel(name, geometry, monkeypatch):
+    fast = load(name, False, monkeypatch)
+    slow = load(name, True, monkeypatch)
+    width, height = panel.WIDTH, panel.HEIGHT
+    fast_state = fast.init_animation()
+    slow_state = slow.init_animation()
+    for frame in range(FRAMES):
+        fast_state = fast.update_animation(fast_state)
+        slow_state = slow.update_animation(slow_state)
+        expected = composite(slow.group, width, height)
+        assert composite(fast.group, width, height) == expected, "frame %d" % frame
+        assert colors(fast) == colors(slow), "frame %d" % frame
+
+
+@pytest.mark.parametrize("name", SEQUENCES)
+def test_matches_golden_frames(name, geometry, monkeypatch):
+    # Neither draws random numbers today; seeded so one that starts to
+    # stays reproducible
+    prng.seed(1)
+    module = load(name, False, monkeypatch)
+    width, height = panel.WIDTH, panel.HEIGHT
+    golden = GOLDEN[name](width, height)
+    state = module.init_animation()
+    for frame in range(FRAMES):
+        state = module.update_animation(state)
+        pixels, palette = next(golden)
+        shown = composite(module.group, width, height)
+        worst = 0
+        for y in range(height):
+            for x in range(width):
+                got, want = module.palette[shown[y][x]], palette[pixels[y][x]]
+                for bits in (16, 8, 0):
+                    worst = max(worst, abs((got >> bits & 0xFF) - (want >> bits & 0xFF)))
+        assert worst <= TOLERANCE[name], "frame %d" % frame
+
+
+@pytest.mark.parametrize("mirror_x, mirror_y", ((True, True), (True, False), (False, True)))
+def test_unroll_matches_group(mirror_x, mirror_y):
+    width, height = 64, 32
+    mirror = symmetry.Mirror(color.Palette(256), width, height, 256, mirror_x, mirror_y)
+    for y in range(mirror.region_height):
+        for x in range(mirror.region_width):
+            mirror.bitmap[x, y] = (x * 7 + y * 13) & 0xFF
+    full = panel.surface(256)[0]
+    mirror.unroll(full)
+    shown = composite(mirror.group, width, height)
+    assert [[full[x, y] for x in range(width)] for y in range(height)] == shown
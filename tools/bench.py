@@ -0,0 +1,138 @@
+"""
+bench.py - Frame time of every animation at growing panel sizes
+
+Runs each animation in the manifest at 64x32 (one panel), 128x64 (2x2)
+and 256x64 (4x2) and reports its average and worst update_animation()
+time, so it shows which animations - and so which engines - run out of
+frame budget first as the wall grows. Every animation is imported fresh
+at each size through panel.set_geometry(), with the engine caches
+(sprite sheets, rotozoom masters) dropped in between. The panel itself
+is never started; only drawing into the bitmaps is timed, not the
+refresh. Frames are called back to back, so animations paced by the
+clock (christmas) time their per-call work.
+
+It needs displayio: on the device copy this file to CIRCUITPY and
+`import bench` from the REPL (stop code.py first); on the host install
+Blinka's displayio (pip install adafruit-blinka-displayio).
+
+Run from the repo root:  python tools/bench.py [frames] [animation ...]
+"""
+import gc
+import os
+import sys
+import time
+
+try:
+    import displayio  # noqa: F401
+except ImportError:
+    displayio = None
+
+if hasattr(time, "perf_counter"):
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, ROOT)
+    MANIFEST_PATH = os.path.join(ROOT, "led_sequences", "manifest.json")
+    FONT_DIR = os.path.join(ROOT, "lib", "fonts")
+else:
+    MANIFEST_PATH = "/led_sequences/manifest.json"
+    FONT_DIR = "/lib/fonts"
+
+# (panel width, panel height, across, down)
+GEOMETRIES = ((64, 32, 1, 1), (64, 32, 2, 2), (64, 32, 4, 2))
+WARMUP = 3
+KEEP = ("engine", "engine.panel", "engine.color", "engine.glyphfont")
+
+
+def now_ms():
+    if hasattr(time, "perf_counter"):
+        return time.perf_counter() * 1000
+    return time.monotonic_ns() / 1000000
+
+
+def fresh():
+    """Forget imported sequences and engine modules (and their caches)"""
+    for name in list(sys.modules):
+        if name.startswith("led_sequences") or (name.startswith("engine.") and name not in KEEP):
+            del sys.modules[name]
+    gc.collect()
+
+
+def run(entry, frames):
+    """(init ms, average ms per frame, worst ms per frame) of one animation"""
+    fresh()
+    start = now_ms()
+    module = __import__(entry["module"], None, None, [entry["name"]], 0)
+    from engine import prng
+    prng.seed(1)
+    state = module.init_animation()
+    init_ms = now_ms() - start
+    for _ in range(WARMUP):
+        state = module.update_animation(state)
+    worst = 0.0
+    start = now_ms()
+    for _ in range(frames):
+        t = now_ms()
+        state = module.update_animation(state)
+        worst = max(worst, now_ms() - t)
+    return init_ms, (now_ms() - start) / frames, worst
+
+
+def main(frames=30, names=None):
+    if displayio is None:
+        print("bench.py needs displayio (pip install adafruit-blinka-displayio)")
+        return 1
+    from engine import glyphfont, manifest, panel
+    glyphfont.FONT_DIR = FONT_DIR
+    entries = manifest.load(MANIFEST_PATH)[1]
+    if names:
+        entries = [e for e in entries if e["name"] in names]
+
+    sizes = []
+    results = {}
+    for geometry in GEOMETRIES:
+        panel.set_geometry(*geometry)
+        size = "%dx%d" % (panel.WIDTH, panel.HEIGHT)
+        sizes.append(size)
+        for entry in entries:
+            try:
+                results[entry["name"], size] = run(entry, frames)
+            except Exception as e:
+                print("%s at %s: %s" % (entry["name"], size, str(e)))
+    fresh()
+
+    print("\nms per frame (average / worst), * = over the FPS budget")
+    print("%-18s %7s" % ("animation", "budget") +
+          "".join("%18s" % s for s in sizes) + "%8s" % "growth")
+    first_over = []
+    for entry in entries:
+        budget = 1000 / entry["fps"]
+        line = "%-18s %7.1f" % (entry["name"], budget)
+        over = None
+        for size in sizes:
+            r = results.get((entry["name"], size))
+            if r is None:
+                line += "%18s" % "error"
+                continue
+            mark = "*" if r[1] > budget else " "
+            line += "%17s%s" % ("%.2f / %.2f" % (r[1], r[2]), mark)
+            if mark == "*" and over is None:
+                over = size
+        small = results.get((entry["name"], sizes[0]))
+        large = results.get((entry["name"], sizes[-1]))
+        if small and large and small[1] > 0:
+            line += "%7.1fx" % (large[1] / small[1])
+        print(line)
+        if over:
+            first_over.append((sizes.index(over), entry["name"], over))
+
+    area = GEOMETRIES[-1][2] * GEOMETRIES[-1][3]
+    print("(growth: %s time / %s time; the area grows %dx)" % (sizes[-1], sizes[0], area))
+    for _, name, size in sorted(first_over):
+        print("over budget from %s: %s" % (size, name))
+    return 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sys.exit(main(int(args[0]) if args else 30, args[1:]))
+elif not hasattr(time, "perf_counter"):
+    main()
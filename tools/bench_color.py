@@ -0,0 +1,147 @@
+"""
+bench_color.py - Palette vs true-color (RGB565) surfaces
+
+Builds the same 256-color rainbow gradient on a panel-sized surface both
+ways - panel.surface(256) (8-bit indices + color.Palette) and
+panel.surface(panel.TRUE_COLOR) (RGB565 pixels through a ColorConverter)
+- and reports for each:
+
+    memory    bitmap + palette bytes (on the device also the measured
+              drop in gc.mem_free() when the surface is created)
+    draw      ms to write every pixel (an index, or an RGB565 value from
+              a 256-entry table: the per-frame CPU of a full redraw)
+    fade      ms to dim the whole picture one step: rewrite 256 palette
+              entries, or rebuild the table and redraw every pixel
+    refresh   ms per panel refresh with the surface shown (device only;
+              this is where the ColorConverter cost shows)
+
+An animation that redraws every pixel anyway pays about the same either
+way and gets smooth gradients from true color; one that animates through
+its palette (fades, color cycling) is far cheaper with a palette.
+
+It needs displayio: on the device copy this file to CIRCUITPY and
+`import bench_color` from the REPL (stop code.py first); on the host
+install Blinka's displayio (pip install adafruit-blinka-displayio).
+
+Run from the repo root:  python tools/bench_color.py [repeats]
+"""
+import array
+import gc
+import os
+import sys
+import time
+
+try:
+    import displayio  # noqa: F401
+except ImportError:
+    displayio = None
+
+if hasattr(time, "perf_counter"):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PALETTE_ENTRY_BYTES = 8  # rough displayio per-entry cost, as in build_manifest
+
+
+def now_ms():
+    if hasattr(time, "perf_counter"):
+        return time.perf_counter() * 1000
+    return time.monotonic_ns() / 1000000
+
+
+def mem_free():
+    return gc.mem_free() if hasattr(gc, "mem_free") else None
+
+
+def rainbow(i):
+    """0xRRGGBB of rainbow position i, 0..255 (as plasma)"""
+    if i < 85:
+        return ((i * 3) << 16) | ((255 - i * 3) << 8)
+    if i < 170:
+        return ((255 - (i - 85) * 3) << 16) | ((i - 85) * 3)
+    return ((i - 170) * 3 << 8) | (255 - (i - 170) * 3)
+
+
+def bench(true_color, repeats):
+    """{"memory", "measured", "draw", "fade", "refresh"} of one surface kind"""
+    from engine import color, panel
+    width, height = panel.WIDTH, panel.HEIGHT
+    levels = bytearray((x * 4 + y * 2) & 0xFF for y in range(height) for x in range(width))
+    colors = [rainbow(i) for i in range(256)]
+
+    gc.collect()
+    free = mem_free()
+    if true_color:
+        bitmap, palette, group = panel.surface(panel.TRUE_COLOR)
+        memory = width * height * 2
+    else:
+        bitmap, palette, group = panel.surface(256)
+        memory = width * height + 256 * PALETTE_ENTRY_BYTES
+    gc.collect()
+    measured = free - mem_free() if free is not None else None
+    pixels = array.array("H", [0] * 256)
+
+    def draw():
+        i = 0
+        for y in range(height):
+            for x in range(width):
+                bitmap[x, y] = pixels[levels[i]] if true_color else levels[i]
+                i += 1
+
+    def fade(level):
+        if true_color:
+            for i in range(256):
+                pixels[i] = color.rgb565(color.scale(colors[i], level))
+            draw()
+        else:
+            for i in range(256):
+                palette[i] = color.scale(colors[i], level)
+
+    fade(256)
+    start = now_ms()
+    for _ in range(repeats):
+        draw()
+    draw_ms = (now_ms() - start) / repeats
+
+    start = now_ms()
+    for r in range(repeats):
+        fade(256 - (r % 128))
+    fade_ms = (now_ms() - start) / repeats
+
+    refresh_ms = None
+    try:
+        panel.init()
+    except Exception:
+        pass                         # no matrix here (host)
+    if panel.display is not None:
+        panel.show(group)
+        panel.refresh()
+        start = now_ms()
+        for _ in range(repeats):
+            panel.display.refresh()
+        refresh_ms = (now_ms() - start) / repeats
+        panel.blank()
+    return {"memory": memory, "measured": measured, "draw": draw_ms,
+            "fade": fade_ms, "refresh": refresh_ms}
+
+
+def main(repeats=10):
+    if displayio is None:
+        print("bench_color.py needs displayio (pip install adafruit-blinka-displayio)")
+        return 1
+    from engine import panel
+    print("%dx%d panel, %d repeats" % (panel.WIDTH, panel.HEIGHT, repeats))
+    print("%-12s %8s %10s %9s %9s %11s" % ("surface", "bytes", "measured", "draw ms",
+                                         "fade ms", "refresh ms"))
+    for name, true_color in (("palette", False), ("true color", True)):
+        r = bench(true_color, repeats)
+        measured = "-" if r["measured"] is None else "%d" % r["measured"]
+        refresh = "-" if r["refresh"] is None else "%.2f" % r["refresh"]
+        print("%-12s %8d %10s %9.2f %9.2f %11s" % (name, r["memory"], measured,
+                                                  r["draw"], r["fade"], refresh))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
+elif not hasattr(time, "perf_counter"):
+    main()
@@ -0,0 +1,113 @@
+"""
+bench_dither.py - CPU cost and accuracy of the dither modes (host side)
+
+For each mode, times the extra per-frame work on a 64x32 panel:
+
+    off       index = level                       (plain quantized gradient)
+    ordered   index = level << 2 | code[x & 1]    (engine.dither.Ordered(2))
+    temporal  rewrite of the palette every frame  (engine.dither.Temporal,
+              16 and 256 entries, as engine.color does it)
+
+and the error a viewer sees on a smooth 8-bit ramp shown at the panel bit
+depth: the mean distance between the ramp and what the panel shows,
+averaged over a 2x2 neighbourhood (ordered) or over the dither phases
+(temporal).
+
+The error for temporal only holds if the eye averages the phases. The
+phase advances once per animation frame, so the last column gives the
+rate a pixel's cycle repeats at FPS: below about 15 Hz it is seen as
+shimmer, not as the color in between. Temporal is listed with 2 phases
+(engine.color.TEMPORAL_PHASES) and 4 to show that trade-off.
+
+Run from the repo root:  python tools/bench_dither.py [frames] [bit_depth]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import dither  # noqa: E402
+
+WIDTH = 64
+HEIGHT = 32
+FPS = 30
+PHASES = (2, 4)   # engine.color.TEMPORAL_PHASES, and the finer 4
+
+
+def ramp_error(shown):
+    """Mean |ramp - average shown| over 0..255 given shown(value) -> list
+    of the panel values a viewer averages"""
+    total = 0
+    for v in range(256):
+        values = shown(v)
+        total += abs(sum(values) / len(values) - v)
+    return total / 256
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    bit_depth = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    step = 256 >> bit_depth
+
+    bitmap = bytearray(WIDTH * HEIGHT)
+    levels = [x * 63 // (WIDTH - 1) for x in range(WIDTH)]
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        for y in range(HEIGHT):
+            row = y * WIDTH
+            for x in range(WIDTH):
+                bitmap[row + x] = levels[x]
+    plain = (time.perf_counter() - start) / frames * 1000
+
+    ordered = dither.Ordered(2)
+    ordered.prepare(bit_depth)
+    rows = ordered.rows
+    start = time.perf_counter()
+    for _ in range(frames):
+        for y in range(HEIGHT):
+            row, codes = y * WIDTH, rows[y & 1]
+            for x in range(WIDTH):
+                bitmap[row + x] = (levels[x] << 2) | codes[x & 1]
+    spatial = (time.perf_counter() - start) / frames * 1000
+
+    gamma = bytes(range(256))     # stands in for engine.color's tables
+    rewrite = {}
+    temporals = {}
+    for phases in PHASES:
+        temporal = temporals[phases] = dither.Temporal(phases)
+        temporal.prepare(bit_depth)
+        for entries in (16, 256):
+            colors = [i * 255 // (entries - 1) * 0x010101 for i in range(entries)]
+            shown = [0] * entries
+            start = time.perf_counter()
+            for _ in range(frames):
+                temporal.advance()
+                for i in range(entries):
+                    rgb = colors[i]
+                    rgb = (gamma[rgb >> 16 & 0xFF] << 16) | (gamma[rgb >> 8 & 0xFF] << 8) | gamma[rgb & 0xFF]
+                    shown[i] = temporal.shade(rgb, i)
+            rewrite[phases, entries] = (time.perf_counter() - start) / frames * 1000
+
+    quantized = lambda v: [v // step * step]
+    spatial_shown = lambda v: [ordered.tables[p][v] // step * step for p in range(ordered.cells)]
+
+    def temporal_shown(temporal):
+        return lambda v: [temporal.tables[p][v] // step * step for p in range(temporal.phases)]
+
+    print("bit depth %d (panel step %d), %d frames, cycle at %d FPS" % (bit_depth, step, frames, FPS))
+    print("%-26s %12s %12s %10s" % ("mode", "ms/frame", "ramp error", "cycle Hz"))
+    print("%-26s %12.3f %12.2f %10s" % ("off", plain, ramp_error(quantized), "-"))
+    print("%-26s %12.3f %12.2f %10s" % ("ordered 2x2", spatial, ramp_error(spatial_shown), "-"))
+    for (phases, entries), ms in sorted(rewrite.items()):
+        print("%-26s %12.3f %12.2f %10.1f" % ("temporal %d (%d entries)" % (phases, entries),
+                                              plain + ms, ramp_error(temporal_shown(temporals[phases])),
+                                              FPS / phases))
+    print("(ms/frame includes writing the 64x32 indices; temporal adds the palette rewrite)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
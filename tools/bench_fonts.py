@@ -0,0 +1,112 @@
+"""
+bench_fonts.py - Load time and RAM of a BDF font vs its compiled .glf
+
+For each font: how long it takes to open the font and get the glyphs of
+a sample text ready, and how much RAM the loaded font keeps.
+
+On the host the BDF side is tools/fontc.py's parser (all glyphs, as a
+BDF loader must read the whole file) and RAM comes from tracemalloc. On
+the device it is adafruit_bitmap_font with load_glyphs(TEXT) and RAM is
+the drop in gc.mem_free(). CPython's buffered file object costs several
+KB that a CircuitPython file does not, so on the host it is measured on
+its own and left out of the .glf figure. On the device, copy this file
+to CIRCUITPY and `import bench_fonts` from the REPL.
+
+Run from the repo root:  python tools/bench_fonts.py [repeats]
+"""
+import gc
+import os
+import sys
+import time
+
+try:
+    from adafruit_bitmap_font import bitmap_font   # on the device
+    FONT_DIR = "/lib/fonts"
+    tracemalloc = None
+except ImportError:
+    bitmap_font = None
+    import tracemalloc
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "tools"))
+    FONT_DIR = os.path.join(ROOT, "lib", "fonts")
+    import fontc  # noqa: E402
+
+from engine import glyphfont  # noqa: E402
+
+FONTS = (("3x5.bdf", "3x5.glf"), ("5x7.bdf.disabled", "5x7.glf"))
+TEXT = "MERRY CHRISTMAS hello world"
+
+
+def now_ms():
+    if hasattr(time, "perf_counter"):
+        return time.perf_counter() * 1000
+    return time.monotonic_ns() / 1000000
+
+
+def load_bdf(path):
+    if bitmap_font is None:
+        return fontc.parse_bdf(path)
+    font = bitmap_font.load_font(path)
+    font.load_glyphs(TEXT)
+    return font
+
+
+def load_glf(path):
+    font = glyphfont.GlyphFont(path)
+    for char in TEXT:
+        font.glyph(char)
+    return font
+
+
+def open_file(path):
+    return open(path, "rb")
+
+
+def measure(load, path, repeats):
+    """(ms per load, bytes kept by one loaded font)"""
+    start = now_ms()
+    for _ in range(repeats):
+        font = load(path)
+        if hasattr(font, "close"):
+            font.close()
+        font = None
+    ms = (now_ms() - start) / repeats
+    gc.collect()
+    if tracemalloc is not None:
+        tracemalloc.start()
+        font = load(path)
+        kept = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        free = gc.mem_free()
+        font = load(path)
+        gc.collect()
+        kept = free - gc.mem_free()
+    if hasattr(font, "close"):
+        font.close()
+    return ms, kept
+
+
+def main(repeats=20):
+    print("%-18s %10s %10s %10s" % ("font", "file", "load ms", "RAM"))
+    buffer = measure(open_file, __file__, 1)[1] if tracemalloc is not None else 0
+    for bdf, glf in FONTS:
+        for name, load in ((bdf, load_bdf), (glf, load_glf)):
+            path = "%s/%s" % (FONT_DIR, name)
+            try:
+                size = os.stat(path)[6]
+            except OSError:
+                print("%-18s missing" % name)
+                continue
+            ms, kept = measure(load, path, repeats)
+            if load is load_glf:
+                kept -= buffer
+            print("%-18s %10d %10.2f %10d" % (name, size, ms, kept))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
+elif bitmap_font is not None:
+    main()
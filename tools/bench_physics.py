@@ -0,0 +1,59 @@
+"""
+bench_physics.py - Host benchmark for engine/physics.py (host side)
+
+Fills a World with more and more balls and times step() (collisions
+included, drawing excluded). Up to 200 balls the World is the 64x32
+panel; above that its area grows with the count so the density stays
+that of 200 balls on the panel (the world column shows the size used).
+At a constant density the spatial hash should keep the time per ball
+roughly flat; the pair tests per ball column shows how many neighbours
+each ball is checked against.
+
+Run from the repo root:  python tools/bench_physics.py [frames]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import physics, prng  # noqa: E402
+
+WIDTH = 64
+HEIGHT = 32
+COUNTS = (25, 50, 100, 200, 400, 800)
+RADII = (0.5, 0.5, 1.0)
+
+
+def bench(count, frames, width=WIDTH, height=HEIGHT):
+    prng.seed(1)
+    world = physics.World(count, width, height, max_radius=max(RADII))
+    for i in range(count):
+        world.add(prng.randint(1, width - 2), prng.randint(1, height - 2),
+                  prng.randint(-200, 200) / 100, prng.randint(-200, 200) / 100,
+                  radius=RADII[i % len(RADII)], color=i % 7 + 1)
+    checks = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        world.step()
+        checks += world.checks
+    elapsed = time.perf_counter() - start
+    return elapsed / frames * 1000, checks / frames / count
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print("%6s %8s %12s %14s %14s" % ("balls", "world", "ms/frame", "us/ball", "tests/ball"))
+    for count in COUNTS:
+        # Keep the density of the 64x32 panel at 200 balls
+        scale = max(1.0, (count / 200) ** 0.5)
+        width, height = int(WIDTH * scale), int(HEIGHT * scale)
+        ms, tests = bench(count, frames, width, height)
+        print("%6d %8s %12.2f %14.1f %14.1f" % (count, "%dx%d" % (width, height),
+                                                 ms, ms * 1000 / count, tests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+build_manifest.py - Generate led_sequences/manifest.json (host side)
+
+Scans led_sequences/*.py WITHOUT importing them (they need board/rgbmatrix)
+and records, for every valid animation module:
+  name, module path, declared FPS, palette size, memory estimate, cost class,
+  preferred bit depth, whether it takes /api/options (defines configure())
+
+A module is valid when it defines both init_animation() and
+update_animation(). Modules can declare these module-level hints:
+  FPS = 30          target frames per second (default 30)
+  COST = "medium"   "light", "medium" or "heavy" (default "medium")
+  BIT_DEPTH = 6     panel bit depth to show it at (default: none, the
+                    panel's global depth)
+  LISTED = False    keep the module out of the manifest
+
+Order is taken from the existing manifest so NVM indexes stay stable;
+new animations are appended alphabetically.
+
+Run from the repo root:
+  python tools/build_manifest.py           show the manifest, write nothing
+  python tools/build_manifest.py --write   update led_sequences/manifest.json
+  python tools/build_manifest.py --check   exit 1 if the file on disk is stale
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEQ_DIR = os.path.join(ROOT, "led_sequences")
+MANIFEST = os.path.join(SEQ_DIR, "manifest.json")
+
+# engine/panel.py design size (DESIGN_WIDTH / DESIGN_HEIGHT), used for
+# panel.WIDTH / panel.HEIGHT / panel.surface(); memory on a bigger wall grows
+# with its area
+PANEL_WIDTH = 64
+PANEL_HEIGHT = 32
+TRUE_COLOR = 65536   # panel.TRUE_COLOR: RGB565 surface, no palette
+PANEL_ATTRS = {"WIDTH": PANEL_WIDTH, "HEIGHT": PANEL_HEIGHT, "SCALE": 1,
+               "TRUE_COLOR": TRUE_COLOR}
+
+COST_CLASSES = ("light", "medium", "heavy")
+BIT_DEPTHS = (1, 2, 3, 4, 5, 6)     # engine/panel.py BIT_DEPTHS
+DEFAULT_FPS = 30
+DEFAULT_COST = "medium"
+PALETTE_ENTRY_BYTES = 8  # rough displayio per-entry cost
+
+
+def bits_per_value(value_count):
+    """displayio.Bitmap storage depth for a value_count"""
+    for bits in (1, 2, 4, 8, 16, 32):
+        if value_count <= (1 << bits):
+            return bits
+    return 32
+
+
+def _constants(tree, consts):
+    """Module-level NAME = <literal or simple expression> assignments"""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name):
+                try:
+                    consts[target.id] = ast.literal_eval(node.value)
+                except ValueError:
+                    value = _resolve(node.value, consts)
+                    if value is not None:
+                        consts[target.id] = value
+    return consts
+
+
+def _resolve(node, consts):
+    """Evaluate a call argument: literal, known constant, len(), or simple a*b.
+    panel.WIDTH / HEIGHT / SCALE and panel.per_area(n) take their values at
+    the design size."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        value = consts.get(node.id)
+        return value if isinstance(value, int) else None
+    if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+            and node.value.id == "panel"):
+        return PANEL_ATTRS.get(node.attr)
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "per_area" and len(node.args) == 1):
+        return _resolve(node.args[0], consts)
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id == "len" and len(node.args) == 1):
+        value = _resolve_any(node.args[0], consts)
+        return len(value) if isinstance(value, (list, tuple, str)) else None
+    if isinstance(node, ast.BinOp):
+        left = _resolve(node.left, consts)
+        right = _resolve(node.right, consts)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        if isinstance(node.op, ast.FloorDiv):
+            return left // right
+        if isinstance(node.op, ast.Add):
+            return left + right
+        if isinstance(node.op, ast.Sub):
+            return left - right
+    return None
+
+
+def _resolve_any(node, consts):
+    if isinstance(node, ast.Name):
+        return consts.get(node.id)
+    return _resolve(node, consts)
+
+
+def _calls(tree, owner, attr):
+    """All <owner>.<attr>(...) calls anywhere in the module"""
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == attr
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == owner):
+            yield node
+
+
+def scan(path):
+    """Return a manifest entry for one sequence file, or None if invalid"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+
+    funcs = {n.name for n in tree.body if isinstance(n, ast.FunctionDef)}
+    if "init_animation" not in funcs or "update_animation" not in funcs:
+        return None
+
+    consts = _constants(tree, {"WIDTH": PANEL_WIDTH, "HEIGHT": PANEL_HEIGHT})
+    if consts.get("LISTED", True) is False:
+        return None
+
+    cost = consts.get("COST", DEFAULT_COST)
+    if cost not in COST_CLASSES:
+        raise ValueError("%s: COST must be one of %s" % (name, COST_CLASSES))
+    bit_depth = consts.get("BIT_DEPTH")
+    if bit_depth is not None and bit_depth not in BIT_DEPTHS:
+        raise ValueError("%s: BIT_DEPTH must be one of %s" % (name, BIT_DEPTHS))
+
+    palette = 0
+    bitmaps = []
+    for owner in ("displayio", "color"):
+        for call in _calls(tree, owner, "Palette"):
+            size = _resolve(call.args[0], consts) if call.args else None
+            palette = max(palette, size or 0)
+    for call in _calls(tree, "displayio", "Bitmap"):
+        if len(call.args) >= 3:
+            bitmaps.append([_resolve(a, consts) for a in call.args[:3]])
+    for call in _calls(tree, "scroll", "Ring"):
+        if len(call.args) >= 4:
+            bitmaps.append([_resolve(a, consts) for a in call.args[1:4]])
+    for call in _calls(tree, "ticker", "Ticker"):
+        if len(call.args) >= 3:
+            flags = {k.arg: _resolve(k.value, consts) for k in call.keywords}
+            w, h = [_resolve(a, consts) for a in call.args[1:3]]
+            bitmaps.append([w, h, flags.get("value_count") or 2])
+    for call in _calls(tree, "symmetry", "Mirror"):
+        if len(call.args) >= 4:
+            w, h, count = [_resolve(a, consts) for a in call.args[1:4]]
+            flags = {k.arg: _resolve(k.value, consts) for k in call.keywords}
+            if w and flags.get("mirror_x", True):
+                w = w // 2 + 1
+            if h and flags.get("mirror_y", True):
+                h = h // 2 + 1
+            bitmaps.append([w, h, count])
+    for call in _calls(tree, "rotozoom", "master"):
+        if len(call.args) >= 4:
+            w, h, count = [_resolve(a, consts) for a in call.args[1:4]]
+            flags = {k.arg: _resolve(k.value, consts) for k in call.keywords}
+            res = flags.get("resolution") or 2
+            if w and h:
+                bitmaps.append([w * res, h * res, count])
+    buffers = 0
+    for call in _calls(tree, "automata", "Automaton"):
+        if len(call.args) >= 2:
+            w, h = [_resolve(a, consts) for a in call.args[:2]]
+            if w and h:
+                # two bordered bytearrays + a column sum row
+                buffers += 2 * (w + 2) * (h + 2) + w + 2
+    for call in _calls(tree, "panel", "surface"):
+        size = _resolve(call.args[0], consts) if call.args else None
+        if size != TRUE_COLOR:
+            palette = max(palette, size or 0)
+        bitmaps.append([PANEL_WIDTH, PANEL_HEIGHT, size])
+
+    memory = palette * PALETTE_ENTRY_BYTES + buffers
+    for w, h, count in bitmaps:
+        if w and h and count:
+            memory += w * h * bits_per_value(count) // 8
+
+    return {
+        "name": name,
+        "module": "led_sequences.%s" % name,
+        "fps": consts.get("FPS", DEFAULT_FPS),
+        "palette": palette,
+        "memory": memory,
+        "cost": cost,
+        "bit_depth": bit_depth,
+        "options": "configure" in funcs,
+    }
+
+
+def build():
+    entries = {}
+    for fname in sorted(os.listdir(SEQ_DIR)):
+        if fname.endswith(".py"):
+            entry = scan(os.path.join(SEQ_DIR, fname))
+            if entry:
+                entries[entry["name"]] = entry
+
+    order = []
+    if os.path.exists(MANIFEST):
+        with open(MANIFEST) as f:
+            order = [a["name"] for a in json.load(f)["animations"]]
+    order = [n for n in order if n in entries]
+    order += sorted(n for n in entries if n not in order)
+
+    return {"version": 1, "animations": [entries[n] for n in order]}
+
+
+def render(manifest):
+    """The manifest.json text for a manifest"""
+    return json.dumps(manifest, indent=1) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate led_sequences/manifest.json")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--write", action="store_true", help="write the manifest file")
+    mode.add_argument("--check", action="store_true",
+                      help="exit non-zero if the manifest file is out of date")
+    args = parser.parse_args()
+
+    manifest = build()
+    text = render(manifest)
+    current = None
+    if os.path.exists(MANIFEST):
+        with open(MANIFEST) as f:
+            current = f.read()
+
+    if args.check:
+        if current != text:
+            print("%s is out of date: run python tools/build_manifest.py --write" % MANIFEST)
+            return 1
+        print("%s is up to date (%d animations)" % (MANIFEST, len(manifest["animations"])))
+        return 0
+
+    if args.write:
+        with open(MANIFEST, "w") as f:
+            f.write(text)
+        print("Wrote %s (%d animations)" % (MANIFEST, len(manifest["animations"])))
+    else:
+        print("%s %s (%d animations; --write to update)"
+              % (MANIFEST, "matches" if current == text else "differs",
+                 len(manifest["animations"])))
+    for a in manifest["animations"]:
+        print("  %-16s fps=%-3d palette=%-4d mem=%-6d %-6s depth=%s"
+              % (a["name"], a["fps"], a["palette"], a["memory"], a["cost"],
+                 a["bit_depth"] or "-"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+fontc.py - Compile a BDF font into a compact glyph file (host side)
+
+BDF is text: loading it on the device means parsing every line, and a
+parsed font keeps a Bitmap per glyph. The compiled .glf file is read by
+engine/glyphfont.py, which keeps only the codepoint index in RAM and
+seeks to the glyphs it actually draws. Layout (little-endian):
+
+    header   16 bytes  b"GLF1", glyph count (H), height (B), baseline (B),
+                       max advance (B), bytes per column (B),
+                       fallback glyph index (H, 0xFFFF: none), 4 reserved
+    index    count * 2 bytes, sorted codepoints (H)
+    offsets  count * 4 bytes, file offset of each glyph (I)
+    glyphs   advance (B), then advance columns of `bytes per column`
+             bytes each; bit y of a column is pixel row y from the top
+
+Every glyph is rendered into a cell as high as the whole font and as wide
+as its advance, so drawing needs no bounding-box arithmetic.
+
+Run from the repo root:
+    python tools/fontc.py lib/fonts/5x7.bdf.disabled lib/fonts/5x7.glf
+    python tools/fontc.py font.bdf out.glf --chars " -~"
+"""
+import argparse
+import os
+import struct
+import sys
+
+MAGIC = b"GLF1"
+HEADER = "<4sHBBBBH"
+HEADER_SIZE = 16   # HEADER + 4 reserved bytes
+NO_FALLBACK = 0xFFFF
+
+
+def parse_bdf(path):
+    """({codepoint: {"advance", "bbx", "rows"}}, font properties): the
+    properties kept are FONT_ASCENT, FONT_DESCENT and DEFAULT_CHAR"""
+    glyphs = {}
+    props = {}
+    glyph = None
+    rows = None
+    with open(path) as f:
+        for line in f:
+            words = line.split()
+            if not words:
+                continue
+            key = words[0]
+            if rows is not None:
+                if key == "ENDCHAR":
+                    glyph["rows"] = rows
+                    if glyph.get("code", -1) >= 0:
+                        glyphs[glyph["code"]] = glyph
+                    glyph = rows = None
+                else:
+                    rows.append(int(key, 16))
+            elif key == "STARTCHAR":
+                glyph = {}
+            elif glyph is None:
+                if key in ("FONT_ASCENT", "FONT_DESCENT", "DEFAULT_CHAR"):
+                    props[key] = int(words[1])
+                elif key == "FONTBOUNDINGBOX":
+                    props["bbox"] = [int(w) for w in words[1:5]]
+            elif key == "ENCODING":
+                glyph["code"] = int(words[-1])
+            elif key == "DWIDTH":
+                glyph["advance"] = int(words[1])
+            elif key == "BBX":
+                glyph["bbx"] = [int(w) for w in words[1:5]]
+            elif key == "BITMAP":
+                rows = []
+    if "bbox" in props:
+        w, h, x, y = props["bbox"]
+        props.setdefault("FONT_ASCENT", h + y)
+        props.setdefault("FONT_DESCENT", -y)
+    return glyphs, props
+
+
+def right_aligned(glyphs):
+    """True if the rows hold pixels in their low bits instead of the
+    standard high (left) bits - as some hand-made BDF files do, including
+    the 5x7 font in lib/fonts"""
+    low = high = False
+    for glyph in glyphs.values():
+        w = glyph["bbx"][0]
+        pad = (w + 7) // 8 * 8 - w
+        for bits in glyph["rows"]:
+            low |= bool(bits & ((1 << pad) - 1))
+            high |= bool(bits >> w)
+    return low and not high
+
+
+def render(glyph, top, height, right=False):
+    """Columns (list of ints, bit y = row y below `top`) of one glyph"""
+    w, h, xoff, yoff = glyph["bbx"]
+    advance = glyph.get("advance", w + max(xoff, 0))
+    columns = [0] * advance
+    row_bits = w if right else (w + 7) // 8 * 8
+    for r, bits in enumerate(glyph["rows"][:h]):
+        y = top - (yoff + h) + r
+        if not 0 <= y < height:
+            continue
+        for c in range(w):
+            x = xoff + c
+            if 0 <= x < advance and bits >> (row_bits - 1 - c) & 1:
+                columns[x] |= 1 << y
+    return columns
+
+
+def compile_font(glyphs, props, chars=None):
+    """Bytes of a .glf file for the given parsed font"""
+    codes = sorted(c for c in glyphs if c <= 0xFFFF and (chars is None or c in chars))
+    if not codes:
+        raise ValueError("no glyphs to compile")
+    # Cell from the font ascent/descent, grown to fit any glyph that sticks out
+    top = props.get("FONT_ASCENT", 0)
+    bottom = -props.get("FONT_DESCENT", 0)
+    for c in codes:
+        w, h, xoff, yoff = glyphs[c]["bbx"]
+        top = max(top, yoff + h)
+        bottom = min(bottom, yoff)
+    height = top - bottom
+    if height > 32:
+        raise ValueError("fonts taller than 32 pixels are not supported")
+    column_bytes = (height + 7) // 8
+
+    right = right_aligned(glyphs)
+    rendered = [render(glyphs[c], top, height, right) for c in codes]
+    max_advance = max(len(cols) for cols in rendered)
+    if max_advance > 255:
+        raise ValueError("glyph wider than 255 pixels")
+    default = props.get("DEFAULT_CHAR")
+    fallback = codes.index(default) if default in codes else NO_FALLBACK
+
+    count = len(codes)
+    base = HEADER_SIZE + count * 6
+    offsets = []
+    body = bytearray()
+    for cols in rendered:
+        offsets.append(base + len(body))
+        body.append(len(cols))
+        for bits in cols:
+            body += bits.to_bytes(column_bytes, "little")
+
+    out = bytearray(struct.pack(HEADER, MAGIC, count, height, top, max_advance,
+                                column_bytes, fallback))
+    out += bytes(HEADER_SIZE - len(out))
+    out += struct.pack("<%dH" % count, *codes)
+    out += struct.pack("<%dI" % count, *offsets)
+    out += body
+    return bytes(out)
+
+
+def char_set(spec):
+    """Codepoints from a spec like " -~" (ranges) or "ABC" """
+    chars = set()
+    i = 0
+    while i < len(spec):
+        if i + 2 < len(spec) and spec[i + 1] == "-":
+            chars.update(range(ord(spec[i]), ord(spec[i + 2]) + 1))
+            i += 3
+        else:
+            chars.add(ord(spec[i]))
+            i += 1
+    return chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a BDF font to .glf")
+    parser.add_argument("source")
+    parser.add_argument("output")
+    parser.add_argument("--chars", help='characters to keep, ranges allowed: " -~"')
+    args = parser.parse_args()
+
+    glyphs, props = parse_bdf(args.source)
+    data = compile_font(glyphs, props, char_set(args.chars) if args.chars else None)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    count, height = struct.unpack_from("<H", data, 4)[0], data[6]
+    print("%s: %d glyphs, %d px high, %d bytes (BDF %d bytes)"
+          % (args.output, count, height, len(data), os.path.getsize(args.source)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())